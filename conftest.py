@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def in_memory_media():
+    """Загрузки и миниатюры тестов — в памяти, как в manage.py test."""
+    from core.testing import in_memory_media
+
+    with in_memory_media():
+        yield
@@ -0,0 +1,166 @@
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
+from .models import Task
+
+# До скольких строк список в админке считается точно.
+EXACT_COUNT_LIMIT: int = 10000
+# Среди скольких последних строк идёт поиск по тексту.
+SEARCH_WINDOW: int = 50000
+# Параметр списка, который включает поиск по всей таблице.
+ALL_ROWS_VAR: str = 'all'
+
+
+def table_estimate(model, using):
+    """Примерное число строк таблицы без COUNT(*) или None.
+
+    PostgreSQL хранит оценку в статистике планировщика, в остальных
+    базах верхней границей служит наибольший первичный ключ.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
+    if model._meta.pk.get_internal_type() not in ('AutoField',
+                                                  'BigAutoField'):
+        return None
+    return model._default_manager.using(using).aggregate(
+        last=Max('pk')
+    )['last'] or 0
+
+
+def unfiltered(queryset):
+    """Выборка не сужена ничем сверх менеджера модели по умолчанию."""
+    if queryset.query.is_empty():
+        return False
+    base = queryset.model._default_manager.using(queryset.db)
+    return (str(queryset.order_by().values('pk').query)
+            == str(base.order_by().values('pk').query))
+
+
+def recent(queryset, window=None):
+    """Сужает выборку до последних window строк диапазоном ключа."""
+    window = window or SEARCH_WINDOW
+    model = queryset.model
+    if model._meta.pk.get_internal_type() not in ('AutoField',
+                                                  'BigAutoField'):
+        return queryset
+    last = model._default_manager.using(queryset.db).aggregate(
+        last=Max('pk')
+    )['last'] or 0
+    if last <= window:
+        return queryset
+    return queryset.filter(pk__gt=last - window)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки, который не считает большие таблицы целиком.
+
+    Без фильтров и поиска берётся оценка размера таблицы, с ними —
+    COUNT(*) не дальше EXACT_COUNT_LIMIT строк: страницы за этой границей
+    открываются только уточнением поиска.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if unfiltered(queryset):
+            estimate = table_estimate(queryset.model, queryset.db)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                return estimate
+        return queryset.order_by()[:EXACT_COUNT_LIMIT].count()
+
+
+class ScalableChangeList(ChangeList):
+    """Список, который не принимает ALL_ROWS_VAR за фильтр по полю, но
+    сохраняет его в ссылках на страницы."""
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(ALL_ROWS_VAR, None)
+        return lookup_params
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """Список объектов для больших таблиц.
+
+    Страницы считаются EstimatedCountPaginator, поиск по числу ищет
+    первичный ключ, а «@имя» — объекты пользователя из user_fields: оба
+    запроса идут по индексам, а не сканируют таблицу через LIKE.
+    Остальной текст ищется по search_fields только среди последних
+    SEARCH_WINDOW строк: диапазон первичного ключа ограничивает LIKE по
+    индексу, и поиск не читает всю таблицу. Об этом список сообщает со
+    ссылкой на поиск по всей таблице (параметр ALL_ROWS_VAR). Точные поля
+    ('=поле') ищутся по всей таблице. Правки прямо в списке сохраняются
+    одной транзакцией.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    user_fields: tuple = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ScalableChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        if term.startswith('@') and self.user_fields:
+            user = get_user_model().objects.filter(
+                username=term[1:]
+            ).first()
+            if user is None:
+                return queryset.none(), False
+            query = Q()
+            for field in self.user_fields:
+                query |= Q(**{field: user})
+            return queryset.filter(query), False
+        if (term and ALL_ROWS_VAR not in request.GET and not all(
+                field.startswith('=')
+                for field in self.get_search_fields(request))):
+            narrowed = recent(queryset)
+            request.search_narrowed = narrowed is not queryset
+            queryset = narrowed
+        return super().get_search_results(request, queryset, search_term)
+
+    def notify_narrowed(self, request):
+        """Сообщает, что поиск шёл не по всей таблице."""
+        params = request.GET.copy()
+        params[ALL_ROWS_VAR] = '1'
+        self.message_user(request, format_html(
+            'Поиск шёл среди последних {} записей. '
+            '<a href="?{}">Искать по всей таблице</a>',
+            SEARCH_WINDOW, params.urlencode(),
+        ), messages.INFO)
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method == 'POST' and '_save' in request.POST:
+            with transaction.atomic(using=self.model._default_manager.db):
+                return super().changelist_view(request, extra_context)
+        response = super().changelist_view(request, extra_context)
+        if getattr(request, 'search_narrowed', False):
+            self.notify_narrowed(request)
+        return response
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'priority', 'attempts',
+                    'run_at', 'created')
+    list_filter = ('status', 'name')
+    readonly_fields = ('last_error',)
+
+
+admin.site.register(Task, TaskAdmin)
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .cache import EntityCache
+
+SESSION_USER_TTL: int = 60
+
+# Без кэша процесса и ненадолго: запись хранит хэш пароля, по которому
+# сессия проверяет смену пароля (см. core.E001).
+users_by_pk = EntityCache(
+    get_user_model(), 'pk', ttl=SESSION_USER_TTL, local_ttl=0
+)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кэша."""
+
+    def get_user(self, user_id):
+        user = users_by_pk.get(user_id)
+        if user is not None and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,278 @@
+"""Замеры производительности, запускаемые командой benchmark.
+
+Каждый замер регистрируется декоратором benchmark и получает поток
+вывода команды. Замеры работают на временной тестовой базе, поэтому
+их можно запускать рядом с рабочей.
+"""
+import copy
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import (CaptureQueriesContext,
+                               setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+
+registry: dict = {}
+
+
+def benchmark(name):
+    """Регистрирует функцию замера под именем name."""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+@contextmanager
+def test_database(name=None):
+    """Создаёт и после замера удаляет тестовую базу.
+
+    Окружение как у тестов: DEBUG выключен, письма не отправляются.
+    name — имя тестовой базы вместо заданного в настройках, например
+    файл SQLite, который нужен нескольким процессам.
+    """
+    setup_test_environment(debug=False)
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+        teardown_test_environment()
+
+
+def measure(func, repeat):
+    """Запускает func repeat раз; возвращает медиану процессорного
+    времени в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        func()
+        timings.append((time.process_time() - started) * 1000)
+    return statistics.median(timings)
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries)
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(int(len(ordered) * share), len(ordered) - 1)
+    return ordered[index]
+
+
+SESSION_SETUPS: dict = {
+    'db + ModelBackend': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend'
+        ],
+    },
+    'core.sessions + CachedModelBackend': {
+        'SESSION_ENGINE': 'core.sessions',
+        'AUTHENTICATION_BACKENDS': ['core.backends.CachedModelBackend'],
+    },
+}
+
+
+@benchmark('sessions')
+def sessions(stdout, repeat):
+    """Запросы к базе на запрос вошедшего пользователя."""
+    user = get_user_model().objects.create_user(username='bench')
+    urls = (reverse('posts:follow_index'), reverse('posts:post_create'))
+    stdout.write(f'{"Настройка":40} {"URL":12} {"запросов":>9} {"мс":>7}')
+    for title, overrides in SESSION_SETUPS.items():
+        with override_settings(**overrides):
+            client = Client()
+            client.force_login(user)
+            for url in urls:
+                client.get(url)
+                queries = count_queries(lambda: client.get(url))
+                timing = measure(lambda: client.get(url), repeat)
+                stdout.write(
+                    f'{title:40} {url:12} {queries:9d} {timing:7.2f}'
+                )
+
+
+def feed_urls():
+    """Создаёт автора, группу и 20 постов, если их ещё нет; возвращает
+    адреса лент. Замеры одного запуска команды используют их вместе."""
+    from posts.models import Group, Post
+
+    author = get_user_model().objects.get_or_create(
+        username='bench_author'
+    )[0]
+    group = Group.objects.get_or_create(
+        slug='bench', defaults={'title': 'bench'}
+    )[0]
+    if not Post.objects.filter(author=author, group=group).exists():
+        for i in range(20):
+            Post.objects.create(text=f'Пост {i}', author=author, group=group)
+    post = Post.objects.filter(author=author, group=group).latest('pk')
+    return (
+        reverse('posts:group_list', args=(group.slug,)),
+        reverse('posts:profile', args=(author.username,)),
+        reverse('posts:post_detail', args=(post.pk,)),
+    )
+
+
+@benchmark('fast_lane')
+def fast_lane(stdout, repeat):
+    """Время анонимного запроса с быстрым путём и без него."""
+    urls = feed_urls()
+    full_stack = [
+        name for name in settings.MIDDLEWARE
+        if name != 'core.middleware.AnonymousFastLaneMiddleware'
+    ]
+    setups = {
+        'полный стек': {'MIDDLEWARE': full_stack},
+        'быстрый путь': {'FAST_LANE_TIMEOUT': 0},
+        'быстрый путь + кэш': {'FAST_LANE_TIMEOUT': 60},
+    }
+    stdout.write(f'{"Настройка":24} {"URL":24} {"мс":>7}')
+    for title, overrides in setups.items():
+        with override_settings(**overrides):
+            client = Client()
+            for url in urls:
+                client.get(url)
+                timing = measure(lambda: client.get(url), repeat)
+                stdout.write(f'{title:24} {url:24} {timing:7.2f}')
+
+
+@benchmark('templates')
+def templates(stdout, repeat):
+    """Первый запрос к страницам после старта с прогревом и без."""
+    from core import warmup
+
+    urls = (reverse('posts:index'),) + feed_urls()
+    production = copy.deepcopy(settings.TEMPLATES)
+    production[0]['APP_DIRS'] = False
+    production[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    stdout.write(f'{"Старт":12} {"URL":24} {"прогрев, мс":>12} '
+                 f'{"1-й запрос, мс":>15} {"2-й запрос, мс":>15}')
+    with override_settings(TEMPLATES=production):
+        loader = engines['django'].engine.template_loaders[0]
+        for title, warm in (('холодный', False), ('прогретый', True)):
+            for url in urls:
+                startup, first, second = [], [], []
+                for _ in range(repeat):
+                    loader.reset()
+                    cache.clear()
+                    client = Client()
+                    started = time.perf_counter()
+                    if warm:
+                        warmup.run()
+                    startup.append((time.perf_counter() - started) * 1000)
+                    cache.clear()
+                    first.append(measure(lambda: client.get(url), 1))
+                    cache.clear()
+                    second.append(measure(lambda: client.get(url), 1))
+                stdout.write(
+                    f'{title:12} {url:24} '
+                    f'{statistics.median(startup):12.2f} '
+                    f'{statistics.median(first):15.2f} '
+                    f'{statistics.median(second):15.2f}'
+                )
+
+
+@benchmark('jinja2')
+def jinja2(stdout, repeat):
+    """Рендеринг страницы из 10 постов шаблонами Django и Jinja2."""
+    from django.contrib.auth.models import AnonymousUser
+    from posts.models import Post
+    from posts.utils import NUM_REC, paginator_project
+
+    feed_urls()
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    page_obj = paginator_project(request, Post.objects.select_related(
+        'author', 'group'
+    ))
+    page_obj.object_list = list(page_obj.object_list)
+    assert len(page_obj) == NUM_REC
+    context = {
+        'page_obj': page_obj,
+        'group': page_obj[0].group,
+        'author': page_obj[0].author,
+    }
+    stdout.write(f'{"Шаблон":24} {"django, мс":>11} {"jinja2, мс":>11}')
+    for name in ('posts/index.html', 'posts/group_list.html',
+                 'posts/profile.html'):
+        timings = []
+        for engine in ('django', 'jinja2'):
+            def render():
+                # {% cache %} в index.html иначе отдаст готовый фрагмент.
+                cache.clear()
+                render_to_string(name, context, request, using=engine)
+            render()
+            timings.append(measure(render, repeat))
+        stdout.write(f'{name:24} {timings[0]:11.2f} {timings[1]:11.2f}')
+
+
+@benchmark('compression')
+def compression_levels(stdout, repeat):
+    """Время и степень сжатия страницы ленты на разных уровнях."""
+    from core import compression
+
+    feed_urls()
+    with override_settings(FAST_LANE_TIMEOUT=0):
+        body = Client().get(reverse('posts:index')).content
+    stdout.write(f'Страница: {len(body)} байт')
+    stdout.write(f'{"Кодировка":10} {"уровень":>8} {"байт":>8} '
+                 f'{"доля":>6} {"мс":>7}')
+    levels = {compression.GZIP: range(1, 10), compression.BROTLI: range(12)}
+    for encoding in compression.ENCODINGS:
+        for level in levels[encoding]:
+            size = len(compression.compress(body, encoding, level))
+            timing = measure(
+                lambda: compression.compress(body, encoding, level), repeat
+            )
+            stdout.write(f'{encoding:10} {level:8d} {size:8d} '
+                         f'{size / len(body):6.3f} {timing:7.3f}')
+
+
+@benchmark('fragments')
+def fragments(stdout, repeat):
+    """Следующие 10 постов: вторая страница целиком и порцией."""
+    from posts.feeds import encode_cursor
+    from posts.models import Post
+
+    feed_urls()
+    tenth = Post.objects.order_by('-pub_date', '-pk')[9]
+    pages = {
+        'страница 2': reverse('posts:index') + '?page=2',
+        'порция': (reverse('posts:index_fragment')
+                   + f'?after={encode_cursor(tenth)}'),
+    }
+    stdout.write(f'{"Запрос":12} {"байт":>7} {"мс":>7}')
+    with override_settings(FAST_LANE_TIMEOUT=0):
+        client = Client()
+        for title, url in pages.items():
+            def get():
+                cache.clear()
+                return client.get(url)
+            size = len(get().content)
+            stdout.write(f'{title:12} {size:7d} {measure(get, repeat):7.2f}')
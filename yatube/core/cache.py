@@ -0,0 +1,144 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.http import Http404
+
+MISSING: str = 'missing'
+LOCAL_SIZE: int = 1024
+LOCAL_TTL: int = 30
+SHARED_TTL: int = 300
+NEGATIVE_TTL: int = 30
+# Бэкенды, которые держат данные в памяти одного процесса.
+LOCAL_BACKENDS: tuple = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared(alias=DEFAULT_CACHE_ALIAS):
+    """Виден ли кэш alias всем процессам сайта."""
+    return settings.CACHES[alias]['BACKEND'] not in LOCAL_BACKENDS
+
+
+class LocalLRU:
+    """Ограниченный по размеру кэш процесса с временем жизни записей."""
+
+    def __init__(self, size=LOCAL_SIZE, ttl=LOCAL_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Возвращает пару (найдено, значение)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        if (self.ttl if ttl is None else ttl) <= 0:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class EntityCache:
+    """Кэш объектов модели по уникальному полю.
+
+    Сначала проверяется кэш процесса, затем общий кэш Django, и только
+    потом база. Отсутствующие объекты тоже кэшируются, но ненадолго:
+    перебор несуществующих адресов не доходит до базы. Кэш процесса
+    живёт local_ttl секунд, поэтому изменения из других процессов
+    видны с такой задержкой; при local_ttl=0 он не используется. Если
+    заданы fields, из базы читаются и кэшируются только эти поля.
+    """
+
+    def __init__(self, model, field, size=LOCAL_SIZE, ttl=SHARED_TTL,
+                 negative_ttl=NEGATIVE_TTL, local_ttl=LOCAL_TTL,
+                 fields=None):
+        self.model = model
+        self.field = field
+        self.fields = fields
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = f'entity:{model._meta.label_lower}:{field}:'
+        self.local = LocalLRU(size, local_ttl)
+        self.counters = Counter()
+
+    def key(self, value):
+        digest = hashlib.md5(str(value).encode()).hexdigest()
+        return self.prefix + digest
+
+    def get(self, value):
+        key = self.key(value)
+        found, obj = self.local.get(key)
+        if found:
+            self.counters['local'] += 1
+        else:
+            obj = cache.get(key)
+            if obj is None:
+                self.counters['miss'] += 1
+                queryset = self.model._default_manager.filter(
+                    **{self.field: value}
+                )
+                if self.fields:
+                    queryset = queryset.only(*self.fields)
+                obj = queryset.first() or MISSING
+                cache.set(key, obj, self.negative_ttl
+                          if obj == MISSING else self.ttl)
+            else:
+                self.counters['shared'] += 1
+            self.local.set(
+                key, obj, min(self.negative_ttl, self.local.ttl)
+                if obj == MISSING else None
+            )
+        if obj == MISSING:
+            self.counters['negative'] += 1
+            return None
+        return copy.copy(obj)
+
+    def get_or_404(self, value):
+        obj = self.get(value)
+        if obj is None:
+            raise Http404(
+                f'{self.model._meta.object_name} {value} не найден'
+            )
+        return obj
+
+    def invalidate(self, *values):
+        keys = [self.key(value) for value in values if value is not None]
+        for key in keys:
+            self.local.delete(key)
+        cache.delete_many(keys)
+
+    def stats(self):
+        hits = self.counters['local'] + self.counters['shared']
+        total = hits + self.counters['miss']
+        return dict(
+            self.counters,
+            hit_ratio=hits / total if total else 0.0,
+        )
@@ -0,0 +1,146 @@
+"""Прогрев кэшей самыми посещаемыми страницами после деплоя.
+
+После перезапуска LocMemCache пуст, и первые посетители популярных
+страниц платят за запросы к базе, рендер и создание миниатюр. warm()
+запрашивает адреса, которые отдают зарегистрированные декоратором
+hot_urls функции приложений (модули warmup), через обработчик с тем же
+стеком middleware, что у сайта: заполняются кэш быстрого пути,
+фрагменты шаблонов и миниатюры sorl. Запросы собирает RequestFactory;
+тестовый клиент не годится, потому что на время каждого запроса он
+глобально отключает close_old_connections и мешает живым запросам
+процесса. Запросы идут в нескольких потоках; адреса, до которых
+очередь не дошла за отведённое время, пропускаются.
+
+Ключи кэша страниц включают адрес сайта, поэтому запросы идут от имени
+хоста и схемы SITE_URL, без cookies — как у анонимного посетителя.
+Команда warm_caches работает в своём процессе и наполняет общие
+хранилища: файлы миниатюр и их записи в kvstore, а также кэш, если он
+общий для процессов. Локальный кэш процесса сайта наполняет start(),
+который wsgi.py вызывает при CACHE_WARMUP. Страницы быстрого пути из
+прогрева живут FAST_LANE_TIMEOUT секунд (см. yatube.settings_prod).
+"""
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.db import connection
+from django.utils.module_loading import autodiscover_modules
+
+PAGES: int = 5
+LIMIT: int = 10
+BUDGET: float = 30
+WORKERS: int = 4
+
+logger = logging.getLogger(__name__)
+registry: dict = {}
+
+
+def hot_urls(func):
+    """Регистрирует функцию func(pages, limit), которая отдаёт самые
+    посещаемые адреса приложения, от важных к менее важным."""
+    registry[f'{func.__module__}.{func.__name__}'] = func
+    return func
+
+
+def collect(pages=PAGES, limit=LIMIT):
+    """Адреса всех приложений без повторов."""
+    autodiscover_modules('warmup')
+    urls = []
+    for name, func in registry.items():
+        try:
+            urls.extend(func(pages, limit))
+        except Exception:
+            logger.exception('Адреса для прогрева %s не получены', name)
+    return list(dict.fromkeys(urls))
+
+
+def fetch(handler, factory, url):
+    """Запрашивает адрес; возвращает (статус или None при ошибке, мс)."""
+    site = urlsplit(settings.SITE_URL)
+    started = time.perf_counter()
+    try:
+        # Без сигналов request_started/finished: их обработчики закрыли
+        # бы соединение с базой вызывающего потока. Соединения потоков
+        # прогрева закрывает warm().
+        status = handler.get_response(factory.get(
+            url, HTTP_HOST=site.netloc, secure=site.scheme == 'https'
+        )).status_code
+    except Exception:
+        logger.exception('Прогрев %s не удался', url)
+        status = None
+    return status, (time.perf_counter() - started) * 1000
+
+
+def warm(urls, budget=BUDGET, workers=WORKERS):
+    """Запрашивает адреса в workers потоках, пока не выйдет budget секунд.
+
+    Новый запрос не начинается после срока, начатый доводится до конца.
+    Возвращает {адрес: (статус, мс)}; пропущенных адресов в нём нет.
+    """
+    # django.test нужен только здесь: на старте процесса он не грузится.
+    from django.test import RequestFactory
+
+    handler = BaseHandler()
+    handler.load_middleware()
+    factory = RequestFactory()
+    deadline = time.monotonic() + budget
+    pending = iter(urls)
+    lock = threading.Lock()
+    results = {}
+
+    def work():
+        while time.monotonic() < deadline:
+            with lock:
+                url = next(pending, None)
+            if url is None:
+                return
+            results[url] = fetch(handler, factory, url)
+
+    def thread_work():
+        try:
+            work()
+        finally:
+            connection.close()
+
+    if workers <= 1:
+        work()
+        return results
+    threads = [
+        threading.Thread(target=thread_work, name=f'cache-warmup-{number}')
+        for number in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def run(pages=PAGES, limit=LIMIT, budget=BUDGET, workers=WORKERS):
+    """Собирает адреса и прогревает их; итог пишется в лог."""
+    started = time.perf_counter()
+    urls = collect(pages, limit)
+    results = warm(urls, budget, workers)
+    warmed = sum(status == 200 for status, _ in results.values())
+    logger.info(
+        'Прогрев кэшей: %d из %d адресов, ошибок %d, пропущено %d, %.1f с',
+        warmed, len(urls), len(results) - warmed, len(urls) - len(results),
+        time.perf_counter() - started,
+    )
+    return urls, results
+
+
+def start():
+    """Прогревает кэш процесса в фоне, не задерживая его старт."""
+    def target():
+        try:
+            run(budget=settings.CACHE_WARMUP_BUDGET)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=target, name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
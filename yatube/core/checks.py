@@ -0,0 +1,26 @@
+"""Проверки боевых настроек core для manage.py check --deploy."""
+from django.core.checks import Error, Tags, register
+
+from .cache import is_shared
+
+
+@register(Tags.caches, deploy=True)
+def shared_cache_check(app_configs, **kwargs):
+    """Кэш default должен быть общим для процессов сайта.
+
+    В нём лежат сессии с отложенной записью (core.sessions), пользователи
+    сессий (core.backends) и поколение ключей страниц быстрого пути
+    (core.middleware), которое меняется при записи контента. С кэшем в
+    памяти процесса выход, смена пароля, блокировка и сброс страниц
+    действуют только в одном процессе, а остальные отдают устаревшие
+    данные. Пользователи сессий хранятся с хэшем пароля, поэтому кэш
+    должен быть закрыт от всех, кроме процессов сайта.
+    """
+    if is_shared():
+        return []
+    return [Error(
+        'Кэш default хранится в памяти процесса.',
+        hint=('Укажите в CACHES общий для процессов бэкенд, как в '
+              'yatube.settings_prod.'),
+        id='core.E001',
+    )]
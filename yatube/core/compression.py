@@ -0,0 +1,97 @@
+"""Сжатие ответов и статики: gzip и brotli.
+
+ENCODINGS перечисляет кодировки в порядке предпочтения; brotli есть,
+только если установлен пакет Brotli.
+"""
+import gzip
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP: str = 'gzip'
+BROTLI: str = 'br'
+ENCODINGS: tuple = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+SUFFIXES: dict = {GZIP: '.gz', BROTLI: '.br'}
+# Сжатие статики делается один раз при сборке, поэтому уровни максимальные.
+BUILD_LEVELS: dict = {GZIP: 9, BROTLI: 11}
+COMPRESSIBLE_TYPES: tuple = (
+    'text/', 'application/javascript', 'application/json',
+    'application/xml', 'image/svg+xml',
+)
+# Уровни для ответов, сжимаемых на каждый запрос, выбраны по замеру
+# manage.py benchmark compression на странице ленты: выше них размер
+# почти не меняется, а время растёт (у brotli с 9 уровня в 20 раз).
+LEVELS: dict = {GZIP: 5, BROTLI: 5}
+ACCEPT_RE = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q=([0-9.]+))?')
+
+
+def compressible(content_type):
+    content_type = content_type.split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    result = set()
+    for part in header.split(','):
+        match = ACCEPT_RE.match(part)
+        if match is None:
+            continue
+        encoding, quality = match.groups()
+        try:
+            if quality is not None and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        result.add(encoding.lower())
+    return result
+
+
+def choose_encoding(header, available=ENCODINGS):
+    """Лучшая из available кодировка, которую принимает клиент."""
+    if not header:
+        return None
+    accept = accepted(header)
+    for encoding in available:
+        if encoding in accept or '*' in accept:
+            return encoding
+    return None
+
+
+def compress(data, encoding, level):
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compressor(encoding, level):
+    """Потоковый компрессор: функции (сжать кусок, завершить)."""
+    if encoding == BROTLI:
+        stream = brotli.Compressor(quality=level)
+
+        def process(chunk):
+            return stream.process(chunk) + stream.flush()
+        return process, stream.finish
+    stream = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(chunk):
+        return stream.compress(chunk) + stream.flush(zlib.Z_SYNC_FLUSH)
+    return process, stream.flush
+
+
+def compress_stream(chunks, encoding, level):
+    """Сжимает поток по кускам, не накапливая его в памяти.
+
+    Каждый кусок сбрасывается сразу, чтобы клиент получал данные
+    по мере их появления.
+    """
+    process, finish = compressor(encoding, level)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -0,0 +1,56 @@
+"""Окружение Jinja2 для страниц, выбранных в JINJA2_VIEWS.
+
+Шаблоны лежат в каталоге jinja2/ и повторяют разметку шаблонов Django.
+Вместо тегов и фильтров Django в окружении есть функции url, static и
+thumbnail и фильтры date, linebreaksbr, truncatechars и addclass.
+"""
+from datetime import datetime
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.defaultfilters import linebreaksbr, truncatechars
+from django.urls import reverse
+from django.utils import formats, timezone
+from jinja2 import Environment
+from sorl.thumbnail import get_thumbnail
+
+from .templatetags.user_filters import addclass
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def thumbnail(file, geometry, **options):
+    """Миниатюра как у тега {% thumbnail %}; None, если картинки нет."""
+    if not file:
+        return None
+    try:
+        return get_thumbnail(file, geometry, **options)
+    except Exception:
+        # Тег sorl тоже молча пропускает битые картинки.
+        return None
+
+
+def date(value, arg=None):
+    if not value:
+        return ''
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return formats.date_format(value, arg)
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update(
+        static=staticfiles_storage.url,
+        url=url,
+        thumbnail=thumbnail,
+        year=lambda: datetime.now().year,
+    )
+    env.filters.update(
+        addclass=addclass,
+        date=date,
+        linebreaksbr=linebreaksbr,
+        truncatechars=truncatechars,
+    )
+    return env
@@ -0,0 +1,403 @@
+"""Нагрузочный прогон сайта по HTTP, запускаемый командой loadtest.
+
+Замеры из benchmarks.py вызывают представления по одному и не видят,
+как запись постов и комментариев мешает чтению лент: SQLite блокирует
+базу на запись целиком. Здесь yatube.wsgi.application работает в
+многопоточном сервере (при processes > 1 — в нескольких процессах на
+одном сокете), а потоки-посетители одновременно листают ленты, читают
+подписки, пишут посты с картинками и комментарии. По каждому маршруту
+считаются пропускная способность, перцентили задержки и доля ошибок.
+"""
+import http.client
+import os
+import random
+import signal
+import threading
+import time
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+from socketserver import ThreadingMixIn
+from urllib.parse import urlencode, urlsplit
+from uuid import uuid4
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from .benchmarks import percentile
+
+SMALL_GIF: bytes = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+# Доли сценариев в прогоне по умолчанию.
+DEFAULT_MIX: dict = {'browse': 70, 'follow': 15, 'comment': 10, 'post': 5}
+# Сколько секунд посетитель ждёт ответа; дольше — ошибка с кодом 0.
+TIMEOUT: int = 10
+FEED_PAGES: int = 3
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_server(application, processes=1):
+    """Запускает сервер на свободном порту.
+
+    Возвращает адрес сервера и функцию, которая его останавливает.
+    """
+    server = make_server(
+        '127.0.0.1', 0, application, ThreadingServer, QuietHandler
+    )
+    children = []
+    if processes > 1:
+        # Соединения с базой не должны переходить в дочерние процессы.
+        connections.close_all()
+        for _ in range(processes):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    server.serve_forever()
+                finally:
+                    os._exit(0)
+            children.append(pid)
+    else:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        if children:
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+        else:
+            server.shutdown()
+        server.server_close()
+
+    return f'http://127.0.0.1:{server.server_port}', stop
+
+
+class Site:
+    """Данные, по которым ходят посетители: адреса и сессии."""
+
+    def __init__(self, post_ids, group_slugs, usernames, sessions):
+        self.post_ids = post_ids
+        self.group_slugs = group_slugs
+        self.usernames = usernames
+        self.sessions = sessions
+
+    def pages(self, rnd):
+        """Случайная страница для анонимного посетителя: (маршрут, URL)."""
+        page = rnd.randint(1, FEED_PAGES)
+        return rnd.choice((
+            ('index', reverse('posts:index')
+             + (f'?page={page}' if page > 1 else '')),
+            ('group_list', reverse(
+                'posts:group_list', args=(rnd.choice(self.group_slugs),)
+            )),
+            ('profile', reverse(
+                'posts:profile', args=(rnd.choice(self.usernames),)
+            )),
+            ('post_detail', reverse(
+                'posts:post_detail', args=(rnd.choice(self.post_ids),)
+            )),
+        ))
+
+
+def seed(users=20, groups=5, posts=200, follows=5, rnd=None):
+    """Наполняет базу и входит всеми пользователями; возвращает Site."""
+    from posts import aggregates, monthly
+    from posts.models import Follow, Group, Post
+
+    rnd = rnd or random.Random()
+    User = get_user_model()
+    prefix = uuid4().hex[:6]
+    User.objects.bulk_create(
+        User(username=f'load_{prefix}_{number}', password='!')
+        for number in range(users)
+    )
+    authors = list(User.objects.filter(username__startswith=f'load_{prefix}'))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {number}', slug=f'load-{prefix}-{number}')
+        for number in range(groups)
+    )
+    group_list = list(Group.objects.filter(slug__startswith=f'load-{prefix}'))
+    Post.objects.bulk_create(
+        Post(
+            author=rnd.choice(authors),
+            group=rnd.choice(group_list + [None]),
+            text=f'Пост {number} ' + 'нагрузка ' * rnd.randint(5, 50),
+        )
+        for number in range(posts)
+    )
+    Follow.objects.bulk_create(
+        Follow(user=user, author=author)
+        for user in authors
+        for author in rnd.sample(authors, min(follows, len(authors)))
+        if author != user
+    )
+    for group in group_list:
+        aggregates.refresh_group_stats(group.pk)
+    monthly.rebuild()
+    sessions = []
+    for user in authors:
+        client = Client()
+        client.force_login(user)
+        sessions.append(client.cookies[settings.SESSION_COOKIE_NAME].value)
+    return Site(
+        post_ids=list(
+            Post.objects.filter(author__in=authors)
+            .values_list('pk', flat=True)
+        ),
+        group_slugs=[group.slug for group in group_list],
+        usernames=[user.username for user in authors],
+        sessions=sessions,
+    )
+
+
+class Visitor:
+    """Посетитель со своими cookies; каждый запрос — новое соединение."""
+
+    def __init__(self, base_url, cookies=None):
+        address = urlsplit(base_url)
+        self.host = address.hostname
+        self.port = address.port
+        self.cookies = dict(cookies or {})
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(
+                f'{name}={value}' for name, value in self.cookies.items()
+            )
+        connection = http.client.HTTPConnection(
+            self.host, self.port, timeout=TIMEOUT
+        )
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            content = response.read()
+        finally:
+            connection.close()
+        for header in response.headers.get_all('Set-Cookie') or ():
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status, content
+
+
+class Results:
+    """Задержки и коды ответов по маршрутам, общие для всех потоков."""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def record(self, route, status, seconds):
+        with self.lock:
+            self.timings[route].append(seconds * 1000)
+            self.statuses[route][status] += 1
+
+    def total(self):
+        return sum(len(timings) for timings in self.timings.values())
+
+
+def timed(results, visitor, route, method, path, body=None, headers=None):
+    """Запрос с замером; код 0 — соединение оборвалось или таймаут."""
+    started = time.perf_counter()
+    try:
+        status, _ = visitor.request(method, path, body, headers)
+    except (OSError, http.client.HTTPException):
+        status = 0
+    results.record(route, status, time.perf_counter() - started)
+    return status
+
+
+def csrf_token(results, visitor):
+    """Токен CSRF из cookie; за cookie заходит на форму нового поста.
+
+    До Django 4.0 cookie хранит маскированный токен, и его можно
+    отправить в форме как есть.
+    """
+    if settings.CSRF_COOKIE_NAME not in visitor.cookies:
+        timed(results, visitor, 'post_create (форма)', 'GET',
+              reverse('posts:post_create'))
+    return visitor.cookies.get(settings.CSRF_COOKIE_NAME, '')
+
+
+def multipart(fields, files):
+    """Тело multipart/form-data и его Content-Type."""
+    boundary = uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; '
+            f'name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def browse(results, visitor, site, rnd):
+    """Аноним без cookies открывает ленту, группу, профиль или пост."""
+    route, path = site.pages(rnd)
+    timed(results, visitor, route, 'GET', path)
+
+
+def follow(results, visitor, site, rnd):
+    """Пользователь читает ленту подписок."""
+    timed(results, visitor, 'follow_index', 'GET',
+          reverse('posts:follow_index'))
+
+
+def comment(results, visitor, site, rnd):
+    """Пользователь комментирует случайный пост."""
+    token = csrf_token(results, visitor)
+    timed(
+        results, visitor, 'add_comment', 'POST',
+        reverse('posts:add_comment', args=(rnd.choice(site.post_ids),)),
+        urlencode({'text': 'Комментарий', 'csrfmiddlewaretoken': token}),
+        {'Content-Type': 'application/x-www-form-urlencoded'},
+    )
+
+
+def post(results, visitor, site, rnd):
+    """Пользователь публикует пост с картинкой."""
+    token = csrf_token(results, visitor)
+    body, content_type = multipart(
+        {
+            'text': 'Пост под нагрузкой',
+            'group': '',
+            'csrfmiddlewaretoken': token,
+        },
+        {'image': ('load.gif', SMALL_GIF, 'image/gif')},
+    )
+    timed(results, visitor, 'post_create', 'POST',
+          reverse('posts:post_create'), body,
+          {'Content-Type': content_type})
+
+
+SCENARIOS: dict = {
+    'browse': browse,
+    'follow': follow,
+    'comment': comment,
+    'post': post,
+}
+
+
+def parse_mix(value):
+    """'browse=7,post=1' -> {'browse': 7, 'post': 1}; ValueError, если
+    сценарий неизвестен или доли не положительны."""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Нет сценария {name!r}')
+        mix[name] = int(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f'Отрицательная доля у {name!r}')
+    if not any(mix.values()):
+        raise ValueError('Все доли нулевые')
+    return mix
+
+
+def drive(base_url, site, mix=None, concurrency=8, duration=10,
+          requests=None, seed=None):
+    """Гоняет concurrency посетителей duration секунд или до requests
+    запросов; возвращает Results и затраченное время в секундах."""
+    mix = mix or DEFAULT_MIX
+    names, weights = zip(*mix.items())
+    results = Results()
+    deadline = time.monotonic() + duration
+
+    def done():
+        return time.monotonic() >= deadline or (
+            requests is not None and results.total() >= requests
+        )
+
+    def visit(number):
+        rnd = random.Random(None if seed is None else seed + number)
+        member = Visitor(base_url, {
+            settings.SESSION_COOKIE_NAME:
+                site.sessions[number % len(site.sessions)],
+        })
+        while not done():
+            name = rnd.choices(names, weights)[0]
+            # Анонимы приходят без cookies, как поисковики и новые гости.
+            visitor = Visitor(base_url) if name == 'browse' else member
+            SCENARIOS[name](results, visitor, site, rnd)
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=visit, args=(number,))
+        for number in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def failed(status):
+    return status == 0 or status >= 400
+
+
+def report(results, elapsed):
+    """Строки отчёта: по маршрутам и итог."""
+    lines = [
+        f'{"Маршрут":22} {"запросов":>9} {"в сек":>7} {"ошибок":>7} '
+        f'{"p50, мс":>8} {"p95, мс":>8} {"p99, мс":>8} {"max, мс":>8}'
+    ]
+    routes = sorted(results.timings)
+    everything = Counter()
+    for route in routes + [None]:
+        if route is None:
+            timings = [
+                timing for values in results.timings.values()
+                for timing in values
+            ]
+            statuses, title = everything, 'всего'
+        else:
+            timings = results.timings[route]
+            statuses, title = results.statuses[route], route
+            everything.update(statuses)
+        errors = sum(
+            count for status, count in statuses.items() if failed(status)
+        )
+        lines.append(
+            f'{title:22} {len(timings):9d} '
+            f'{len(timings) / elapsed if elapsed else 0:7.1f} '
+            f'{errors / len(timings) if timings else 0:7.1%} '
+            f'{percentile(timings, 0.5):8.1f} '
+            f'{percentile(timings, 0.95):8.1f} '
+            f'{percentile(timings, 0.99):8.1f} '
+            f'{max(timings, default=0):8.1f}'
+        )
+    codes = ', '.join(
+        f'{status}: {count}' for status, count in sorted(everything.items())
+        if failed(status)
+    )
+    if codes:
+        lines.append(f'Ошибки по кодам (0 — нет ответа): {codes}')
+    return lines
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from core import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Запускает замеры производительности на временной базе.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names', nargs='*',
+            help='Какие замеры запустить; без имён выводится их список.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Сколько раз повторять каждый замер.'
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules('benchmarks')
+        if not options['names']:
+            for name, func in sorted(benchmarks.registry.items()):
+                self.stdout.write(f'{name}: {func.__doc__}')
+            return
+        unknown = set(options['names']) - set(benchmarks.registry)
+        if unknown:
+            raise CommandError(f'Нет замеров: {", ".join(sorted(unknown))}')
+        with benchmarks.test_database():
+            for name in options['names']:
+                self.stdout.write(self.style.MIGRATE_HEADING(name))
+                benchmarks.registry[name](self.stdout, options['repeat'])
@@ -0,0 +1,105 @@
+import os
+import random
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from core import benchmarks, loadtest
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный прогон: сайт в многопоточном сервере на временной '
+            'базе и одновременные посетители с разными сценариями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Сколько посетителей работают одновременно.'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Сколько секунд длится прогон.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=None,
+            help='Остановиться после стольких запросов.'
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Сколько процессов сервера слушают один сокет.'
+        )
+        parser.add_argument(
+            '--mix', default=None,
+            help='Доли сценариев, например browse=70,follow=15,'
+                 'comment=10,post=5.'
+        )
+        parser.add_argument(
+            '--users', type=int, default=20,
+            help='Сколько пользователей создать.'
+        )
+        parser.add_argument(
+            '--posts', type=int, default=500,
+            help='Сколько постов создать.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Начальное значение генератора для повторяемых прогонов.'
+        )
+        parser.add_argument(
+            '--ratelimit', action='store_true',
+            help='Не отключать ограничение частоты запросов на запись.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = loadtest.parse_mix(options['mix'] or ','.join(
+                f'{name}={weight}'
+                for name, weight in loadtest.DEFAULT_MIX.items()
+            ))
+        except ValueError as error:
+            raise CommandError(error)
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError('Нужен хотя бы один пользователь и поток.')
+        workdir = tempfile.mkdtemp(prefix='yatube-loadtest-')
+        # Файл, а не база в памяти: её видят все потоки и процессы, и
+        # блокировки SQLite на запись такие же, как на сайте.
+        name = None
+        if connection.vendor == 'sqlite':
+            name = os.path.join(workdir, 'db.sqlite3')
+        overrides = {
+            'MEDIA_ROOT': os.path.join(workdir, 'media'),
+            'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+        }
+        if not options['ratelimit']:
+            overrides['RATELIMIT_ENABLED'] = False
+        try:
+            with benchmarks.test_database(name), override_settings(
+                    **overrides):
+                site = loadtest.seed(
+                    users=options['users'], posts=options['posts'],
+                    rnd=random.Random(options['seed']),
+                )
+                from yatube.wsgi import application
+
+                base_url, stop = loadtest.start_server(
+                    application, options['processes']
+                )
+                self.stdout.write(
+                    f'Сервер {base_url}, процессов: {options["processes"]}, '
+                    f'посетителей: {options["concurrency"]}'
+                )
+                try:
+                    results, elapsed = loadtest.drive(
+                        base_url, site, mix, options['concurrency'],
+                        options['duration'], options['requests'],
+                        options['seed'],
+                    )
+                finally:
+                    stop()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        for line in loadtest.report(results, elapsed):
+            self.stdout.write(line)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from core.proxy import ProxyServer
+
+
+class Command(BaseCommand):
+    help = 'Запускает кэширующий обратный прокси перед сайтом.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--port', type=int, default=6081,
+            help='Порт, на котором слушает прокси.'
+        )
+        parser.add_argument(
+            '--upstream', default='http://127.0.0.1:8000',
+            help='Адрес сайта, которому прокси пересылает запросы.'
+        )
+
+    def handle(self, *args, **options):
+        server = ProxyServer(('127.0.0.1', options['port']),
+                             options['upstream'])
+        self.stdout.write(
+            f'Прокси на http://127.0.0.1:{options["port"]}/ '
+            f'перед {options["upstream"]}; PROXY_PURGE_URL может '
+            f'указывать на этот адрес.'
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            cache = server.cache
+            self.stdout.write(
+                f'Попаданий: {cache.hits}, промахов: {cache.misses}'
+            )
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import worker
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и выйти.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        worker.discover()
+        while True:
+            done = worker.run_pending()
+            if done:
+                self.stdout.write(f'Выполнено задач: {done}')
+            if options['once']:
+                break
+            if not done:
+                time.sleep(options['sleep'])
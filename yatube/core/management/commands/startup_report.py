@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from core import startup
+
+
+class Command(BaseCommand):
+    help = ('Замеряет старт процесса сайта в новом интерпретаторе: шаги '
+            'wsgi.py и время импорта по пакетам (python -X importtime).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Сколько пакетов и импортов показать.'
+        )
+
+    def handle(self, *args, **options):
+        timings, imports, elapsed = startup.run_child()
+        self.stdout.write(self.style.MIGRATE_HEADING('Шаги старта'))
+        for name, ms in timings.items():
+            self.stdout.write(f'{name:50} {ms:9.1f} мс')
+        self.stdout.write(f'{"процесс целиком":50} {elapsed:9.1f} мс')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Импорт по пакетам'))
+        packages = startup.by_package(imports)
+        self.stdout.write(
+            f'{"всего":50} {sum(packages.values()) / 1000:9.1f} мс'
+        )
+        for name, own in packages.most_common(options['top']):
+            self.stdout.write(f'{name:50} {own / 1000:9.1f} мс')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Самые долгие импорты верхнего уровня (вместе с вложенными)'
+        ))
+        roots = sorted(
+            (item for item in imports if item[2] == 0),
+            key=lambda item: item[1], reverse=True,
+        )
+        for _, total, _, name in roots[:options['top']]:
+            self.stdout.write(f'{name:50} {total / 1000:9.1f} мс')
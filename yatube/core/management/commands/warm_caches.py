@@ -0,0 +1,53 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from core import cachewarm
+
+
+class Command(BaseCommand):
+    help = ('Прогревает кэши после деплоя: запрашивает первые страницы '
+            'ленты, крупные группы, популярных авторов и обсуждаемые '
+            'посты в нескольких потоках за отведённое время.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=cachewarm.PAGES,
+            help='Сколько страниц главной ленты прогреть.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=cachewarm.LIMIT,
+            help='Сколько групп, авторов и постов прогреть.'
+        )
+        parser.add_argument(
+            '--budget', type=float, default=cachewarm.BUDGET,
+            help='Время на прогрев, секунд.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=cachewarm.WORKERS,
+            help='Число параллельных запросов.'
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(caches['default'], LocMemCache):
+            self.stdout.write(self.style.WARNING(
+                'LocMemCache у каждого процесса свой: команда прогреет '
+                'миниатюры, а страницы процессов сайта — CACHE_WARMUP.'
+            ))
+        urls, results = cachewarm.run(
+            options['pages'], options['limit'],
+            options['budget'], options['workers'],
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING('Прогрев'))
+        for url in urls:
+            if url not in results:
+                self.stdout.write(f'{url:50} пропущен')
+                continue
+            status, ms = results[url]
+            self.stdout.write(f'{url:50} {status or "ошибка":>6} {ms:9.1f} мс')
+        warmed = sum(status == 200 for status, _ in results.values())
+        self.stdout.write(
+            f'Прогрето {warmed} из {len(urls)}, '
+            f'ошибок {len(results) - warmed}, '
+            f'пропущено по времени {len(urls) - len(results)}'
+        )
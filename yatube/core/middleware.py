@@ -0,0 +1,337 @@
+"""Middleware проекта: сжатие ответов, раздача собранной статики,
+контроль нагрузки и быстрый путь для анонимных запросов на чтение.
+
+GET без cookies к маршрутам из FAST_LANE_ROUTES не проходит остальные
+middleware: у такого запроса нет сессии, пользователь заведомо аноним,
+а проверка CSRF для GET не нужна. Готовая страница хранится в кэше
+FAST_LANE_TIMEOUT секунд; изменение контента сбрасывает весь кэш
+быстрого пути сменой поколения ключей (invalidate_pages); процессам
+нужен общий кэш, см. core.E001.
+"""
+import hashlib
+import mimetypes
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import OperationalError
+from django.http import (FileResponse, HttpResponse,
+                         HttpResponseNotModified)
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import compression
+
+GENERATION_KEY: str = 'fastlane:generation'
+SAFE_METHODS: tuple = ('GET', 'HEAD')
+IMMUTABLE_CACHE: str = 'public, max-age=31536000, immutable'
+STATIC_CACHE: str = 'public, max-age=60'
+MIN_COMPRESS_SIZE: int = 200
+COMPRESSED_TTL: int = 300
+STALE_TTL: int = 600
+RETRY_AFTER: int = 5
+SERVER_ERRORS: tuple = (500, 502, 503, 504)
+
+
+def invalidate_pages():
+    """Делает устаревшими все страницы быстрого пути."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def page_key(request):
+    generation = cache.get(GENERATION_KEY, 0)
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'fastlane:{generation}:{request.method}:{digest}'
+
+
+def cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and 'private' not in response.get('Cache-Control', '')
+    )
+
+
+class AnonymousFastLaneMiddleware:
+    """Отдаёт анонимные страницы из кэша или рендерит их в обход стека."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = frozenset(getattr(settings, 'FAST_LANE_ROUTES', ()))
+        if not self.routes:
+            raise MiddlewareNotUsed
+        self.timeout = getattr(settings, 'FAST_LANE_TIMEOUT', 0)
+        self.csrf = CsrfViewMiddleware(get_response)
+        self.xframe = XFrameOptionsMiddleware(get_response)
+
+    def match(self, request):
+        if request.method not in SAFE_METHODS or request.COOKIES:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        return match if match.view_name in self.routes else None
+
+    def __call__(self, request):
+        match = self.match(request)
+        if match is None:
+            return self.get_response(request)
+        key = page_key(request) if self.timeout else None
+        if key is not None:
+            response = cache.get(key)
+            if response is not None:
+                response['X-Fast-Lane'] = 'hit'
+                return response
+        request.user = AnonymousUser()
+        request.resolver_match = match
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+        # Шаблон мог запросить CSRF-токен: cookie ставится как обычно.
+        response = self.csrf.process_response(request, response)
+        response = self.xframe.process_response(request, response)
+        if key is not None and cacheable(response):
+            cache.set(key, response, self.timeout)
+        response['X-Fast-Lane'] = 'miss'
+        return response
+
+
+def stale_key(request):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'stale:{digest}'
+
+
+class AdmissionControlMiddleware:
+    """Ограничивает число одновременно обрабатываемых запросов.
+
+    Запрос ждёт свободного места не дольше ADMISSION_TIMEOUT секунд; если
+    мест нет, а очередь длиннее ADMISSION_QUEUE, или база отвечает
+    OperationalError (например, «database is locked»), сервер сбрасывает
+    нагрузку: GET получает сохранённую копию публичной страницы, если она
+    есть, остальные — 503 с Retry-After. Копия публичной страницы
+    обновляется раз в STALE_TTL секунд и отдаётся также вместо ошибок 5xx.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.concurrency = getattr(settings, 'ADMISSION_CONCURRENCY', 0)
+        if not self.concurrency:
+            raise MiddlewareNotUsed
+        self.queue = getattr(settings, 'ADMISSION_QUEUE', self.concurrency)
+        self.timeout = getattr(settings, 'ADMISSION_TIMEOUT', 1)
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+        self.lock = threading.Lock()
+        self.waiting = 0
+
+    def admit(self):
+        if self.slots.acquire(blocking=False):
+            return True
+        with self.lock:
+            if self.waiting >= self.queue:
+                return False
+            self.waiting += 1
+        try:
+            return self.slots.acquire(timeout=self.timeout)
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def __call__(self, request):
+        if not self.admit():
+            return self.shed(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.slots.release()
+        if request.method != 'GET' or response.has_header('X-Degraded'):
+            return response
+        if response.status_code in SERVER_ERRORS:
+            return self.stale(request) or response
+        if (cacheable(response)
+                and 'public' in response.get('Cache-Control', '')
+                and response.get('X-Fast-Lane') != 'hit'):
+            key = stale_key(request)
+            if key not in cache:
+                cache.set(key, response, STALE_TTL)
+        return response
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, OperationalError):
+            return self.shed(request)
+        return None
+
+    @staticmethod
+    def stale(request):
+        response = cache.get(stale_key(request))
+        if response is not None:
+            response['X-Degraded'] = 'stale'
+            response['Warning'] = '110 - "Response is Stale"'
+            response['Cache-Control'] = 'no-cache'
+        return response
+
+    def shed(self, request):
+        response = self.stale(request) if request.method == 'GET' else None
+        if response is None:
+            response = HttpResponse(
+                'Сервер перегружен, попробуйте позже.', status=503
+            )
+            response['X-Degraded'] = 'shed'
+        response['Retry-After'] = str(RETRY_AFTER)
+        return response
+
+
+class StaticFilesMiddleware:
+    """Отдаёт файлы из STATIC_ROOT без отдельного веб-сервера.
+
+    Список файлов читается при старте: статику собирает collectstatic
+    до запуска процесса. Если рядом с файлом лежат копии .br или .gz,
+    отдаётся та, которую принимает клиент. Файлы с хэшем в имени (из
+    манифеста) кэшируются браузером на год без перепроверки.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        root = settings.STATIC_ROOT
+        if settings.DEBUG or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.prefix = settings.STATIC_URL
+        self.files = self.scan(root)
+        self.immutable = frozenset(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+
+    @staticmethod
+    def scan(root):
+        suffixes = {
+            suffix: encoding
+            for encoding, suffix in compression.SUFFIXES.items()
+        }
+        files = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                base, suffix = os.path.splitext(name)
+                encoding = suffixes.get(suffix)
+                if encoding is None:
+                    files.setdefault(name, {})[None] = path
+                else:
+                    files.setdefault(base, {})[encoding] = path
+        return {
+            name: variants for name, variants in files.items()
+            if None in variants
+        }
+
+    def __call__(self, request):
+        if (request.method not in SAFE_METHODS
+                or not request.path.startswith(self.prefix)):
+            return self.get_response(request)
+        name = request.path[len(self.prefix):]
+        variants = self.files.get(name)
+        if variants is None:
+            return self.get_response(request)
+        return self.serve(request, name, variants)
+
+    def serve(self, request, name, variants):
+        path = variants[None]
+        stat = os.stat(path)
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime, stat.st_size
+        ):
+            return HttpResponseNotModified()
+        encoding = compression.choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+            [item for item in compression.ENCODINGS if item in variants]
+        )
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(variants[encoding], 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+        if len(variants) > 1:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = (
+            IMMUTABLE_CACHE if name in self.immutable else STATIC_CACHE
+        )
+        return response
+
+
+def reusable(response):
+    """Ответ отдаётся повторно: из кэша быстрого пути или cache_page."""
+    cache_control = response.get('Cache-Control', '')
+    if 'private' in cache_control or 'no-store' in cache_control:
+        return False
+    return response.has_header('X-Fast-Lane') or 'max-age' in cache_control
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli по Accept-Encoding.
+
+    Потоковые ответы сжимаются по кускам, без накопления в памяти.
+    Уже сжатые ответы и нетекстовые типы (картинки, архивы) не трогаются.
+    Сжатое тело страниц, которые отдаются повторно, хранится в кэше по
+    хэшу содержимого, и попадание в кэш страницы не сжимает её заново.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.has_header('Content-Encoding')
+                or not compression.compressible(
+                    response.get('Content-Type', ''))):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if (not response.streaming
+                and len(response.content) < MIN_COMPRESS_SIZE):
+            return response
+        encoding = compression.choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        level = compression.LEVELS[encoding]
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(
+                response.streaming_content, encoding, level
+            )
+            if response.has_header('Content-Length'):
+                del response['Content-Length']
+        else:
+            response.content = self.compressed_body(response, encoding, level)
+            response['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag', '')
+        if etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def compressed_body(response, encoding, level):
+        if not reusable(response):
+            return compression.compress(response.content, encoding, level)
+        digest = hashlib.md5(response.content).hexdigest()
+        key = f'compressed:{encoding}:{level}:{digest}'
+        body = cache.get(key)
+        if body is None:
+            body = compression.compress(response.content, encoding, level)
+            cache.set(key, body, COMPRESSED_TTL)
+        return body
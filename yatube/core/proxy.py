@@ -0,0 +1,298 @@
+"""HTTP-кэширование на обратном прокси.
+
+Представления помечаются декоратором cache_policy: анонимный ответ
+получает Cache-Control с s-maxage и заголовок Surrogate-Key со списком
+ключей (пост, автор, группа, лента), ответ вошедшему пользователю
+остаётся приватным. При изменении данных purge отправляет прокси запрос
+PURGE с ключами устаревших страниц.
+
+ProxyServer — простая замена настоящему прокси (Varnish, Fastly) для
+разработки и нагрузочных тестов, её запускает команда runproxy.
+"""
+import http.client
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
+
+from . import compression
+
+KEYS_HEADER: str = 'Surrogate-Key'
+PURGE_TIMEOUT: int = 5
+PROXY_SIZE: int = 10000
+HOP_BY_HOP: frozenset = frozenset((
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade',
+))
+
+
+def add_surrogate_keys(request, *keys):
+    """Добавляет ключи страницы; их соберёт декоратор cache_policy."""
+    if not hasattr(request, 'surrogate_keys'):
+        request.surrogate_keys = set()
+    request.surrogate_keys.update(key for key in keys if key)
+
+
+def cache_policy(s_maxage, keys=()):
+    """Разрешает прокси хранить анонимный ответ s_maxage секунд.
+
+    Браузер каждый раз перепроверяет страницу (max-age=0), а прокси
+    отдаёт её сам, пока ключи страницы не сброшены. Ответы вошедшим
+    пользователям, ответы с cookies и ошибки не кэшируются.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            add_surrogate_keys(request, *keys)
+            response = view(request, *args, **kwargs)
+            patch_vary_headers(response, ('Cookie',))
+            if (response.status_code != 200 or response.cookies
+                    or request.user.is_authenticated):
+                patch_cache_control(response, private=True, max_age=0)
+                return response
+            patch_cache_control(
+                response, public=True, max_age=0, s_maxage=s_maxage
+            )
+            response[KEYS_HEADER] = ' '.join(sorted(request.surrogate_keys))
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_anonymous(timeout, key_prefix=None):
+    """cache_page только для анонимных посетителей.
+
+    Страница вошедшего пользователя рендерится заново и в кэш не
+    попадает: иначе её получил бы следующий аноним, а cache_policy
+    пометил бы её public. Ключ кэша учитывает Cookie.
+    """
+    def decorator(view):
+        cached = cache_page(timeout, key_prefix=key_prefix)(
+            vary_on_cookie(view)
+        )
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            return cached(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def purge(keys):
+    """Сбрасывает на прокси страницы с любым из ключей."""
+    url = getattr(settings, 'PROXY_PURGE_URL', '')
+    if not url or not keys:
+        return
+    request = urllib.request.Request(
+        url, method='PURGE', headers={KEYS_HEADER: ' '.join(sorted(keys))}
+    )
+    with urllib.request.urlopen(request, timeout=PURGE_TIMEOUT):
+        pass
+
+
+def parse_cache_control(value):
+    directives = {}
+    for part in value.split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+class ProxyCache:
+    """Хранилище ответов прокси с индексом по ключам.
+
+    Просроченный ответ удаляется при обращении к нему, а сверх size
+    записей вытесняются самые старые, вместе со ссылками из индекса.
+    """
+
+    def __init__(self, size=PROXY_SIZE):
+        self.size = size
+        self.entries = {}
+        self.by_key = defaultdict(set)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, cache_key):
+        entry = self.entries.pop(cache_key, None)
+        if entry is None:
+            return None
+        for key in entry['keys']:
+            cache_keys = self.by_key.get(key)
+            if cache_keys is not None:
+                cache_keys.discard(cache_key)
+                if not cache_keys:
+                    del self.by_key[key]
+        return entry
+
+    def get(self, cache_key):
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is not None and entry['expires'] < time.monotonic():
+                self._drop(cache_key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def store(self, cache_key, status, headers, body, ttl, keys):
+        now = time.monotonic()
+        with self.lock:
+            self._drop(cache_key)
+            self.entries[cache_key] = {
+                'status': status, 'headers': headers, 'body': body,
+                'stored': now, 'expires': now + ttl, 'keys': tuple(keys),
+            }
+            for key in keys:
+                self.by_key[key].add(cache_key)
+            # Словарь хранит порядок записи: первыми идут самые старые.
+            while len(self.entries) > self.size:
+                self._drop(next(iter(self.entries)))
+
+    def purge(self, keys):
+        """Удаляет ответы с любым из ключей; возвращает их число."""
+        purged = 0
+        with self.lock:
+            for key in keys:
+                for cache_key in tuple(self.by_key.get(key, ())):
+                    if self._drop(cache_key) is not None:
+                        purged += 1
+        return purged
+
+
+def header(headers, name, default=''):
+    """Значение заголовка из списка пар (имя, значение)."""
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return default
+
+
+def ttl_for(status, headers):
+    """Сколько секунд прокси может хранить ответ; 0 — нельзя."""
+    if status != 200 or header(headers, 'Set-Cookie'):
+        return 0
+    directives = parse_cache_control(header(headers, 'Cache-Control'))
+    if 'private' in directives or 'no-store' in directives:
+        return 0
+    try:
+        return int(directives.get('s-maxage', 0))
+    except ValueError:
+        return 0
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Кэширует анонимные GET, пересылает остальное на upstream."""
+
+    upstream = None
+    cache = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def cache_key(self):
+        encoding = compression.choose_encoding(
+            self.headers.get('Accept-Encoding', '')
+        )
+        return self.command, self.path, encoding
+
+    def cacheable_request(self):
+        return (self.command in ('GET', 'HEAD')
+                and 'Cookie' not in self.headers
+                and 'Authorization' not in self.headers)
+
+    def do_GET(self):
+        if not self.cacheable_request():
+            return self.forward()
+        cache_key = self.cache_key()
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            age = int(time.monotonic() - entry['stored'])
+            return self.reply(entry['status'], entry['headers'],
+                              entry['body'], {'X-Cache': 'HIT', 'Age': age})
+        status, headers, body = self.fetch()
+        ttl = ttl_for(status, headers)
+        if ttl:
+            keys = header(headers, KEYS_HEADER).split()
+            self.cache.store(cache_key, status, headers, body, ttl, keys)
+        self.reply(status, headers, body, {'X-Cache': 'MISS'})
+
+    do_HEAD = do_GET
+
+    def forward(self):
+        status, headers, body = self.fetch()
+        self.reply(status, headers, body, {'X-Cache': 'PASS'})
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = forward
+
+    def do_PURGE(self):
+        if self.client_address[0] not in ('127.0.0.1', '::1'):
+            return self.reply(403, [], b'', {})
+        keys = self.headers.get(KEYS_HEADER, '').split()
+        purged = self.cache.purge(keys)
+        body = f'{{"purged": {purged}}}'.encode()
+        self.reply(200, [('Content-Type', 'application/json')], body, {})
+
+    def fetch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = self.rfile.read(length) if length else None
+        headers = {
+            name: value for name, value in self.headers.items()
+            if name.lower() not in HOP_BY_HOP
+        }
+        headers['X-Forwarded-For'] = self.client_address[0]
+        connection = http.client.HTTPConnection(
+            self.upstream.hostname, self.upstream.port or 80
+        )
+        try:
+            method = 'GET' if self.command == 'HEAD' else self.command
+            connection.request(method, self.path, payload, headers)
+            upstream = connection.getresponse()
+            body = upstream.read()
+            response_headers = [
+                (name, value) for name, value in upstream.getheaders()
+                if name.lower() not in HOP_BY_HOP
+                and name.lower() != 'content-length'
+            ]
+            return upstream.status, response_headers, body
+        finally:
+            connection.close()
+
+    def reply(self, status, headers, body, extra):
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() != KEYS_HEADER.lower():
+                self.send_header(name, value)
+        for name, value in extra.items():
+            self.send_header(name, str(value))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class ProxyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, upstream):
+        handler = type('Handler', (ProxyHandler,), {
+            'upstream': urlsplit(upstream),
+            'cache': ProxyCache(),
+        })
+        super().__init__(address, handler)
+        self.cache = handler.cache
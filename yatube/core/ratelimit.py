@@ -0,0 +1,136 @@
+"""Ограничение частоты запросов на запись (token bucket).
+
+У каждого пользователя и каждого IP своё ведро: оно вмещает burst
+жетонов и пополняется со скоростью rate. Ведро IP в IP_FACTOR раз больше,
+потому что за одним адресом бывает несколько пользователей. Запрос тратит
+жетон из обоих вёдер; если хотя бы одно пусто, ответ — 429 с Retry-After.
+
+Вёдра хранятся в памяти процесса. При RATELIMIT_SHARED они лежат в
+общем кэше Django и общие для всех процессов; чтение и запись ведра
+там не атомарны, поэтому при гонке лимит может быть чуть превышен.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+LOCAL_BUCKETS: int = 10000
+IP_FACTOR: int = 4
+PERIODS: dict = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): сколько запросов за сколько секунд."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+class LocalBuckets:
+    """Вёдра в памяти процесса; давно не тронутые вытесняются."""
+
+    def __init__(self, size=LOCAL_BUCKETS):
+        self.size = size
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, refill, now):
+        with self.lock:
+            state = self.data.pop(key, None)
+            allowed, state = spend(state, capacity, refill, now)
+            self.data[key] = state
+            while len(self.data) > self.size:
+                self.data.popitem(last=False)
+            return allowed, state
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class SharedBuckets:
+    """Вёдра в общем кэше Django."""
+
+    prefix = 'ratelimit:'
+
+    def take(self, key, capacity, refill, now):
+        state = cache.get(self.prefix + key)
+        allowed, state = spend(state, capacity, refill, now)
+        timeout = math.ceil(capacity / refill) if refill else None
+        cache.set(self.prefix + key, state, timeout)
+        return allowed, state
+
+    def clear(self):
+        pass
+
+
+def spend(state, capacity, refill, now):
+    """Пополняет ведро к моменту now и пробует взять жетон."""
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens >= 1:
+        return True, (tokens - 1, now)
+    return False, (tokens, now)
+
+
+local_buckets = LocalBuckets()
+shared_buckets = SharedBuckets()
+
+
+def buckets():
+    if getattr(settings, 'RATELIMIT_SHARED', False):
+        return shared_buckets
+    return local_buckets
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def ratelimit(rate, burst=None, methods=('POST',), scope=None):
+    """Ограничивает представление rate запросами на пользователя и IP.
+
+    burst — размер ведра (по умолчанию равен числу запросов в rate),
+    methods — какие методы считаются (None — все), scope — имя общего
+    ведра нескольких представлений (по умолчанию своё у каждого).
+    """
+    count, period = parse_rate(rate)
+    capacity = burst or count
+    refill = count / period
+
+    def decorator(view):
+        name = scope or f'{view.__module__}.{view.__name__}'
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (not getattr(settings, 'RATELIMIT_ENABLED', True)
+                    or methods is not None
+                    and request.method not in methods):
+                return view(request, *args, **kwargs)
+            limits = [(f'{name}:ip:{client_ip(request)}', IP_FACTOR)]
+            if request.user.is_authenticated:
+                limits.append((f'{name}:user:{request.user.pk}', 1))
+            now = time.time()
+            store = buckets()
+            wait = 0
+            for key, factor in limits:
+                allowed, (tokens, _) = store.take(
+                    key, capacity * factor, refill * factor, now
+                )
+                if not allowed:
+                    wait = max(
+                        wait, math.ceil((1 - tokens) / (refill * factor))
+                    )
+            if wait:
+                response = HttpResponse(
+                    'Слишком много запросов, попробуйте позже.', status=429
+                )
+                response['Retry-After'] = str(wait)
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
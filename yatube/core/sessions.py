@@ -0,0 +1,99 @@
+"""Сессии с чтением из кэша и отложенной записью в базу.
+
+Новая сессия и любое изменение данных входа (вход, смена пароля) сразу
+записываются в базу. Остальные изменения попадают в кэш немедленно,
+а в базу уходят пачкой после ответа, не чаще раза в FLUSH_INTERVAL
+секунд на процесс, и при завершении процесса. Если строки сессии в базе
+уже нет, она создаётся заново. Кэш должен быть общим (core.E001).
+"""
+import atexit
+import threading
+import time
+
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY)
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore
+)
+from django.contrib.sessions.models import Session
+from django.core.signals import request_finished
+from django.db import transaction
+
+FLUSH_INTERVAL: int = 5
+FLUSH_SIZE: int = 100
+AUTH_KEYS: tuple = (SESSION_KEY, BACKEND_SESSION_KEY, HASH_SESSION_KEY)
+
+pending: dict = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = 'core.sessions'
+    _loaded_auth = None
+
+    @staticmethod
+    def auth_data(data):
+        return tuple(data.get(key) for key in AUTH_KEYS)
+
+    def load(self):
+        data = super().load()
+        self._loaded_auth = self.auth_data(data)
+        return data
+
+    def save(self, must_create=False):
+        data = self._get_session()
+        auth = self.auth_data(data)
+        if (must_create or self.session_key is None
+                or auth != self._loaded_auth):
+            with _lock:
+                pending.pop(self.session_key, None)
+            super().save(must_create)
+            self._loaded_auth = auth
+            return
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        with _lock:
+            pending[self.session_key] = (
+                self.encode(data), self.get_expiry_date()
+            )
+
+    def delete(self, session_key=None):
+        with _lock:
+            pending.pop(session_key or self.session_key, None)
+        super().delete(session_key)
+
+
+def flush():
+    """Записывает накопленные изменения сессий одной транзакцией."""
+    global _last_flush
+    with _lock:
+        batch = dict(pending)
+        pending.clear()
+        _last_flush = time.monotonic()
+    if not batch:
+        return 0
+    missing = []
+    with transaction.atomic():
+        for session_key, (session_data, expire_date) in batch.items():
+            updated = Session.objects.filter(session_key=session_key).update(
+                session_data=session_data, expire_date=expire_date
+            )
+            if not updated:
+                missing.append(Session(
+                    session_key=session_key, session_data=session_data,
+                    expire_date=expire_date,
+                ))
+        Session.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(batch)
+
+
+def flush_if_due(**kwargs):
+    if not pending:
+        return
+    due = time.monotonic() - _last_flush >= FLUSH_INTERVAL
+    if due or len(pending) >= FLUSH_SIZE:
+        flush()
+
+
+request_finished.connect(flush_if_due)
+atexit.register(flush)
@@ -0,0 +1,91 @@
+"""Замер старта процесса сайта для команды startup_report.
+
+Новый процесс интерпретатора с -X importtime повторяет шаги wsgi.py:
+чтение настроек, django.setup(), сборку WSGIHandler с middleware и
+прогрев (если TEMPLATE_WARMUP), и печатает время шагов в stdout в виде
+JSON. Из отчёта importtime в stderr собирается время импорта по пакетам
+и самые долгие импорты верхнего уровня, чтобы следить за временем
+запуска воркеров при автомасштабировании.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+# Код дочернего процесса: только он видит импорты с чистого листа. Сам
+# модуль ничего из Django не импортирует, чтобы не сдвигать замер.
+CHILD: str = 'from core.startup import measure; measure()'
+
+
+def measure():
+    """Выполняет шаги wsgi.py и печатает их время в миллисекундах."""
+    timings = {}
+    started = time.perf_counter()
+
+    def step(name):
+        nonlocal started
+        now = time.perf_counter()
+        timings[name] = (now - started) * 1000
+        started = now
+
+    import django
+    from django.conf import settings
+
+    settings.INSTALLED_APPS
+    step('settings')
+    django.setup(set_prefix=False)
+    step('django.setup')
+    from django.core.handlers.wsgi import WSGIHandler
+
+    WSGIHandler()
+    step('middleware')
+    if settings.TEMPLATE_WARMUP:
+        from core import warmup
+
+        for name, ms in warmup.run().items():
+            timings[f'warmup: {name}'] = ms
+        step('warmup')
+    print(json.dumps(timings))
+
+
+def parse_importtime(text):
+    """Строки -X importtime: [(собственное, суммарное мкс, глубина,
+    модуль)] в порядке вывода."""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, total, name = line[len('import time:'):].split('|')
+        if not own.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((int(own), int(total), depth, name.strip()))
+    return imports
+
+
+def by_package(imports):
+    """Собственное время импорта, сложенное по пакетам верхнего уровня."""
+    packages = Counter()
+    for own, _, _, name in imports:
+        packages[name.partition('.')[0]] += own
+    return packages
+
+
+def run_child():
+    """Запускает замер в новом процессе.
+
+    Возвращает время шагов, импорты и время жизни процесса целиком, мс.
+    """
+    from django.conf import settings
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD],
+        cwd=settings.BASE_DIR, env=os.environ.copy(),
+        capture_output=True, text=True, check=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(result.stderr), elapsed
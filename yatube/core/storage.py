@@ -0,0 +1,130 @@
+import mimetypes
+import threading
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+
+from . import compression
+
+# Сжатая копия меньше этой доли оригинала не даёт выигрыша.
+MIN_RATIO: float = 0.95
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем содержимого в имени и сжатыми копиями рядом.
+
+    collectstatic кроме файлов с хэшем и манифеста пишет для текстовых
+    файлов копии name.gz и name.br; их отдаёт StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_files = super().post_process(paths, dry_run, **options)
+        # CSS обрабатывается в несколько проходов: сжимаем итоговые имена.
+        final_names = {}
+        for name, hashed_name, processed in processed_files:
+            if hashed_name and not isinstance(processed, Exception):
+                final_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name, hashed_name in final_names.items():
+            self.write_compressed(name)
+            self.write_compressed(hashed_name)
+
+    def write_compressed(self, name):
+        content_type, _ = mimetypes.guess_type(name)
+        if not content_type or not compression.compressible(content_type):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        for encoding in compression.ENCODINGS:
+            compressed = compression.compress(
+                data, encoding, compression.BUILD_LEVELS[encoding]
+            )
+            if len(compressed) >= len(data) * MIN_RATIO:
+                continue
+            target = name + compression.SUFFIXES[encoding]
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
+
+
+@deconstructible
+class InMemoryStorage(Storage):
+    """Загрузки и миниатюры в памяти процесса — хранилище для тестов.
+
+    Все экземпляры делят одно содержимое, поэтому файл, сохранённый полем
+    модели, видит и sorl-thumbnail. В MEDIA_ROOT ничего не пишется, а
+    процессы параллельного прогона тестов не видят файлов друг друга.
+    """
+
+    files: dict = {}
+    lock = threading.Lock()
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+
+    @classmethod
+    def clear(cls):
+        with cls.lock:
+            cls.files.clear()
+
+    def _open(self, name, mode='rb'):
+        with self.lock:
+            if name not in self.files:
+                raise FileNotFoundError(name)
+            data, _ = self.files[name]
+        return ContentFile(data, name=name)
+
+    def _save(self, name, content):
+        data = b''.join(
+            chunk.encode() if isinstance(chunk, str) else chunk
+            for chunk in content.chunks()
+        )
+        with self.lock:
+            self.files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        with self.lock:
+            self.files.pop(name, None)
+
+    def exists(self, name):
+        return name in self.files
+
+    def size(self, name):
+        return len(self._open(name).file.getvalue())
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), []
+        with self.lock:
+            names = list(self.files)
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            head, _, tail = name[len(prefix):].partition('/')
+            if tail:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def url(self, name):
+        return urljoin(self.base_url or settings.MEDIA_URL,
+                       filepath_to_uri(name))
+
+    def get_modified_time(self, name):
+        with self.lock:
+            if name not in self.files:
+                raise FileNotFoundError(name)
+            _, modified = self.files[name]
+        return modified if settings.USE_TZ else timezone.make_naive(modified)
+
+    get_created_time = get_accessed_time = get_modified_time
@@ -0,0 +1,70 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Task
+
+MAX_ATTEMPTS: int = 3
+
+registry: dict = {}
+
+
+class TaskFunction:
+    """Обёртка над функцией, которую можно выполнить в фоне.
+
+    Аргументы передаются только именованными и должны сериализоваться
+    в JSON. Если batch_size больше единицы, воркер собирает до
+    batch_size одинаковых задач и вызывает функцию один раз
+    со списком их аргументов.
+    """
+
+    def __init__(self, func, name, priority, max_attempts, batch_size):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, **kwargs):
+        return self.apply_async(kwargs)
+
+    def apply_async(self, kwargs=None, countdown=0, priority=None):
+        kwargs = kwargs or {}
+        if getattr(settings, 'TASKS_EAGER', False):
+            self.run([kwargs])
+            return None
+        return Task.objects.create(
+            name=self.name,
+            payload=json.dumps(kwargs),
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + timedelta(seconds=countdown),
+        )
+
+    def run(self, payloads):
+        if self.batch_size > 1:
+            self.func(payloads)
+            return
+        for kwargs in payloads:
+            self.func(**kwargs)
+
+
+def task(func=None, *, name=None, priority=0, max_attempts=MAX_ATTEMPTS,
+         batch_size=1):
+    """Регистрирует функцию как фоновую задачу."""
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = TaskFunction(
+            func, task_name, priority, max_attempts, batch_size
+        )
+        return registry[task_name]
+
+    if func is not None:
+        return decorator(func)
+    return decorator
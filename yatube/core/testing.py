@@ -0,0 +1,41 @@
+"""Окружение тестов: загрузки и миниатюры в памяти процесса.
+
+manage.py test подключает его через TEST_RUNNER, pytest — фикстурой
+из conftest.py в корне репозитория. В MEDIA_ROOT ничего не пишется,
+а процессы manage.py test --parallel не делят между собой файлов.
+"""
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from .storage import InMemoryStorage
+
+MEDIA_SETTINGS: dict = {
+    'DEFAULT_FILE_STORAGE': 'core.storage.InMemoryStorage',
+    'THUMBNAIL_STORAGE': 'core.storage.InMemoryStorage',
+}
+
+
+def in_memory_media():
+    """Переключает загрузки и миниатюры на InMemoryStorage."""
+    return override_settings(**MEDIA_SETTINGS)
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner с загрузками в памяти."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.media = in_memory_media()
+        self.media.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.media.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class EmptyMediaMixin:
+    """Каждый тест начинается с пустым InMemoryStorage."""
+
+    def _pre_setup(self):
+        InMemoryStorage.clear()
+        super()._pre_setup()
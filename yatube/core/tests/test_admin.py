@@ -0,0 +1,139 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from core.admin import EstimatedCountPaginator
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        for number in range(5):
+            Post.objects.create(author=cls.user, text=f'Пост {number}')
+
+    def test_small_tables_counted_exactly(self):
+        """Небольшие списки считаются точно."""
+        paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(paginator.count, 5)
+
+    @mock.patch('core.admin.EXACT_COUNT_LIMIT', 3)
+    def test_large_tables_estimated(self):
+        """Большая таблица без фильтров оценивается без COUNT(*), а
+        отфильтрованный список считается до границы."""
+        last = Post.objects.order_by('-pk').first().pk
+        with self.assertNumQueries(1) as queries:
+            paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+            self.assertEqual(paginator.count, last)
+        self.assertNotIn('COUNT', queries.captured_queries[0]['sql'])
+        filtered = Post.objects.filter(author=self.user)
+        self.assertEqual(EstimatedCountPaginator(filtered, 2).count, 3)
+
+
+class ChangelistTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+        cls.comment = Comment.objects.create(
+            post=cls.post, author=cls.user, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.admin, author=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelists_open(self):
+        """Списки постов, комментариев и подписок открываются."""
+        for model in ('post', 'comment', 'follow'):
+            with self.subTest(model=model):
+                response = self.client.get(
+                    reverse(f'admin:posts_{model}_changelist')
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_indexed_search(self):
+        """Число ищет первичный ключ, «@имя» — объекты пользователя."""
+        url = reverse('admin:posts_comment_changelist')
+        cases = {
+            str(self.comment.pk): 1,
+            '@author': 1,
+            '@admin': 0,
+            '@nobody': 0,
+            'Коммент': 1,
+        }
+        for term, count in cases.items():
+            with self.subTest(term=term):
+                response = self.client.get(url, {'q': term})
+                self.assertEqual(response.context['cl'].result_count, count)
+
+    def test_text_search_limited_to_recent_rows(self):
+        """Текст ищется только среди последних строк, по диапазону
+        ключа."""
+        newer = Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+        url = reverse('admin:posts_comment_changelist')
+        with mock.patch('core.admin.SEARCH_WINDOW', 1):
+            response = self.client.get(url, {'q': 'Коммент'})
+        self.assertEqual(
+            list(response.context['cl'].result_list), [newer]
+        )
+        self.assertContains(response, 'Искать по всей таблице')
+
+    def test_text_search_all_rows(self):
+        """По ссылке из сообщения текст ищется по всей таблице, а
+        параметр сохраняется в ссылках на страницы."""
+        Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+        url = reverse('admin:posts_comment_changelist')
+        with mock.patch('core.admin.SEARCH_WINDOW', 1):
+            response = self.client.get(url, {'q': 'Коммент', 'all': '1'})
+        changelist = response.context['cl']
+        self.assertEqual(len(changelist.result_list), 2)
+        self.assertIn('all=1', changelist.get_query_string({'p': 1}))
+        self.assertNotContains(response, 'Искать по всей таблице')
+
+    def test_delete_requires_related_permissions(self):
+        """Без права удалять комментарии пост из админки не удалить."""
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        staff.user_permissions.set(Permission.objects.filter(
+            codename__in=('view_post', 'delete_post')
+        ))
+        self.client.force_login(staff)
+        url = reverse('admin:posts_post_delete', args=(self.post.pk,))
+        response = self.client.get(url)
+        self.assertEqual(
+            response.context['perms_lacking'], {Comment._meta.verbose_name}
+        )
+        self.client.post(url, {'post': 'yes'})
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_list_edit_saved(self):
+        """Группа, изменённая прямо в списке, сохраняется."""
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {
+                'form-TOTAL_FORMS': 1,
+                'form-INITIAL_FORMS': 1,
+                'form-0-id': self.post.pk,
+                'form-0-group': self.group.pk,
+                '_save': 'Сохранить',
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.group, self.group)
@@ -0,0 +1,12 @@
+from django.test import TestCase
+
+from core import benchmarks
+from posts.models import Post
+
+
+class FeedUrlsTests(TestCase):
+    def test_repeated_calls_reuse_data(self):
+        """Несколько замеров подряд берут одни и те же автора и посты."""
+        urls = benchmarks.feed_urls()
+        self.assertEqual(benchmarks.feed_urls(), urls)
+        self.assertEqual(Post.objects.count(), 20)
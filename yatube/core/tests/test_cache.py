@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.cache import LocalLRU
+from core.checks import shared_cache_check
+
+FILE_CACHE: dict = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/tmp/yatube-test-cache',
+    }
+}
+
+
+class LocalLRUTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        """При переполнении вытесняется давно не читанная запись."""
+        lru = LocalLRU(size=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(lru.get('a'), (True, 1))
+        self.assertEqual(lru.get('b'), (False, None))
+        self.assertEqual(lru.get('c'), (True, 3))
+
+    def test_entries_expire(self):
+        """Запись пропадает по истечении времени жизни."""
+        lru = LocalLRU(ttl=10)
+        with mock.patch('core.cache.time.monotonic', return_value=100):
+            lru.set('a', 1)
+        with mock.patch('core.cache.time.monotonic', return_value=105):
+            self.assertEqual(lru.get('a'), (True, 1))
+        with mock.patch('core.cache.time.monotonic', return_value=111):
+            self.assertEqual(lru.get('a'), (False, None))
+
+    def test_zero_ttl_is_not_stored(self):
+        """С нулевым временем жизни кэш процесса не хранит записи."""
+        lru = LocalLRU(ttl=0)
+        lru.set('a', 1)
+        self.assertEqual(lru.get('a'), (False, None))
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_local_cache_is_an_error(self):
+        """Кэш в памяти процесса не проходит проверку."""
+        errors = shared_cache_check(None)
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    @override_settings(CACHES=FILE_CACHE)
+    def test_shared_cache_passes(self):
+        """Общий для процессов кэш проверку проходит."""
+        self.assertEqual(shared_cache_check(None), [])
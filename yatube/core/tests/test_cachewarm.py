@@ -0,0 +1,103 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.signals import request_finished, request_started
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import cachewarm
+from posts.models import Comment, Follow, Group, GroupStats, Post
+
+User = get_user_model()
+
+
+@override_settings(SITE_URL='http://testserver', FAST_LANE_TIMEOUT=60)
+class CacheWarmTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.small = Group.objects.create(title='Малая', slug='small')
+        cls.large = Group.objects.create(title='Большая', slug='large')
+        GroupStats.objects.update_or_create(
+            group=cls.large, defaults={'post_count': 10}
+        )
+        cls.post = Post.objects.create(
+            text='Обсуждаемый пост', author=cls.author, group=cls.large
+        )
+        Post.objects.create(text='Тихий пост', author=cls.reader)
+        Comment.objects.create(
+            post=cls.post, author=cls.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_collect(self):
+        """Адреса: страницы ленты, группы по размеру, популярные авторы и
+        обсуждаемые посты."""
+        urls = cachewarm.collect(pages=2, limit=1)
+        index = reverse('posts:index')
+        self.assertEqual(urls[:2], [index, f'{index}?page=2'])
+        self.assertIn(reverse('posts:group_list', args=('large',)), urls)
+        self.assertNotIn(reverse('posts:group_list', args=('small',)), urls)
+        self.assertIn(reverse('posts:profile', args=('author',)), urls)
+        self.assertNotIn(reverse('posts:profile', args=('reader',)), urls)
+        self.assertIn(
+            reverse('posts:post_detail', args=(self.post.pk,)), urls
+        )
+        self.assertEqual(len(urls), len(set(urls)))
+
+    def test_popular_authors_from_recent_follows(self):
+        """Популярные авторы считаются только по последним подпискам."""
+        Follow.objects.create(user=self.author, author=self.reader)
+        with mock.patch('posts.warmup.FOLLOW_WINDOW', 1):
+            urls = cachewarm.collect(pages=1, limit=1)
+        self.assertIn(reverse('posts:profile', args=('reader',)), urls)
+        self.assertNotIn(reverse('posts:profile', args=('author',)), urls)
+
+    def test_warm_fills_fast_lane(self):
+        """После прогрева анонимный посетитель получает страницу из кэша."""
+        url = reverse('posts:profile', args=('author',))
+        results = cachewarm.warm([url], workers=1)
+        self.assertEqual(results[url][0], 200)
+        self.assertEqual(self.client.get(url)['X-Fast-Lane'], 'hit')
+
+    def test_warm_bypasses_request_signals(self):
+        """Прогрев не шлёт сигналы запроса: их обработчики в тестовом
+        клиенте и на сервере управляют соединениями с базой."""
+        sent = []
+
+        def receiver(sender, **kwargs):
+            sent.append(sender)
+
+        request_started.connect(receiver)
+        request_finished.connect(receiver)
+        try:
+            cachewarm.warm([reverse('posts:index')], workers=1)
+        finally:
+            request_started.disconnect(receiver)
+            request_finished.disconnect(receiver)
+        self.assertEqual(sent, [])
+
+    def test_budget_skips_rest(self):
+        """Когда время вышло, оставшиеся адреса пропускаются."""
+        self.assertEqual(
+            cachewarm.warm([reverse('posts:index')], budget=0, workers=1),
+            {}
+        )
+
+    def test_command(self):
+        """Команда печатает адреса и итог с ошибками."""
+        out = StringIO()
+        call_command(
+            'warm_caches', pages=1, limit=1, workers=1, stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn(reverse('posts:trending'), output)
+        self.assertIn('ошибок 0', output)
+        self.assertIn('пропущено по времени 0', output)
@@ -0,0 +1,113 @@
+import gzip
+import zlib
+from unittest import mock
+
+import brotli
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import compression
+from core.middleware import CompressionMiddleware
+from posts.models import Post
+
+User = get_user_model()
+PAGE = 'Лента '.encode() * 100
+
+
+class AcceptEncodingTests(TestCase):
+    def test_choose_encoding(self):
+        """Выбирается лучшая кодировка с учётом q=0."""
+        cases = {
+            '': None,
+            'identity': None,
+            'gzip, deflate': 'gzip',
+            'gzip, deflate, br': 'br',
+            'br;q=0, gzip;q=0.5': 'gzip',
+            '*': 'br',
+        }
+        for header, encoding in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(
+                    compression.choose_encoding(header), encoding
+                )
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def process(self, response, accept='gzip, br'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_html_is_compressed(self):
+        """HTML сжимается выбранной кодировкой и правильно распаковывается."""
+        for accept, decompress in (('gzip', gzip.decompress),
+                                   ('gzip, br', brotli.decompress)):
+            with self.subTest(accept=accept):
+                response = self.process(HttpResponse(PAGE), accept)
+                self.assertEqual(response['Content-Encoding'],
+                                 accept.split(', ')[-1])
+                self.assertEqual(decompress(response.content), PAGE)
+                self.assertEqual(response['Content-Length'],
+                                 str(len(response.content)))
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_skipped_responses(self):
+        """Маленькие, уже сжатые и нетекстовые ответы не сжимаются."""
+        encoded = HttpResponse(PAGE)
+        encoded['Content-Encoding'] = 'br'
+        responses = (
+            HttpResponse(b'small'),
+            HttpResponse(PAGE, content_type='image/jpeg'),
+            encoded,
+        )
+        for response in responses:
+            with self.subTest(response=response):
+                content = response.content
+                response = self.process(response)
+                self.assertEqual(response.content, content)
+        response = self.process(HttpResponse(PAGE), accept='')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_is_compressed_chunk_by_chunk(self):
+        """Поток сжимается по кускам: первый кусок готов до конца потока."""
+        produced = []
+
+        def rows():
+            for number in range(3):
+                produced.append(number)
+                yield f'строка {number}\n'.encode() * 50
+
+        response = self.process(
+            StreamingHttpResponse(rows(), content_type='text/csv'), 'gzip'
+        )
+        self.assertFalse(response.has_header('Content-Length'))
+        stream = iter(response.streaming_content)
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        first = decoder.decompress(next(stream))
+        self.assertEqual(produced, [0])
+        self.assertEqual(first, 'строка 0\n'.encode() * 50)
+        rest = b''.join(decoder.decompress(chunk) for chunk in stream)
+        self.assertEqual(
+            first + rest,
+            b''.join(f'строка {n}\n'.encode() * 50 for n in range(3))
+        )
+
+    @override_settings(FAST_LANE_TIMEOUT=60)
+    def test_cached_page_is_not_recompressed(self):
+        """Повторная отдача страницы из кэша берёт готовое сжатое тело."""
+        author = User.objects.create_user(username='author')
+        Post.objects.create(text='Пост', author=author)
+        url = reverse('posts:profile', args=(author.username,))
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+        with mock.patch.object(compression, 'compress') as compress:
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+        compress.assert_not_called()
+        self.assertEqual(second['X-Fast-Lane'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertIn('Пост', brotli.decompress(second.content).decode())
@@ -0,0 +1,55 @@
+import random
+
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core import loadtest
+from posts.models import Comment, Post
+
+
+class ReportTests(SimpleTestCase):
+    def test_parse_mix(self):
+        """Доли сценариев разбираются, неизвестный сценарий — ошибка."""
+        self.assertEqual(
+            loadtest.parse_mix('browse=3, post'), {'browse': 3, 'post': 1}
+        )
+        for value in ('browse=1,crawl=2', 'post=0', 'post=-1'):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    loadtest.parse_mix(value)
+
+    def test_report(self):
+        """Отчёт считает долю ошибок по маршруту и коды ошибок."""
+        results = loadtest.Results()
+        for status in (200, 200, 200, 503):
+            results.record('index', status, 0.01)
+        results.record('post_create', 302, 0.05)
+        lines = loadtest.report(results, elapsed=1)
+        self.assertIn('25.0%', lines[1])
+        self.assertTrue(lines[2].startswith('post_create'))
+        self.assertTrue(lines[3].startswith('всего'))
+        self.assertIn('503: 1', lines[-1])
+
+
+class DriveTests(LiveServerTestCase):
+    def test_scenarios(self):
+        """Все сценарии проходят через настоящий HTTP-сервер без ошибок."""
+        site = loadtest.seed(users=3, groups=2, posts=20,
+                             rnd=random.Random(1))
+        results, _ = loadtest.drive(
+            self.live_server_url, site, concurrency=1, duration=30,
+            requests=40, seed=1,
+            mix={'browse': 1, 'follow': 1, 'comment': 1, 'post': 1},
+        )
+        self.assertGreaterEqual(results.total(), 40)
+        self.assertLessEqual(
+            {'follow_index', 'add_comment', 'post_create'},
+            set(results.timings),
+        )
+        for route, statuses in results.statuses.items():
+            with self.subTest(route=route):
+                self.assertFalse(
+                    [status for status in statuses
+                     if loadtest.failed(status)]
+                )
+        self.assertGreater(Post.objects.exclude(image='').count(), 0)
+        self.assertTrue(Comment.objects.exists())
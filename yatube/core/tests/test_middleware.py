@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(FAST_LANE_TIMEOUT=60)
+class AnonymousFastLaneTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(text='Первый', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:profile', args=(self.author.username,))
+
+    def test_anonymous_page_is_cached(self):
+        """Повторный анонимный запрос отдаётся из кэша без базы."""
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Fast-Lane'], 'miss')
+        self.assertIn('X-Frame-Options', first)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Fast-Lane'], 'hit')
+        self.assertEqual(second.content, first.content)
+
+    def test_new_post_invalidates_pages(self):
+        """Новый пост сбрасывает закэшированные страницы."""
+        self.client.get(self.url)
+        Post.objects.create(text='Второй', author=self.author)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Fast-Lane'], 'miss')
+        self.assertContains(response, 'Второй')
+
+    def test_requests_with_cookies_use_full_stack(self):
+        """Запрос с cookies и вошедший пользователь идут обычным путём."""
+        self.client.cookies['sessionid'] = 'x'
+        self.assertNotIn('X-Fast-Lane', self.client.get(self.url))
+        self.client.force_login(self.author)
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Fast-Lane', response)
+        self.assertTrue(response.context['user'].is_authenticated)
+
+    def test_other_routes_use_full_stack(self):
+        """Маршруты вне FAST_LANE_ROUTES не обслуживаются быстрым путём."""
+        response = self.client.get(reverse('posts:group_index'))
+        self.assertNotIn('X-Fast-Lane', response)
+
+    def test_missing_page_is_not_cached(self):
+        """Страница 404 отдаётся обработчиком ошибок и не кэшируется."""
+        url = reverse('posts:profile', args=('nobody',))
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,145 @@
+import threading
+import urllib.request
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (LiveServerTestCase, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core.models import Task
+from core.proxy import ProxyCache, ProxyServer, ttl_for
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class CachePolicyTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Пост'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_get_surrogate_keys(self):
+        """Анонимные страницы кэшируются прокси и помечены ключами."""
+        pages = {
+            reverse('posts:index'): 'feed',
+            reverse('posts:group_index'): 'groups',
+            reverse('posts:trending'): 'trending',
+            reverse('posts:group_list', args=(self.group.slug,)):
+                f'group-{self.group.pk}',
+            reverse('posts:profile', args=(self.user.username,)):
+                f'author-{self.user.pk}',
+            reverse('posts:post_detail', args=(self.post.pk,)):
+                f'post-{self.post.pk}',
+        }
+        for url, key in pages.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('public', response['Cache-Control'])
+                self.assertIn('s-maxage=', response['Cache-Control'])
+                self.assertIn('Cookie', response['Vary'])
+                self.assertEqual(response['Surrogate-Key'], key)
+
+    def test_logged_in_page_is_not_served_to_anonymous(self):
+        """Главная вошедшего не попадает в кэш и не уходит анониму."""
+        client = self.client_class()
+        client.force_login(self.user)
+        response = client.get(reverse('posts:index'))
+        self.assertContains(response, reverse('users:logout'))
+        self.assertIn('private', response['Cache-Control'])
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, reverse('users:logout'))
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_private_responses(self):
+        """Страницы вошедших и ошибки прокси не хранит."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('posts:index'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('Surrogate-Key', response)
+        self.client.logout()
+        response = self.client.get(reverse('posts:post_detail', args=(0,)))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(ttl_for(404, list(response.items())), 0)
+
+    @override_settings(PROXY_PURGE_URL='http://127.0.0.1:6081/')
+    def test_writes_enqueue_purge(self):
+        """Изменение поста и новый комментарий ставят сброс ключей."""
+        self.post.group = None
+        self.post.save()
+        task = Task.objects.get(name='posts.tasks.purge_proxy')
+        self.assertEqual(set(task.kwargs['keys']), {
+            'feed', 'groups', 'trending', f'post-{self.post.pk}',
+            f'author-{self.user.pk}', f'group-{self.group.pk}',
+        })
+        task.delete()
+        Comment.objects.create(post=self.post, author=self.user, text='!')
+        task = Task.objects.get(name='posts.tasks.purge_proxy')
+        self.assertEqual(task.kwargs['keys'],
+                         ['trending', f'post-{self.post.pk}'])
+
+    def test_no_purge_without_proxy(self):
+        """Без PROXY_PURGE_URL задачи сброса не создаются."""
+        self.post.save()
+        self.assertFalse(
+            Task.objects.filter(name='posts.tasks.purge_proxy').exists()
+        )
+
+
+class ProxyCacheTests(SimpleTestCase):
+    def test_expired_entry_is_dropped(self):
+        """Просроченный ответ удаляется вместе со ссылками индекса."""
+        proxy_cache = ProxyCache()
+        proxy_cache.store('page', 200, [], b'', -1, ['post-1'])
+        self.assertIsNone(proxy_cache.get('page'))
+        self.assertEqual(proxy_cache.entries, {})
+        self.assertEqual(dict(proxy_cache.by_key), {})
+
+    def test_oldest_entries_are_evicted(self):
+        """Сверх размера вытесняются самые старые ответы."""
+        proxy_cache = ProxyCache(size=2)
+        for number in range(3):
+            proxy_cache.store(number, 200, [], b'', 60, ['index', number])
+        self.assertEqual(list(proxy_cache.entries), [1, 2])
+        self.assertEqual(proxy_cache.by_key['index'], {1, 2})
+        self.assertNotIn(0, proxy_cache.by_key)
+        self.assertEqual(proxy_cache.purge(['index']), 2)
+        self.assertEqual(dict(proxy_cache.by_key), {})
+
+
+class ProxyServerTests(LiveServerTestCase):
+    def setUp(self):
+        cache.clear()
+        self.server = ProxyServer(('127.0.0.1', 0), self.live_server_url)
+        self.proxy_url = 'http://127.0.0.1:%d' % self.server.server_port
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.user = User.objects.create_user(username='author')
+        self.post = Post.objects.create(author=self.user, text='Первый')
+
+    def get(self, path):
+        with urllib.request.urlopen(self.proxy_url + path) as response:
+            return response.headers['X-Cache'], response.read().decode()
+
+    def test_cache_and_purge_on_write(self):
+        """Прокси отдаёт страницу сам, пока её не сбросит новый пост."""
+        url = reverse('posts:profile', args=(self.user.username,))
+        self.assertEqual(self.get(url)[0], 'MISS')
+        self.assertEqual(self.get(url)[0], 'HIT')
+        with override_settings(PROXY_PURGE_URL=self.proxy_url,
+                               TASKS_EAGER=True):
+            Post.objects.create(author=self.user, text='Второй')
+        status, body = self.get(url)
+        self.assertEqual(status, 'MISS')
+        self.assertIn('Второй', body)
@@ -0,0 +1,151 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import ratelimit
+from core.middleware import AdmissionControlMiddleware
+from posts.models import Comment, Post
+from posts.views import COMMENT_RATE
+
+User = get_user_model()
+
+
+class TokenBucketTests(TestCase):
+    def test_parse_rate(self):
+        """Частота записывается как «число/единица времени»."""
+        self.assertEqual(ratelimit.parse_rate('10/m'), (10, 60))
+        self.assertEqual(ratelimit.parse_rate('5/s'), (5, 1))
+
+    def test_bucket_refills(self):
+        """Пустое ведро пополняется со временем, но не выше ёмкости."""
+        buckets = ratelimit.LocalBuckets()
+        for _ in range(2):
+            self.assertTrue(buckets.take('key', 2, 1, 0)[0])
+        self.assertFalse(buckets.take('key', 2, 1, 0)[0])
+        self.assertTrue(buckets.take('key', 2, 1, 1)[0])
+        allowed, (tokens, _) = buckets.take('key', 2, 1, 100)
+        self.assertTrue(allowed)
+        self.assertEqual(tokens, 1)
+
+    def test_local_buckets_are_bounded(self):
+        """Давно не тронутые вёдра вытесняются."""
+        buckets = ratelimit.LocalBuckets(size=2)
+        for key in 'abc':
+            buckets.take(key, 1, 1, 0)
+        self.assertEqual(list(buckets.data), ['b', 'c'])
+
+
+@override_settings(RATELIMIT_ENABLED=True)
+class RateLimitViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+
+    def setUp(self):
+        ratelimit.local_buckets.clear()
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:add_comment', args=(self.post.pk,))
+
+    def comment(self):
+        return self.client.post(self.url, {'text': 'Комментарий'})
+
+    def test_comments_limited_per_user(self):
+        """Сверх лимита комментарии отклоняются с 429 и Retry-After."""
+        count, _ = ratelimit.parse_rate(COMMENT_RATE)
+        for _ in range(count):
+            self.assertEqual(self.comment().status_code, 302)
+        response = self.comment()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Comment.objects.count(), count)
+
+    def test_other_user_has_own_bucket(self):
+        """Лимит одного пользователя не мешает другому с того же IP."""
+        count, _ = ratelimit.parse_rate(COMMENT_RATE)
+        for _ in range(count + 1):
+            self.comment()
+        self.client.force_login(User.objects.create_user(username='other'))
+        self.assertEqual(self.comment().status_code, 302)
+
+    @override_settings(RATELIMIT_SHARED=True)
+    def test_shared_buckets(self):
+        """Общие вёдра хранятся в кэше и работают так же."""
+        count, _ = ratelimit.parse_rate(COMMENT_RATE)
+        for _ in range(count):
+            self.comment()
+        self.assertEqual(self.comment().status_code, 429)
+        self.assertFalse(ratelimit.local_buckets.data)
+
+    def test_reads_not_limited(self):
+        """Чтение страниц лимит не расходует."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        for _ in range(50):
+            self.client.get(url)
+        self.assertEqual(self.comment().status_code, 302)
+
+
+@override_settings(ADMISSION_CONCURRENCY=1, ADMISSION_QUEUE=0)
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def middleware(self, response):
+        def get_response(request):
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return AdmissionControlMiddleware(get_response)
+
+    def public_page(self):
+        response = HttpResponse('Страница')
+        response['Cache-Control'] = 'public, max-age=0, s-maxage=60'
+        return response
+
+    def test_sheds_load_when_full(self):
+        """Без свободных мест запрос получает 503 с Retry-After."""
+        middleware = self.middleware(HttpResponse('Страница'))
+        middleware.slots.acquire()
+        response = middleware(self.factory.post('/'))
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_serves_stale_page_when_full(self):
+        """Публичная страница отдаётся устаревшей копией при перегрузке."""
+        middleware = self.middleware(self.public_page())
+        self.assertEqual(middleware(self.factory.get('/')).status_code, 200)
+        middleware.slots.acquire()
+        response = middleware(self.factory.get('/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Degraded'], 'stale')
+        self.assertEqual(response.content.decode(), 'Страница')
+
+    def test_private_pages_not_kept(self):
+        """Частные страницы не сохраняются и не отдаются другим."""
+        response = HttpResponse('Личная')
+        response['Cache-Control'] = 'private'
+        middleware = self.middleware(response)
+        middleware(self.factory.get('/'))
+        middleware.slots.acquire()
+        self.assertEqual(middleware(self.factory.get('/')).status_code, 503)
+
+    def test_database_errors(self):
+        """OperationalError базы превращается в 503, а ошибки 5xx
+        заменяются сохранённой копией."""
+        middleware = self.middleware(OperationalError('database is locked'))
+        response = middleware.process_exception(
+            self.factory.get('/'), OperationalError('database is locked')
+        )
+        self.assertEqual(response.status_code, 503)
+        self.middleware(self.public_page())(self.factory.get('/'))
+        response = self.middleware(HttpResponse(status=500))(
+            self.factory.get('/')
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Degraded'], 'stale')
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core import backends, sessions
+from core.sessions import SessionStore
+
+User = get_user_model()
+
+
+class SessionStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sessions.pending.clear()
+        self.user = User.objects.create_user(username='reader')
+
+    def test_login_is_written_through(self):
+        """Вход пользователя сразу сохраняется в базе."""
+        self.client.force_login(self.user)
+        key = self.client.session.session_key
+        self.assertFalse(sessions.pending)
+        data = Session.objects.get(session_key=key).get_decoded()
+        self.assertEqual(data['_auth_user_id'], str(self.user.pk))
+
+    def test_other_changes_are_deferred(self):
+        """Прочие изменения копятся и уходят в базу при сбросе."""
+        store = SessionStore()
+        store['step'] = 1
+        store.create()
+        store = SessionStore(store.session_key)
+        store['step'] = 2
+        store.save()
+        self.assertIn(store.session_key, sessions.pending)
+        row = Session.objects.get(session_key=store.session_key)
+        self.assertEqual(row.get_decoded()['step'], 1)
+        self.assertEqual(SessionStore(store.session_key)['step'], 2)
+        self.assertEqual(sessions.flush(), 1)
+        row.refresh_from_db()
+        self.assertEqual(row.get_decoded()['step'], 2)
+
+    def test_flush_recreates_missing_row(self):
+        """Сессия, строки которой в базе уже нет, при сбросе создаётся."""
+        store = SessionStore()
+        store['step'] = 1
+        store.create()
+        store = SessionStore(store.session_key)
+        store['step'] = 2
+        store.save()
+        Session.objects.filter(session_key=store.session_key).delete()
+        self.assertEqual(sessions.flush(), 1)
+        row = Session.objects.get(session_key=store.session_key)
+        self.assertEqual(row.get_decoded()['step'], 2)
+
+    def test_password_change_is_seen_without_process_cache(self):
+        """Пользователь сессии не задерживается в кэше процесса."""
+        self.client.force_login(self.user)
+        url = reverse('posts:follow_index')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Пароль сменили в другом процессе: он сбросил только общий кэш.
+        self.user.set_password('new-password')
+        User.objects.filter(pk=self.user.pk).update(
+            password=self.user.password
+        )
+        cache.delete(backends.users_by_pk.key(self.user.pk))
+        response = self.client.get(url)
+        self.assertRedirects(
+            response, f"{reverse('users:login')}?next={url}"
+        )
+
+    def test_authenticated_request_skips_session_queries(self):
+        """Сессия и пользователь запроса берутся из кэша."""
+        self.client.force_login(self.user)
+        url = reverse('posts:follow_index')
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from core import startup
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils.version
+import time:       300 |        400 |   django.utils
+import time:      1000 |       1400 | django
+import time:       500 |        500 | sorl
+"""
+
+
+class StartupReportTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Из отчёта -X importtime берутся время, глубина и модуль."""
+        imports = startup.parse_importtime(IMPORTTIME)
+        self.assertEqual(imports[0], (100, 100, 2, 'django.utils.version'))
+        self.assertEqual(imports[2], (1000, 1400, 0, 'django'))
+        self.assertEqual(
+            startup.by_package(imports), {'django': 1400, 'sorl': 500}
+        )
+
+    def test_command(self):
+        """Команда замеряет шаги старта в новом процессе."""
+        out = StringIO()
+        call_command('startup_report', top=3, stdout=out)
+        for text in ('django.setup', 'middleware', 'Импорт по пакетам'):
+            self.assertIn(text, out.getvalue())
+
+    def test_production_settings(self):
+        """В боевых настройках нет отладки и панели отладки даже при
+        DJANGO_DEBUG=True, кэш общий."""
+        env = dict(os.environ, DJANGO_DEBUG='True', DJANGO_SECRET_KEY='key')
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import json, yatube.settings_prod as s; print(json.dumps(['
+             's.DEBUG, s.INSTALLED_APPS, s.MIDDLEWARE, s.TEMPLATE_WARMUP,'
+             ' s.FAST_LANE_TIMEOUT, s.CACHES["default"]["BACKEND"]]))'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            check=True,
+        )
+        debug, apps, middleware, warmup, timeout, backend = json.loads(
+            result.stdout
+        )
+        self.assertFalse(debug)
+        self.assertTrue(warmup)
+        self.assertNotIn('debug_toolbar', apps)
+        self.assertFalse([name for name in middleware if 'debug' in name])
+        # Страницы быстрого пути хранятся только в общем кэше.
+        self.assertTrue(timeout)
+        self.assertNotIn('locmem', backend)
+
+    def test_production_requires_secret_key(self):
+        """Без DJANGO_SECRET_KEY боевые настройки не загружаются."""
+        env = {key: value for key, value in os.environ.items()
+               if key != 'DJANGO_SECRET_KEY'}
+        result = subprocess.run(
+            [sys.executable, '-c', 'import yatube.settings_prod'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('DJANGO_SECRET_KEY', result.stderr)
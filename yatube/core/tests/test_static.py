@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+STATIC_ROOT = tempfile.mkdtemp()
+CSS = 'css/bootstrap.min.css'
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+    # Статика админки только замедлила бы сборку.
+    STATICFILES_FINDERS=[
+        'django.contrib.staticfiles.finders.FileSystemFinder',
+    ],
+)
+class StaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.url = staticfiles_storage.url(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_build_writes_hashed_and_compressed_files(self):
+        """Сборка пишет файл с хэшем и его сжатые копии."""
+        hashed = staticfiles_storage.stored_name(CSS)
+        self.assertNotEqual(hashed, CSS)
+        self.assertTrue(staticfiles_storage.exists(hashed + '.gz'))
+        self.assertTrue(staticfiles_storage.exists(hashed + '.br'))
+        self.assertFalse(staticfiles_storage.exists('img/logo.png.gz'))
+
+    def test_precompressed_variant_by_accept_encoding(self):
+        """Отдаётся лучшая из принимаемых клиентом копий."""
+        cases = {
+            '': None,
+            'gzip, deflate': 'gzip',
+            'gzip, br': 'br',
+            'br;q=0, gzip': 'gzip',
+        }
+        for header, encoding in cases.items():
+            with self.subTest(header=header):
+                response = self.client.get(
+                    self.url, HTTP_ACCEPT_ENCODING=header
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Content-Type'], 'text/css')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+                response.close()
+
+    def test_cache_headers(self):
+        """Файлы с хэшем неизменяемы, остальные кэшируются ненадолго."""
+        response = self.client.get(self.url)
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+        last_modified = response['Last-Modified']
+        response = self.client.get('/static/' + CSS)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        response.close()
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,46 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase
+from sorl.thumbnail import default
+
+from core.storage import InMemoryStorage
+from core.testing import EmptyMediaMixin
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+class InMemoryStorageTests(EmptyMediaMixin, SimpleTestCase):
+    def test_tests_use_memory(self):
+        """В тестах загрузки не попадают в MEDIA_ROOT."""
+        self.assertIsInstance(default_storage._wrapped, InMemoryStorage)
+
+    def test_files(self):
+        """Сохранение, чтение, список и удаление файлов."""
+        storage = InMemoryStorage()
+        name = storage.save('posts/small.gif', ContentFile(SMALL_GIF))
+        self.assertEqual(name, 'posts/small.gif')
+        self.assertNotEqual(
+            storage.save('posts/small.gif', ContentFile(SMALL_GIF)), name
+        )
+        with storage.open(name) as file:
+            self.assertEqual(file.read(), SMALL_GIF)
+        self.assertEqual(storage.size(name), len(SMALL_GIF))
+        self.assertEqual(storage.url(name), '/media/posts/small.gif')
+        self.assertEqual(storage.listdir('')[0], ['posts'])
+        self.assertEqual(len(storage.listdir('posts')[1]), 2)
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+        with self.assertRaises(FileNotFoundError):
+            storage.open(name)
+
+    def test_thumbnail_storage(self):
+        """Миниатюры sorl-thumbnail тоже хранятся в памяти."""
+        name = default.storage.save('cache/small.gif', ContentFile(SMALL_GIF))
+        self.assertTrue(InMemoryStorage().exists(name))
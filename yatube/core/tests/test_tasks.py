@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import worker
+from core.models import Task
+from core.tasks import task
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tests.record_batch', batch_size=10)
+def record_batch(items):
+    calls.append(sorted(item['value'] for item in items))
+
+
+@task(name='tests.broken', max_attempts=2)
+def broken():
+    raise ValueError('сломано')
+
+
+@task(name='tests.urgent', priority=10)
+def urgent(value):
+    calls.append(value)
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_creates_task(self):
+        """delay ставит задачу в очередь, а не выполняет её."""
+        record.delay(value=1)
+        self.assertEqual(calls, [])
+        task_obj = Task.objects.get()
+        self.assertEqual(task_obj.name, 'tests.record')
+        self.assertEqual(task_obj.kwargs, {'value': 1})
+
+    def test_worker_runs_and_removes_tasks(self):
+        """Воркер выполняет задачи и удаляет их из очереди."""
+        record.delay(value=1)
+        record.delay(value=2)
+        self.assertEqual(worker.run_pending(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_priority_order(self):
+        """Задачи с большим приоритетом выполняются раньше."""
+        record.delay(value='обычная')
+        urgent.delay(value='срочная')
+        worker.run_pending()
+        self.assertEqual(calls, ['срочная', 'обычная'])
+
+    def test_batch_tasks_run_together(self):
+        """Одинаковые пакетные задачи выполняются одним вызовом."""
+        for value in (3, 1, 2):
+            record_batch.delay(value=value)
+        worker.run_pending()
+        self.assertEqual(calls, [[1, 2, 3]])
+
+    def test_countdown_postpones_task(self):
+        """Отложенная задача не выполняется раньше срока."""
+        record.apply_async({'value': 1}, countdown=60)
+        self.assertEqual(worker.run_pending(), 0)
+        self.assertEqual(calls, [])
+
+    def test_failed_task_is_retried_with_backoff(self):
+        """Упавшая задача повторяется с задержкой, затем помечается."""
+        broken.delay()
+        worker.run_pending()
+        task_obj = Task.objects.get()
+        self.assertEqual(task_obj.status, Task.PENDING)
+        self.assertEqual(task_obj.attempts, 1)
+        self.assertGreater(task_obj.run_at, timezone.now())
+        self.assertIn('сломано', task_obj.last_error)
+        Task.objects.update(run_at=timezone.now())
+        worker.run_pending()
+        task_obj.refresh_from_db()
+        self.assertEqual(task_obj.status, Task.FAILED)
+        self.assertEqual(task_obj.attempts, 2)
+
+    def test_stale_tasks_are_released(self):
+        """Задачи упавшего воркера возвращаются в очередь."""
+        record.delay(value=1)
+        Task.objects.update(
+            status=Task.RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        worker.run_pending()
+        self.assertEqual(calls, [1])
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode(self):
+        """В режиме TASKS_EAGER задача выполняется сразу."""
+        record.delay(value=1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
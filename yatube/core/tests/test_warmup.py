@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import engines
+from django.test import TestCase
+from django.urls import reverse
+
+from core import warmup
+from posts.models import Post
+
+User = get_user_model()
+
+
+class WarmupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_template_names(self):
+        """В список попадают шаблоны проекта из DIRS."""
+        names = warmup.template_names(engines['django'])
+        self.assertIn('posts/index.html', names)
+        self.assertIn('posts/email/digest.txt', names)
+
+    def test_run_renders_posts_templates(self):
+        """Прогрев собирает шаблоны и рендерит страницы без ошибок."""
+        with mock.patch.object(warmup.logger, 'exception') as failed:
+            timings = warmup.run()
+        failed.assert_not_called()
+        self.assertIn('populate_urls', timings)
+        self.assertIn('compile_templates', timings)
+        self.assertIn('posts.warmup.render_posts_templates', timings)
+
+    def test_warmup_does_not_replace_cached_fragments(self):
+        """Синтетическая лента не попадает в кэш настоящей главной."""
+        author = User.objects.create_user(username='author')
+        Post.objects.create(text='Настоящий пост', author=author)
+        warmup.run()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Настоящий пост')
+        self.assertNotContains(response, 'Прогрев')
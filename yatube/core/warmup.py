@@ -0,0 +1,107 @@
+"""Прогрев шаблонов при старте процесса.
+
+compile_templates загружает все шаблоны проекта из каталогов DIRS
+каждого движка (шаблоны админки и сторонних приложений не трогаются):
+с кэширующим загрузчиком они разбираются один раз, и первый запрос
+к странице не платит за разбор. Затем вызываются зарегистрированные
+декоратором warmup функции приложений (модули warmup), которые рендерят
+свои шаблоны на синтетических данных. Ошибка прогрева только
+записывается в лог: процесс должен стартовать в любом случае.
+
+Шаблоны jinja2 собираются, только если этому движку отданы страницы
+(JINJA2_VIEWS), иначе разбирать их незачем.
+populate_urls заранее строит таблицы разрешения и обратного поиска
+адресов, которые Django иначе собирает на первом запросе.
+"""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template import engines
+from django.urls import get_resolver
+from django.utils.module_loading import autodiscover_modules
+
+TEMPLATE_SUFFIXES: tuple = ('.html', '.txt')
+
+logger = logging.getLogger(__name__)
+registry: dict = {}
+
+
+def warmup(func):
+    """Регистрирует функцию прогрева приложения."""
+    registry[f'{func.__module__}.{func.__name__}'] = func
+    return func
+
+
+def template_names(engine):
+    names = set()
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_SUFFIXES):
+                    path = os.path.join(root, filename)
+                    names.add(os.path.relpath(path, directory))
+    return sorted(name.replace(os.sep, '/') for name in names)
+
+
+def active_engines():
+    """Движки, которыми рендерятся страницы."""
+    return [
+        engines[alias] for alias in engines
+        if alias != 'jinja2' or settings.JINJA2_VIEWS
+    ]
+
+
+def compile_templates():
+    """Загружает все шаблоны используемых движков; возвращает их число."""
+    compiled = 0
+    for engine in active_engines():
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                logger.warning('Шаблон %s не собран: %s', name, error)
+            else:
+                compiled += 1
+    return compiled
+
+
+def populate_urls(resolver=None):
+    """Строит таблицы адресов корневого и вложенных URLconf; возвращает
+    число пространств имён."""
+    resolver = resolver or get_resolver()
+    # Свойства собирают таблицы при первом обращении.
+    resolver.reverse_dict
+    populated = 1
+    for _, child in resolver.namespace_dict.values():
+        populated += populate_urls(child)
+    return populated
+
+
+def run():
+    """Собирает шаблоны и вызывает прогрев приложений.
+
+    Возвращает словарь с временем каждого шага в миллисекундах.
+    """
+    timings = {}
+    started = time.perf_counter()
+    populate_urls()
+    timings['populate_urls'] = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    compiled = compile_templates()
+    timings['compile_templates'] = (time.perf_counter() - started) * 1000
+    autodiscover_modules('warmup')
+    for name, func in registry.items():
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            logger.exception('Прогрев %s не удался', name)
+        timings[name] = (time.perf_counter() - started) * 1000
+    logger.info(
+        'Прогрев: %d шаблонов, %s', compiled,
+        ', '.join(f'{name} {ms:.1f} мс' for name, ms in timings.items())
+    )
+    return timings
@@ -0,0 +1,108 @@
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+from .tasks import registry
+
+RETRY_DELAY: int = 10
+LOCK_TIMEOUT: int = 600
+
+logger = logging.getLogger(__name__)
+
+
+def discover():
+    """Импортирует модули tasks всех приложений."""
+    autodiscover_modules('tasks')
+
+
+def release_stale():
+    """Возвращает в очередь задачи, брошенные упавшим воркером."""
+    deadline = timezone.now() - timedelta(seconds=LOCK_TIMEOUT)
+    return Task.objects.filter(
+        status=Task.RUNNING, locked_at__lt=deadline
+    ).update(status=Task.PENDING, locked_by='', locked_at=None)
+
+
+def claim():
+    """Забирает пачку готовых задач одного вида.
+
+    Задачи помечаются токеном воркера одним UPDATE, поэтому два воркера
+    не получат одну и ту же задачу даже на sqlite без SELECT FOR UPDATE.
+    """
+    now = timezone.now()
+    ready = Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        head = ready.order_by('-priority', 'run_at', 'pk').first()
+        if head is None:
+            return []
+        func = registry.get(head.name)
+        limit = func.batch_size if func else 1
+        pks = list(
+            ready.filter(name=head.name)
+            .order_by('-priority', 'run_at', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+        Task.objects.filter(pk__in=pks, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_by=token, locked_at=now
+        )
+    return list(Task.objects.filter(locked_by=token, status=Task.RUNNING))
+
+
+def retry(tasks, error):
+    now = timezone.now()
+    for item in tasks:
+        item.attempts += 1
+        item.last_error = error
+        item.locked_by = ''
+        item.locked_at = None
+        if item.attempts < item.max_attempts:
+            item.status = Task.PENDING
+            delay = RETRY_DELAY * 2 ** (item.attempts - 1)
+            item.run_at = now + timedelta(seconds=delay)
+        else:
+            item.status = Task.FAILED
+        item.save()
+
+
+def execute(tasks):
+    """Выполняет пачку задач; успешные удаляются из очереди."""
+    name = tasks[0].name
+    func = registry.get(name)
+    if func is None:
+        Task.objects.filter(pk__in=[item.pk for item in tasks]).update(
+            status=Task.FAILED, last_error=f'Неизвестная задача {name}'
+        )
+        return False
+    try:
+        func.run([item.kwargs for item in tasks])
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', name)
+        retry(tasks, traceback.format_exc())
+        return False
+    Task.objects.filter(pk__in=[item.pk for item in tasks]).delete()
+    return True
+
+
+def run_pending(limit=None):
+    """Выполняет задачи, пока очередь не опустеет.
+
+    Возвращает количество обработанных задач.
+    """
+    release_stale()
+    done = 0
+    while limit is None or done < limit:
+        tasks = claim()
+        if not tasks:
+            break
+        execute(tasks)
+        done += len(tasks)
+    return done
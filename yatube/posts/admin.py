@@ -1,14 +1,68 @@
 from django.contrib import admin
+from django.db import models
 
+from core.admin import ScalableAdmin
+from . import deletion
 from .models import Post, Group, Comment, Follow
 
 
-class PostAdmin(admin.ModelAdmin):
+class DeferredDeleteMixin:
+    """Удаление через posts.deletion: объект сразу скрывается, а связанные
+    строки стирает фоновая задача. Страница подтверждения не собирает
+    все связанные объекты, как каскад Django.
+    """
+
+    deleter = None
+
+    def delete_model(self, request, obj):
+        self.deleter(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.deleter(obj)
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        model_count = {self.model._meta.verbose_name_plural: len(objs)}
+        return (
+            [str(obj) for obj in objs], model_count,
+            self.get_perms_needed(request), [],
+        )
+
+    def get_perms_needed(self, request):
+        """Модели из админки, чьи строки удалятся каскадом, а права на
+        их удаление у пользователя нет. Проверяются модели, а не строки,
+        чтобы не собирать связанные объекты."""
+        return {
+            related._meta.verbose_name
+            for related in cascade_models(self.model)
+            if related in self.admin_site._registry
+            and not self.admin_site._registry[related]
+            .has_delete_permission(request)
+        }
+
+
+def cascade_models(model, found=None):
+    """Модели, строки которых удаляются каскадом вместе со строкой model."""
+    found = set() if found is None else found
+    for relation in model._meta.related_objects:
+        related = relation.related_model
+        if relation.on_delete is models.CASCADE and related not in found:
+            found.add(related)
+            cascade_models(related, found)
+    return found
+
+
+class PostAdmin(DeferredDeleteMixin, ScalableAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     list_editable = ('group',)
+    autocomplete_fields = ('author', 'group')
+    user_fields = ('author',)
     empty_value_display = '-пусто-'
+    deleter = staticmethod(deletion.delete_post)
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -17,16 +71,22 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ScalableAdmin):
     list_display = ('pk', 'post', 'author', 'text', 'created')
-    list_filter = ('author',)
-    search_fields = ('author', 'created')
+    list_select_related = ('post', 'author')
+    list_filter = ('created',)
+    search_fields = ('text',)
+    raw_id_fields = ('post',)
+    autocomplete_fields = ('author',)
+    user_fields = ('author',)
 
 
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(ScalableAdmin):
     list_display = ('pk', 'user', 'author')
-    list_filter = ('author',)
-    search_fields = ('author', 'user')
+    list_select_related = ('user', 'author')
+    search_fields = ('=user__username', '=author__username')
+    autocomplete_fields = ('user', 'author')
+    user_fields = ('user', 'author')
 
 
 admin.site.register(Group, GroupAdmin)
@@ -0,0 +1,41 @@
+from django.db.models import F
+
+from .models import ArchivedPost, GroupStats, Post
+
+
+def refresh_group_stats(group_id):
+    """Пересчитывает статистику группы с нуля, учитывая архив."""
+    last_post = (
+        Post.objects.filter(group_id=group_id)
+        .order_by('-pub_date')
+        .only('pk', 'pub_date')
+        .first()
+    )
+    last_post_date = last_post.pub_date if last_post else (
+        ArchivedPost.objects.filter(group_id=group_id)
+        .order_by('-pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+    GroupStats.objects.update_or_create(
+        group_id=group_id,
+        defaults={
+            'post_count': (
+                Post.objects.filter(group_id=group_id).count()
+                + ArchivedPost.objects.filter(group_id=group_id).count()
+            ),
+            'last_post': last_post,
+            'last_post_date': last_post_date,
+        },
+    )
+
+
+def add_post_to_group_stats(post):
+    """Учитывает новый пост без пересчёта всех постов группы."""
+    updated = GroupStats.objects.filter(group_id=post.group_id).update(
+        post_count=F('post_count') + 1,
+        last_post=post,
+        last_post_date=post.pub_date,
+    )
+    if not updated:
+        refresh_group_stats(post.group_id)
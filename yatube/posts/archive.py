@@ -0,0 +1,134 @@
+"""Перенос старых постов в архивные таблицы.
+
+Ленты почти всегда читают свежие посты, поэтому посты старше
+ARCHIVE_AFTER переносятся в ArchivedPost вместе с комментариями, и
+posts_post с его индексами остаётся небольшой. Перенос идёт порциями:
+каждая копируется и удаляется из горячей таблицы в одной транзакции, так
+что читатель видит пост ровно в одной из таблиц.
+
+Профиль и группа читают ленту через TieredFeed: на глубоких страницах
+она продолжается архивом. Архивные посты старше любых оставшихся в
+posts_post, поэтому ленты просто склеиваются одна за другой.
+"""
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from . import deletion
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+ARCHIVE_AFTER: timedelta = timedelta(days=365)
+BATCH_SIZE: int = 500
+
+
+class TieredFeed:
+    """Последовательность постов для Paginator: горячие, затем архив."""
+
+    def __init__(self, hot, cold):
+        self.hot = hot
+        self.cold = cold
+
+    def filter(self, **lookups):
+        return TieredFeed(
+            self.hot.filter(**lookups), self.cold.filter(**lookups)
+        )
+
+    @cached_property
+    def hot_count(self):
+        return self.hot.count()
+
+    def count(self):
+        return self.hot_count + self.cold.count()
+
+    def __getitem__(self, key):
+        start, stop = key.start or 0, key.stop
+        posts = list(self.hot[start:stop]) if start < self.hot_count else []
+        if stop is None or stop > self.hot_count:
+            posts += list(self.cold[
+                max(start - self.hot_count, 0):
+                None if stop is None else stop - self.hot_count
+            ])
+        return posts
+
+
+def author_feed(author_id):
+    return TieredFeed(
+        Post.objects.filter(author_id=author_id).select_related('group'),
+        ArchivedPost.objects.filter(author_id=author_id)
+        .select_related('group'),
+    )
+
+
+def group_feed(group):
+    return TieredFeed(
+        group.posts.select_related('author'),
+        group.archived_posts.select_related('author'),
+    )
+
+
+def get_post_or_404(post_id):
+    """Пост из горячей таблицы или из архива."""
+    for model in (Post, ArchivedPost):
+        post = (
+            model.objects.select_related('author', 'group')
+            .filter(pk=post_id).first()
+        )
+        if post is not None:
+            return post
+    raise Http404('Пост не найден')
+
+
+def archive_batch(cutoff, size=BATCH_SIZE):
+    """Переносит в архив порцию постов старше cutoff.
+
+    Возвращает число перенесённых постов; 0 — переносить больше нечего.
+    """
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(pub_date__lt=cutoff)
+            .order_by('pub_date')[:size]
+        )
+        if not posts:
+            return 0
+        ids = [post.pk for post in posts]
+        comments = Comment.objects.filter(post_id__in=ids)
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(
+                id=post.pk, text=post.text, pub_date=post.pub_date,
+                author_id=post.author_id, group_id=post.group_id,
+                image=post.image.name,
+            )
+            for post in posts
+        )
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(
+                id=comment.pk, post_id=comment.post_id, text=comment.text,
+                author_id=comment.author_id, created=comment.created,
+            )
+            for comment in comments
+        )
+        # Содержимое страниц и статистика групп не меняются, поэтому
+        # сигналы не сбрасывают кэши для каждой строки.
+        with deletion.purging():
+            comments.delete()
+            Post.all_objects.filter(pk__in=ids).delete()
+    return len(posts)
+
+
+def archive_posts(cutoff=None, size=BATCH_SIZE, pause=0):
+    """Переносит в архив все посты старше cutoff порциями по size.
+
+    Между порциями ждёт pause секунд, чтобы не занимать базу подолгу.
+    """
+    cutoff = cutoff or timezone.now() - ARCHIVE_AFTER
+    moved = 0
+    while True:
+        count = archive_batch(cutoff, size)
+        moved += count
+        if count < size:
+            return moved
+        time.sleep(pause)
@@ -0,0 +1,168 @@
+"""Удаление постов и пользователей в два шага.
+
+Сначала объект помечается удалённым и сразу пропадает из лент: пост
+получает is_deleted, пользователь — is_active=False, а его посты
+помечаются одним UPDATE. Затем фоновая задача стирает зависимые строки
+порциями по CHUNK_SIZE, каждую в своей транзакции, вместе с картинками
+и миниатюрами. Каскад Django при этом не собирает в память все
+связанные объекты сразу и не держит блокировку базы минутами.
+
+Пока идёт стирание (purging), обработчики сигналов не сбрасывают кэши
+и прокси для каждой строки: это уже сделано при пометке.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from sorl import thumbnail
+
+from core.middleware import invalidate_pages
+from . import aggregates, monthly, tasks
+from .models import (ArchivedComment, ArchivedPost, Comment, Follow,
+                     Notification, Post, Suggestion, User)
+
+CHUNK_SIZE: int = 500
+# Сколько порций стирает один запуск задачи, прежде чем поставить
+# следующий: воркер не занят одним пользователем надолго.
+CHUNKS_PER_RUN: int = 20
+
+_state = threading.local()
+
+
+@contextmanager
+def purging():
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = False
+
+
+def is_purging():
+    return getattr(_state, 'active', False)
+
+
+def delete_post(post):
+    """Скрывает пост и ставит задачу стереть его."""
+    post.is_deleted = True
+    post.save(update_fields=['is_deleted'])
+    if post.group_id is not None:
+        aggregates.refresh_group_stats(post.group_id)
+    tasks.purge_post.delay(post_id=post.pk)
+
+
+def delete_user(user):
+    """Отключает пользователя, скрывает его посты и ставит их стирание."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        posts = Post.all_objects.filter(author=user, is_deleted=False)
+        group_ids = set(
+            posts.exclude(group=None).values_list('group_id', flat=True)
+        )
+        posts.update(is_deleted=True)
+        ArchivedPost.objects.filter(author=user).update(is_deleted=True)
+    monthly.rebuild('author_id', user.pk)
+    for group_id in group_ids:
+        aggregates.refresh_group_stats(group_id)
+        monthly.rebuild('group_id', group_id)
+    invalidate_pages()
+    if settings.PROXY_PURGE_URL:
+        keys = {'feed', 'groups', 'trending', f'author-{user.pk}'}
+        keys.update(f'group-{group_id}' for group_id in group_ids)
+        tasks.purge_proxy.delay(keys=sorted(keys))
+    tasks.purge_user.delay(user_id=user.pk)
+
+
+def delete_chunk(queryset):
+    """Удаляет порцию строк выборки; возвращает, сколько удалено."""
+    model = queryset.model
+    ids = list(queryset.order_by().values_list('pk', flat=True)[:CHUNK_SIZE])
+    if ids:
+        with transaction.atomic(), purging():
+            model._base_manager.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def remove_media(posts):
+    """Стирает картинки постов и их миниатюры.
+
+    Файл, на который ссылаются другие посты или архивные посты
+    (например, общий набор картинок seed_data), остаётся.
+    """
+    images = {}
+    for post in posts.exclude(image=''):
+        images.setdefault(post.image.name, post.image)
+    if not images:
+        return
+    used = set()
+    for model in (Post, ArchivedPost):
+        others = model.all_objects.filter(image__in=list(images))
+        if model is posts.model:
+            others = others.exclude(pk__in=posts.values('pk'))
+        used.update(others.values_list('image', flat=True))
+    for name, image in images.items():
+        if name not in used:
+            thumbnail.delete(image)
+
+
+def purge_posts(queryset):
+    """Стирает посты выборки с комментариями, уведомлениями и картинками.
+
+    Тратит не больше CHUNKS_PER_RUN порций; возвращает остаток или 0,
+    если работа не закончена.
+    """
+    budget = CHUNKS_PER_RUN
+    while budget > 0:
+        ids = list(
+            queryset.order_by().values_list('pk', flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            return budget
+        dependents = (
+            Comment.objects.filter(post_id__in=ids),
+            Notification.objects.filter(post_id__in=ids),
+        )
+        for dependent in dependents:
+            while budget > 0 and delete_chunk(dependent):
+                budget -= 1
+        if budget <= 0:
+            return 0
+        posts = Post.all_objects.filter(pk__in=ids)
+        remove_media(posts)
+        delete_chunk(posts)
+        budget -= 1
+    return 0
+
+
+def purge_user(user_id):
+    """Стирает пользователя частями; True, когда стёрт целиком."""
+    budget = purge_posts(Post.all_objects.filter(author_id=user_id))
+    dependents = (
+        ArchivedComment.objects.filter(post__author_id=user_id),
+        ArchivedComment.objects.filter(author_id=user_id),
+        Comment.objects.filter(author_id=user_id),
+        Follow.objects.filter(user_id=user_id),
+        Follow.objects.filter(author_id=user_id),
+        Notification.objects.filter(user_id=user_id),
+        Suggestion.objects.filter(user_id=user_id),
+        Suggestion.objects.filter(author_id=user_id),
+    )
+    for dependent in dependents:
+        while budget > 0 and delete_chunk(dependent):
+            budget -= 1
+    archived = ArchivedPost.all_objects.filter(author_id=user_id)
+    while budget > 0:
+        ids = list(
+            archived.order_by().values_list('pk', flat=True)[:CHUNK_SIZE]
+        )
+        if not ids:
+            break
+        remove_media(ArchivedPost.all_objects.filter(pk__in=ids))
+        delete_chunk(ArchivedPost.all_objects.filter(pk__in=ids))
+        budget -= 1
+    if budget <= 0:
+        return False
+    delete_chunk(User.objects.filter(pk=user_id, is_active=False))
+    return True
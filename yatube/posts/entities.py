@@ -0,0 +1,9 @@
+from core.cache import EntityCache
+from .models import Group, User
+
+# Страницам автора нужны только публичные поля: хэш пароля и почта
+# в общий кэш не попадают.
+users = EntityCache(
+    User, 'username', fields=('username', 'first_name', 'last_name')
+)
+groups = EntityCache(Group, 'slug')
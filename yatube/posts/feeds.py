@@ -0,0 +1,68 @@
+"""Курсорная выдача лент для подгрузки постов без перезагрузки страницы.
+
+Курсор — дата публикации в микросекундах и id последнего показанного
+поста. Следующая порция выбирается условием по индексу, а не смещением,
+поэтому глубокие страницы не дороже первой и не сдвигаются, когда в
+ленту добавляются новые посты.
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+
+from .utils import NUM_REC
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ORDERING: tuple = ('-pub_date', '-pk')
+# Части курсора сравниваются в базе с 64-битными полями.
+CURSOR_MAX: int = 2 ** 63 - 1
+
+
+def encode_cursor(post):
+    microseconds = (post.pub_date - EPOCH) // timedelta(microseconds=1)
+    return f'{microseconds}-{post.pk}'
+
+
+def decode_cursor(value):
+    """Разбирает курсор; ValueError, если он испорчен."""
+    microseconds, pk = (int(part) for part in value.split('-'))
+    if microseconds > CURSOR_MAX or pk > CURSOR_MAX:
+        raise ValueError(f'Курсор вне 64-битного диапазона: {value}')
+    try:
+        return EPOCH + timedelta(microseconds=microseconds), pk
+    except OverflowError:
+        raise ValueError(f'Курсор вне диапазона дат: {value}')
+
+
+def after(queryset, cursor):
+    """Посты ленты после курсора в порядке ORDERING."""
+    queryset = queryset.order_by(*ORDERING)
+    if not cursor:
+        return queryset
+    pub_date, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+    )
+
+
+def next_page(queryset, cursor, size=NUM_REC, archived=None):
+    """Возвращает порцию постов и курсор следующей (или None).
+
+    Если горячие посты кончились, порция дополняется из archived: архивные
+    посты старше любых горячих, и курсор для них тот же.
+    """
+    posts = list(after(queryset, cursor)[:size + 1])
+    if archived is not None and len(posts) <= size:
+        if posts:
+            cursor = encode_cursor(posts[-1])
+        posts += after(archived, cursor)[:size + 1 - len(posts)]
+    if len(posts) <= size:
+        return posts, None
+    posts = posts[:size]
+    return posts, encode_cursor(posts[-1])
+
+
+def fragment_url(page_obj, url):
+    """Адрес порции, следующей за страницей пагинатора, или None."""
+    if not page_obj.has_next() or not page_obj.object_list:
+        return None
+    return f'{url}?after={encode_cursor(page_obj[len(page_obj) - 1])}'
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import archive
+
+
+class Command(BaseCommand):
+    help = ('Переносит посты старше заданного срока в архивные таблицы '
+            'порциями, не останавливая сайт.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=archive.ARCHIVE_AFTER.days,
+            help='Архивировать посты старше стольких дней.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=archive.BATCH_SIZE,
+            help='Постов в одной транзакции.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между порциями в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        moved = archive.archive_posts(
+            cutoff, options['batch_size'], options['pause']
+        )
+        self.stdout.write(f'Перенесено в архив постов: {moved}')
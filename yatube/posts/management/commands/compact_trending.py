@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = 'Удаляет остывшие рейтинги популярных постов.'
+
+    def handle(self, *args, **options):
+        removed = trending.compact()
+        self.stdout.write(f'Удалено остывших рейтингов: {removed}')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Учитывает в статистике активности новые посты, комментарии, '
+        'подписки и пользователей.'
+    )
+
+    def handle(self, *args, **options):
+        processed = stats.rollup()
+        self.stdout.write(
+            'Учтено строк: ' + ', '.join(
+                f'{source} {processed[source]}' for source in stats.sources()
+            )
+        )
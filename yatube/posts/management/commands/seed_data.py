@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import synthetic
+
+
+class Command(BaseCommand):
+    help = ('Наполняет базу синтетическими пользователями, группами, '
+            'постами, комментариями и подписками реалистичной формы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='Множитель объёма; при 1 — '
+                 + ', '.join(
+                     f'{name}: {count}'
+                     for name, count in synthetic.BASE_COUNTS.items()
+                 ) + '.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Одинаковый seed на пустой базе даёт одинаковые данные.',
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько последних дней распределить посты.',
+        )
+        parser.add_argument(
+            '--images', type=float, default=synthetic.IMAGE_SHARE,
+            help='Доля постов с картинкой из общего набора файлов.',
+        )
+        parser.add_argument(
+            '--password', default=None,
+            help='Пароль всех пользователей; без него войти нельзя.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=synthetic.BATCH_SIZE,
+            help='Строк в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0 or not 0 <= options['images'] <= 1:
+            raise CommandError('Нужны --scale > 0 и --images от 0 до 1.')
+        counts = {
+            name: max(1, round(count * options['scale']))
+            for name, count in synthetic.BASE_COUNTS.items()
+        }
+        dataset = synthetic.Dataset(
+            **counts, seed=options['seed'], days=options['days'],
+            image_share=options['images'], password=options['password'],
+            batch_size=options['batch_size'],
+        )
+        started = time.monotonic()
+        for step, rows in dataset.generate():
+            self.stdout.write(
+                f'{step}: {rows} строк, '
+                f'{time.monotonic() - started:.1f} с с начала'
+            )
+        self.stdout.write(
+            f'Готово за {time.monotonic() - started:.1f} с; сводки групп и '
+            f'месяцев пересчитаны. Рекомендации и статистику активности '
+            f'обновят suggest_follows и rollup_stats.'
+        )
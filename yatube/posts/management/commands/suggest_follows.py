@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from posts import recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации «На кого подписаться».'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=recommendations.SUGGESTIONS,
+            help='Сколько рекомендаций хранить на пользователя.'
+        )
+        parser.add_argument(
+            '--batch', type=int, default=recommendations.BATCH_USERS,
+            help='Сколько пользователей считать за одно умножение.'
+        )
+        parser.add_argument(
+            '--synthetic', type=int, metavar='EDGES',
+            help='Не трогать базу, а замерить расчёт на случайном графе '
+                 'с заданным числом подписок.'
+        )
+        parser.add_argument(
+            '--users', type=int, default=500000,
+            help='Число пользователей случайного графа.'
+        )
+
+    def handle(self, *args, **options):
+        if options['synthetic']:
+            matrix = recommendations.synthetic_graph(
+                options['users'], options['synthetic']
+            )
+            stats = recommendations.measure(
+                matrix, options['top'], options['batch']
+            )
+            self.stdout.write(
+                'Пользователей: {users}, подписок: {edges}, '
+                'рекомендаций: {suggestions}\n'
+                'Время: {seconds:.1f} с, матрица: {matrix_mb:.0f} МБ, '
+                'пик памяти процесса: {peak_rss_mb:.0f} МБ'.format(**stats)
+            )
+            return
+        users, edges = recommendations.rebuild(
+            options['top'], options['batch']
+        )
+        self.stdout.write(
+            f'Рекомендации пересчитаны: пользователей {users}, '
+            f'подписок {edges}'
+        )
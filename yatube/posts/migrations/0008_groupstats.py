@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-19 09:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    for group in Group.objects.all():
+        last_post = group.posts.order_by('-pub_date').first()
+        GroupStats.objects.create(
+            group=group,
+            post_count=group.posts.count(),
+            last_post=last_post,
+            last_post_date=last_post.pub_date if last_post else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Постов')),
+                ('last_post_date', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Последний пост')),
+                ('last_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='posts.Post')),
+            ],
+            options={
+                'verbose_name': 'Статистика группы',
+                'verbose_name_plural': 'Статистика групп',
+            },
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
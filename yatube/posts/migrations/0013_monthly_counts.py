@@ -0,0 +1,77 @@
+# Generated by Django 2.2.28 on 2026-10-19 10:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from collections import Counter
+from django.utils import timezone
+
+
+def fill_monthly_counts(apps, schema_editor):
+    MonthlyCount = apps.get_model('posts', 'MonthlyCount')
+    counts = Counter()
+    for name in ('Post', 'ArchivedPost'):
+        rows = (
+            apps.get_model('posts', name).objects.filter(is_deleted=False)
+            .values_list('author_id', 'group_id', 'pub_date')
+        )
+        for author_id, group_id, pub_date in rows.iterator():
+            local = timezone.localtime(pub_date)
+            counts['author_id', author_id, local.year, local.month] += 1
+            if group_id is not None:
+                counts['group_id', group_id, local.year, local.month] += 1
+    MonthlyCount.objects.bulk_create(
+        MonthlyCount(**{key: owner}, year=year, month=month, count=count)
+        for (key, owner, year, month), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0012_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+            ],
+            options={
+                'verbose_name': 'Постов за месяц',
+                'verbose_name_plural': 'Постов за месяц',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date'], name='posts_post_author_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', '-pub_date'], name='posts_post_group_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='monthlycount',
+            name='author',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_counts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='monthlycount',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_counts', to='posts.Group'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlycount',
+            constraint=models.UniqueConstraint(fields=('author', 'year', 'month'), name='unique_author_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlycount',
+            constraint=models.UniqueConstraint(fields=('group', 'year', 'month'), name='unique_group_month'),
+        ),
+        migrations.RunPython(fill_monthly_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 2.2.28 on 2026-10-19 10:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_monthly_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsWatermark',
+            fields=[
+                ('source', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Источник')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Последний id')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Отметка статистики',
+                'verbose_name_plural': 'Отметки статистики',
+            },
+        ),
+        migrations.AddField(
+            model_name='follow',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, null=True, verbose_name='Дата подписки'),
+        ),
+        migrations.CreateModel(
+            name='ActivityStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Час'), ('day', 'Сутки')], max_length=4, verbose_name='Период')),
+                ('start', models.DateTimeField(verbose_name='Начало периода')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('follows', models.PositiveIntegerField(default=0, verbose_name='Подписок')),
+                ('users', models.PositiveIntegerField(default=0, verbose_name='Пользователей')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='posts.Group')),
+            ],
+            options={
+                'verbose_name': 'Активность',
+                'verbose_name_plural': 'Активность',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activitystats',
+            index=models.Index(fields=['period', 'start'], name='posts_activity_period_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitystats',
+            constraint=models.UniqueConstraint(fields=('period', 'group', 'start'), name='unique_activity_bucket'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.28 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+COUNTERS = ('posts', 'comments', 'follows', 'users')
+
+
+def merge_site_duplicates(apps, schema_editor):
+    """Складывает повторные строки всего сайта в одну."""
+    ActivityStats = apps.get_model('posts', 'ActivityStats')
+    kept = {}
+    rows = ActivityStats.objects.filter(group__isnull=True).order_by('pk')
+    for row in rows:
+        key = (row.period, row.start)
+        first = kept.get(key)
+        if first is None:
+            kept[key] = row
+            continue
+        for counter in COUNTERS:
+            setattr(first, counter,
+                    getattr(first, counter) + getattr(row, counter))
+        first.save()
+        row.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_activity_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_site_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='activitystats',
+            constraint=models.UniqueConstraint(condition=models.Q(group__isnull=True), fields=('period', 'start'), name='unique_site_activity_bucket'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:06
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """Оставляет по одному уведомлению на пользователя и пост."""
+    Notification = apps.get_model('posts', 'Notification')
+    duplicates = (
+        Notification.objects.values('user_id', 'post_id')
+        .annotate(first=Min('pk'), total=Count('pk'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates:
+        Notification.objects.filter(
+            user_id=row['user_id'], post_id=row['post_id']
+        ).exclude(pk=row['first']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_site_activity_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_notification'),
+        ),
+    ]
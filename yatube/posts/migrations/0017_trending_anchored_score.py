@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:08
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+HALF_LIFE = 6 * 60 * 60
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def anchor_scores(apps, schema_editor):
+    """Переводит затухший на момент updated счётчик в log2 суммы весов."""
+    TrendingScore = apps.get_model('posts', 'TrendingScore')
+    TrendingScore.objects.filter(score__lte=0).delete()
+    rows = list(TrendingScore.objects.all())
+    for row in rows:
+        elapsed = (row.updated - EPOCH).total_seconds()
+        row.score = math.log2(row.score) + elapsed / HALF_LIFE
+    TrendingScore.objects.bulk_update(rows, ('score',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_unique_notification'),
+    ]
+
+    operations = [
+        migrations.RunPython(anchor_scores, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='trendingscore',
+            name='score',
+            field=models.FloatField(db_index=True, default=0, help_text='log2 суммы весов комментариев, см. posts.trending.', verbose_name='Рейтинг'),
+        ),
+        migrations.AlterField(
+            model_name='trendingscore',
+            name='updated',
+            field=models.DateTimeField(verbose_name='Последний комментарий'),
+        ),
+    ]
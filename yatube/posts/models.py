@@ -16,6 +16,13 @@ class Group(models.Model):
         return self.title
 
 
+class PostManager(models.Manager):
+    """Посты без помеченных удалёнными."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class Post(models.Model):
     text = models.TextField(
         'Текст поста',
@@ -43,12 +50,23 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True,
     )
+    # Удалённый пост сразу скрывается, а стирается фоновой задачей.
+    is_deleted = models.BooleanField('Удалён', default=False)
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.text[:LONG_TEXT]
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['author', '-pub_date'],
+                         name='posts_post_author_date_idx'),
+            models.Index(fields=['group', '-pub_date'],
+                         name='posts_post_group_date_idx'),
+        ]
         verbose_name = 'Пост',
         verbose_name_plural = 'Посты'
 
@@ -78,4 +96,250 @@ class Follow(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,
                              related_name='follower',
                              )
+    # У подписок, созданных до появления поля, даты нет.
+    created = models.DateTimeField('Дата подписки', auto_now_add=True,
+                                   null=True)
     models.UniqueConstraint(fields=['user', 'author'], name='unique_follow')
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(Group, on_delete=models.CASCADE,
+                                 primary_key=True,
+                                 related_name='stats',
+                                 )
+    post_count = models.PositiveIntegerField('Постов', default=0,
+                                             db_index=True)
+    last_post = models.ForeignKey(Post, on_delete=models.SET_NULL,
+                                  related_name='+',
+                                  blank=True,
+                                  null=True,
+                                  )
+    last_post_date = models.DateTimeField('Последний пост', blank=True,
+                                          null=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Статистика группы'
+        verbose_name_plural = 'Статистика групп'
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count}'
+
+
+class TrendingScore(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE,
+                                primary_key=True,
+                                related_name='trending',
+                                )
+    score = models.FloatField(
+        'Рейтинг', default=0, db_index=True,
+        help_text='log2 суммы весов комментариев, см. posts.trending.'
+    )
+    updated = models.DateTimeField('Последний комментарий')
+
+    class Meta:
+        verbose_name = 'Рейтинг поста'
+        verbose_name_plural = 'Рейтинги постов'
+
+
+class Suggestion(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='suggestions',
+                             )
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='+',
+                               verbose_name='Кого предложить'
+                               )
+    score = models.FloatField('Общих подписок')
+
+    class Meta:
+        ordering = ('-score',)
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'author'],
+                                    name='unique_suggestion'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-score'],
+                         name='posts_sugg_user_score_idx'),
+        ]
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+
+class Notification(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='notifications',
+                             )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE,
+                             related_name='notifications',
+                             )
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'],
+                                    name='unique_notification'),
+        ]
+        verbose_name = 'Уведомление'
+        verbose_name_plural = 'Уведомления'
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из posts_post командой archive_posts.
+
+    Поля повторяют Post, id сохраняется прежним: ссылки на пост не
+    меняются, а горячая таблица и её индексы не растут бесконечно.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    pub_date = models.DateTimeField('Дата публикации', db_index=True)
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='archived_posts',
+                               verbose_name='Автор'
+                               )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        blank=True,
+        null=True,
+        verbose_name='Группа',
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    is_deleted = models.BooleanField('Удалён', default=False)
+
+    objects = PostManager()
+    all_objects = models.Manager()
+
+    def __str__(self):
+        return self.text[:LONG_TEXT]
+
+    class Meta:
+        ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['author', '-pub_date'],
+                         name='posts_arch_author_date_idx'),
+            models.Index(fields=['group', '-pub_date'],
+                         name='posts_arch_group_date_idx'),
+        ]
+        verbose_name = 'Пост в архиве'
+        verbose_name_plural = 'Посты в архиве'
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE,
+                             related_name='comments',
+                             )
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='archived_comments',
+                               verbose_name='Автор'
+                               )
+    text = models.TextField('Комментарий')
+    created = models.DateTimeField('Дата комментария')
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Комментарий в архиве'
+        verbose_name_plural = 'Комментарии в архиве'
+
+    def __str__(self):
+        return self.text
+
+
+class MonthlyCount(models.Model):
+    """Число постов автора или группы за месяц для навигации по датам.
+
+    Строка относится либо к автору, либо к группе; учитываются и
+    архивные посты.
+    """
+
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='monthly_counts',
+                               blank=True,
+                               null=True,
+                               )
+    group = models.ForeignKey(Group, on_delete=models.CASCADE,
+                              related_name='monthly_counts',
+                              blank=True,
+                              null=True,
+                              )
+    year = models.PositiveSmallIntegerField('Год')
+    month = models.PositiveSmallIntegerField('Месяц')
+    count = models.PositiveIntegerField('Постов', default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'year', 'month'],
+                                    name='unique_author_month'),
+            models.UniqueConstraint(fields=['group', 'year', 'month'],
+                                    name='unique_group_month'),
+        ]
+        verbose_name = 'Постов за месяц'
+        verbose_name_plural = 'Постов за месяц'
+
+    def __str__(self):
+        return f'{self.author or self.group} {self.month:02}.{self.year}'
+
+
+class ActivityStats(models.Model):
+    """Сколько за час или сутки появилось постов, комментариев, подписок
+    и пользователей: по всему сайту (group пусто) или в группе.
+
+    Заполняется командой rollup_stats, панель статистики читает только
+    эту таблицу.
+    """
+
+    HOUR = 'hour'
+    DAY = 'day'
+    PERIODS = (
+        (HOUR, 'Час'),
+        (DAY, 'Сутки'),
+    )
+
+    period = models.CharField('Период', max_length=4, choices=PERIODS)
+    start = models.DateTimeField('Начало периода')
+    group = models.ForeignKey(Group, on_delete=models.CASCADE,
+                              related_name='activity',
+                              blank=True,
+                              null=True,
+                              )
+    posts = models.PositiveIntegerField('Постов', default=0)
+    comments = models.PositiveIntegerField('Комментариев', default=0)
+    follows = models.PositiveIntegerField('Подписок', default=0)
+    users = models.PositiveIntegerField('Пользователей', default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'group', 'start'],
+                                    name='unique_activity_bucket'),
+            # NULL в group не совпадает с NULL: строкам всего сайта нужно
+            # отдельное условие.
+            models.UniqueConstraint(fields=['period', 'start'],
+                                    condition=models.Q(group__isnull=True),
+                                    name='unique_site_activity_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'start'],
+                         name='posts_activity_period_idx'),
+        ]
+        verbose_name = 'Активность'
+        verbose_name_plural = 'Активность'
+
+    def __str__(self):
+        return f'{self.period} {self.start:%Y-%m-%d %H:%M} {self.group or ""}'
+
+
+class StatsWatermark(models.Model):
+    """Последняя учтённая в ActivityStats строка таблицы-источника."""
+
+    source = models.CharField('Источник', max_length=50, primary_key=True)
+    last_id = models.BigIntegerField('Последний id', default=0)
+    updated = models.DateTimeField('Обновлено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Отметка статистики'
+        verbose_name_plural = 'Отметки статистики'
+
+    def __str__(self):
+        return f'{self.source}: {self.last_id}'
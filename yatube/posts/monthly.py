@@ -0,0 +1,96 @@
+"""Сводка постов по месяцам для навигации по датам.
+
+Для каждого автора и группы хранится число постов за месяц
+(MonthlyCount), вместе с архивными. Изменение поста пересчитывает только
+его месяцы — диапазоном по индексам (author, pub_date) и
+(group, pub_date), — поэтому боковая панель месяцев строится одним
+небольшим запросом, без сканирования постов.
+"""
+from collections import Counter
+from datetime import MAXYEAR, MINYEAR, date, datetime
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ArchivedPost, MonthlyCount, Post
+
+
+def month_of(pub_date):
+    local = timezone.localtime(pub_date)
+    return local.year, local.month
+
+
+def month_range(year, month):
+    """Границы месяца в текущем часовом поясе; ValueError для 13-го
+    месяца и года вне datetime с запасом в год на часовой пояс."""
+    if not MINYEAR < year < MAXYEAR:
+        raise ValueError(f'Год {year} вне допустимого диапазона')
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
+
+
+def refresh(field, value, year, month):
+    """Пересчитывает месяц автора (field='author') или группы."""
+    start, end = month_range(year, month)
+    lookup = {field: value, 'pub_date__gte': start, 'pub_date__lt': end}
+    count = (
+        Post.objects.filter(**lookup).count()
+        + ArchivedPost.objects.filter(**lookup).count()
+    )
+    key = {field: value, 'year': year, 'month': month}
+    if count:
+        MonthlyCount.objects.update_or_create(**key, defaults={'count': count})
+    else:
+        MonthlyCount.objects.filter(**key).delete()
+
+
+def refresh_month(pub_date, author_id, group_ids=()):
+    """Пересчитывает месяц даты pub_date у автора и у групп group_ids."""
+    year, month = month_of(pub_date)
+    refresh('author_id', author_id, year, month)
+    for group_id in set(group_ids):
+        if group_id is not None:
+            refresh('group_id', group_id, year, month)
+
+
+def rebuild(field=None, value=None):
+    """Пересчитывает сводку целиком или для одного автора либо группы."""
+    counts = Counter()
+    for model in (Post, ArchivedPost):
+        posts = model.objects.all()
+        if field is not None:
+            posts = posts.filter(**{field: value})
+        rows = posts.values_list('author_id', 'group_id', 'pub_date')
+        for author_id, group_id, pub_date in rows.iterator():
+            year, month = month_of(pub_date)
+            if field in (None, 'author_id'):
+                counts['author_id', author_id, year, month] += 1
+            if field in (None, 'group_id') and group_id is not None:
+                counts['group_id', group_id, year, month] += 1
+    stale = MonthlyCount.objects.all()
+    if field is not None:
+        stale = stale.filter(**{field: value})
+    with transaction.atomic():
+        stale.delete()
+        MonthlyCount.objects.bulk_create(
+            MonthlyCount(**{key: owner}, year=year, month=month, count=count)
+            for (key, owner, year, month), count in counts.items()
+        )
+
+
+def navigation(url_name, url_arg, **owner):
+    """Месяцы автора или группы, от новых к старым, со ссылками."""
+    return [
+        {
+            'date': date(item.year, item.month, 1),
+            'count': item.count,
+            'url': reverse(url_name, args=(url_arg, item.year, item.month)),
+        }
+        for item in MonthlyCount.objects.filter(**owner)
+        .order_by('-year', '-month')
+    ]
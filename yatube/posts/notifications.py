@@ -0,0 +1,117 @@
+import logging
+import time
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core import mail
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Follow, Notification, Post
+
+FOLLOW_CHUNK: int = 1000
+DIGEST_WINDOW: int = 15 * 60
+DIGEST_USERS: int = 200
+DIGEST_SUBJECT: str = 'Новые записи авторов, на которых вы подписаны'
+
+logger = logging.getLogger(__name__)
+
+
+def fan_out(post_id):
+    """Раскладывает уведомление о новом посте по подписчикам автора.
+
+    Подписки читаются кусками по первичному ключу, так что автор
+    с десятками тысяч подписчиков не держит их всех в памяти. Повтор
+    задачи после сбоя не создаёт уведомлений второй раз. Возвращает
+    число подписчиков, которым уведомление разложено.
+    """
+    post = Post.objects.filter(pk=post_id).only('author_id').first()
+    if post is None:
+        return 0
+    follows = (
+        Follow.objects.filter(author_id=post.author_id)
+        .exclude(user__email='')
+        .order_by('pk')
+    )
+    last_pk = created = 0
+    while True:
+        chunk = list(
+            follows.filter(pk__gt=last_pk)
+            .values_list('pk', 'user_id')[:FOLLOW_CHUNK]
+        )
+        if not chunk:
+            break
+        Notification.objects.bulk_create([
+            Notification(user_id=user_id, post_id=post_id)
+            for _, user_id in chunk
+        ], ignore_conflicts=True)
+        last_pk = chunk[-1][0]
+        created += len(chunk)
+    return created
+
+
+def build_digest(user, notifications):
+    body = render_to_string('posts/email/digest.txt', {
+        'user': user,
+        'posts': [notification.post for notification in notifications],
+        'site_url': settings.SITE_URL,
+    })
+    return mail.EmailMessage(DIGEST_SUBJECT, body, to=[user.email])
+
+
+def deliver_digests(now=None):
+    """Собирает уведомления в дайджесты по пользователям и отправляет их.
+
+    Письмо уходит пользователю, у которого самое старое уведомление
+    пролежало дольше DIGEST_WINDOW; в него попадает всё накопленное.
+    Все письма запуска идут через одно соединение с почтовым сервером.
+    """
+    started = time.monotonic()
+    cutoff = (now or timezone.now()) - timedelta(seconds=DIGEST_WINDOW)
+    user_ids = list(
+        Notification.objects.filter(created__lte=cutoff)
+        .order_by('user_id')
+        .values_list('user_id', flat=True)
+        .distinct()
+    )
+    sent = delivered = 0
+    connection = mail.get_connection()
+    connection.open()
+    try:
+        for start in range(0, len(user_ids), DIGEST_USERS):
+            notifications = list(
+                Notification.objects.filter(
+                    user_id__in=user_ids[start:start + DIGEST_USERS],
+                    post__is_deleted=False,
+                )
+                .select_related('user', 'post__author')
+                .order_by('user_id', '-post__pub_date')
+            )
+            messages = [
+                build_digest(user, list(group))
+                for user, group in groupby(
+                    notifications, key=lambda item: item.user
+                )
+            ]
+            sent += connection.send_messages(messages) or 0
+            Notification.objects.filter(
+                pk__in=[item.pk for item in notifications]
+            ).delete()
+            delivered += len(notifications)
+    finally:
+        connection.close()
+    elapsed = time.monotonic() - started
+    stats = {
+        'emails': sent,
+        'notifications': delivered,
+        'seconds': elapsed,
+        'emails_per_second': sent / elapsed if elapsed else 0.0,
+    }
+    if sent:
+        logger.info(
+            'Отправлено дайджестов: %(emails)d (уведомлений: '
+            '%(notifications)d) за %(seconds).2f с, '
+            '%(emails_per_second).1f писем/с', stats
+        )
+    return stats
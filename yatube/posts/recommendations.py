@@ -0,0 +1,155 @@
+"""Рекомендации «На кого подписаться» по графу подписок.
+
+Граф целиком загружается в разреженную CSR-матрицу A (кто -> на кого
+подписан). Для пачки пользователей произведение A[пачка] @ A даёт
+для каждого кандидата число авторов из подписок пользователя,
+которые сами подписаны на кандидата («друзья друзей»).
+"""
+import resource
+import time
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Follow, Suggestion
+
+SUGGESTIONS: int = 5
+BATCH_USERS: int = 50000
+SAVE_CHUNK: int = 500
+
+
+def load_graph():
+    """Читает подписки в CSR-матрицу.
+
+    Возвращает матрицу и массив, переводящий номер строки в id
+    пользователя. Пары читаются одним запросом потоком прямо в массив
+    numpy, без промежуточного списка кортежей. Длина массива заранее не
+    задаётся: подписки могут меняться, пока идёт чтение. Подписки на
+    себя пропускаются: они делали бы автора «другом» самого себя.
+    """
+    pairs = np.fromiter(
+        chain.from_iterable(
+            Follow.objects.order_by().exclude(user_id=F('author_id'))
+            .values_list('user_id', 'author_id')
+            .iterator(chunk_size=10000)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    ids, index = np.unique(pairs, return_inverse=True)
+    index = index.reshape(-1, 2)
+    return build_matrix(index[:, 0], index[:, 1], len(ids)), ids
+
+
+def build_matrix(rows, cols, size):
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(size, size),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def top_k(scores, k):
+    """Оставляет в каждой строке CSR-матрицы k элементов с наибольшим весом.
+
+    Вся пачка сортируется одним argsort по ключу (строка, -вес);
+    при равном весе выигрывает меньший номер столбца. Возвращает
+    массивы (строка, столбец, вес) оставшихся элементов.
+    """
+    scores.sort_indices()
+    counts = np.diff(scores.indptr)
+    rows = np.repeat(np.arange(scores.shape[0], dtype=np.int64), counts)
+    weights = scores.data.astype(np.int64)
+    top = int(weights.max()) + 1 if len(weights) else 1
+    order = np.argsort(rows * top + (top - 1 - weights), kind='stable')
+    rank = np.arange(len(order)) - np.repeat(scores.indptr[:-1], counts)
+    keep = order[rank < k]
+    return rows[keep], scores.indices[keep], scores.data[keep]
+
+
+def suggest_batch(matrix, start, end, k=SUGGESTIONS):
+    """Считает рекомендации для строк start..end одним умножением."""
+    block = matrix[start:end]
+    scores = (block @ matrix).tocsr()
+    seen = block + sparse.eye(
+        end - start, matrix.shape[1], k=start, format='csr',
+        dtype=np.float32
+    )
+    scores = scores - scores.multiply(seen)
+    scores.eliminate_zeros()
+    rows, cols, weights = top_k(scores, k)
+    return rows + start, cols, weights
+
+
+def compute(matrix, k=SUGGESTIONS, batch=BATCH_USERS):
+    """Перебирает пользователей пачками.
+
+    Для каждой пачки отдаёт диапазон строк и массивы рекомендаций.
+    """
+    size = matrix.shape[0]
+    for start in range(0, size, batch):
+        end = min(start + batch, size)
+        yield (start, end), suggest_batch(matrix, start, end, k)
+
+
+def save(ids, batches):
+    """Заменяет сохранённые рекомендации пачками пользователей."""
+    for (start, end), (rows, cols, weights) in batches:
+        for first in range(start, end, SAVE_CHUNK):
+            last = min(first + SAVE_CHUNK, end)
+            low, high = np.searchsorted(rows, (first, last))
+            replace(ids[first:last].tolist(), zip(
+                ids[rows[low:high]].tolist(),
+                ids[cols[low:high]].tolist(),
+                weights[low:high].tolist(),
+            ))
+
+
+def replace(users, suggestions):
+    with transaction.atomic():
+        Suggestion.objects.filter(user_id__in=users).delete()
+        Suggestion.objects.bulk_create(
+            Suggestion(user_id=user_id, author_id=author_id, score=score)
+            for user_id, author_id, score in suggestions
+        )
+
+
+def rebuild(k=SUGGESTIONS, batch=BATCH_USERS):
+    """Пересчитывает рекомендации для всех пользователей графа."""
+    matrix, ids = load_graph()
+    Suggestion.objects.filter(user__follower__isnull=True).delete()
+    save(ids, compute(matrix, k, batch))
+    return matrix.shape[0], matrix.nnz
+
+
+def synthetic_graph(users, edges, seed=0):
+    """Случайный граф со степенным распределением числа подписчиков."""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, users, size=edges)
+    cols = (rng.pareto(1.2, size=edges) * users / 50).astype(np.int64)
+    cols %= users
+    return build_matrix(rows, cols, users)
+
+
+def measure(matrix, k=SUGGESTIONS, batch=BATCH_USERS):
+    """Время и пиковая память процесса при расчёте без записи в базу."""
+    started = time.perf_counter()
+    produced = sum(len(rows) for _, (rows, _, _) in compute(matrix, k, batch))
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        'users': matrix.shape[0],
+        'edges': matrix.nnz,
+        'suggestions': produced,
+        'seconds': elapsed,
+        'peak_rss_mb': peak / 2 ** 20,
+        'matrix_mb': (
+            matrix.data.nbytes + matrix.indices.nbytes
+            + matrix.indptr.nbytes
+        ) / 2 ** 20,
+    }
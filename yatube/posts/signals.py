@@ -0,0 +1,140 @@
+from django.conf import settings
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from core.middleware import invalidate_pages
+
+from . import aggregates, deletion, entities, monthly, tasks, trending
+from .models import Comment, Follow, Group, GroupStats, Post, User
+
+
+@receiver(post_save, sender=Group)
+def create_group_stats(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_group(sender, instance, **kwargs):
+    instance._old_group_id = instance._old_pub_date = None
+    if instance.pk is not None:
+        instance._old_group_id, instance._old_pub_date = (
+            Post.all_objects.filter(pk=instance.pk)
+            .values_list('group_id', 'pub_date')
+            .first()
+        ) or (None, None)
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(sender, instance, created, **kwargs):
+    if created:
+        if instance.group_id is not None:
+            aggregates.add_post_to_group_stats(instance)
+        return
+    old_group_id = getattr(instance, '_old_group_id', None)
+    if old_group_id != instance.group_id:
+        for group_id in (old_group_id, instance.group_id):
+            if group_id is not None:
+                aggregates.refresh_group_stats(group_id)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_group_stats(sender, instance, **kwargs):
+    # Стираемые посты уже помечены удалёнными и в статистике не учтены.
+    if instance.group_id is not None and not deletion.is_purging():
+        aggregates.refresh_group_stats(instance.group_id)
+
+
+@receiver(post_save, sender=Post)
+def update_monthly_counts(sender, instance, created, update_fields=None,
+                          **kwargs):
+    old_group_id = getattr(instance, '_old_group_id', None)
+    old_pub_date = getattr(instance, '_old_pub_date', None)
+    groups = (instance.group_id, old_group_id)
+    hidden = update_fields is not None and 'is_deleted' in update_fields
+    if created or hidden or old_group_id != instance.group_id:
+        monthly.refresh_month(instance.pub_date, instance.author_id, groups)
+    if old_pub_date is not None and old_pub_date != instance.pub_date:
+        monthly.refresh_month(old_pub_date, instance.author_id, groups)
+        monthly.refresh_month(instance.pub_date, instance.author_id, groups)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_monthly_counts(sender, instance, **kwargs):
+    if not deletion.is_purging():
+        monthly.refresh_month(
+            instance.pub_date, instance.author_id, (instance.group_id,)
+        )
+
+
+@receiver(post_save, sender=Comment)
+def update_trending(sender, instance, created, **kwargs):
+    if created:
+        trending.register_comment(instance.post_id, instance.created)
+
+
+@receiver(post_init, sender=User)
+@receiver(post_init, sender=Group)
+def remember_lookup_value(sender, instance, **kwargs):
+    field = 'username' if sender is User else 'slug'
+    instance._initial_lookup = instance.__dict__.get(field)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    entities.users.invalidate(
+        getattr(instance, '_initial_lookup', None), instance.username
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, instance, **kwargs):
+    entities.groups.invalidate(
+        getattr(instance, '_initial_lookup', None), instance.slug
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_fast_lane(sender, update_fields=None, **kwargs):
+    # Вход обновляет только last_login, на страницах его не видно.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    if not deletion.is_purging():
+        invalidate_pages()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_pages(sender, instance, **kwargs):
+    if not settings.PROXY_PURGE_URL or deletion.is_purging():
+        return
+    keys = {
+        'feed', 'groups', 'trending',
+        f'post-{instance.pk}', f'author-{instance.author_id}',
+    }
+    for group_id in (instance.group_id,
+                     getattr(instance, '_old_group_id', None)):
+        if group_id is not None:
+            keys.add(f'group-{group_id}')
+    tasks.purge_proxy.delay(keys=sorted(keys))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_pages(sender, instance, **kwargs):
+    if settings.PROXY_PURGE_URL and not deletion.is_purging():
+        tasks.purge_proxy.delay(
+            keys=['trending', f'post-{instance.post_id}']
+        )
@@ -0,0 +1,215 @@
+"""Статистика активности сайта по часам и суткам.
+
+Сводка ActivityStats пополняется инкрементально: для каждой таблицы-
+источника хранится id последней учтённой строки (StatsWatermark), и
+очередной запуск читает только строки после неё, порциями по BATCH_SIZE
+в порядке первичного ключа. Панель и JSON читают только сводку и не
+нагружают posts_post и posts_comment запросами COUNT/GROUP BY.
+
+Отметка двигается только по строкам старше LAG: транзакция, начатая
+раньше, могла получить меньший id, но ещё не зафиксироваться, и строки
+за отметкой больше не читаются. Поэтому чтение источника
+останавливается на первой слишком свежей строке, и она учитывается при
+следующем запуске.
+
+Архивные таблицы учитываются один раз, при первом запуске: в архив
+попадают только посты старше года, которые к тому времени уже учтены
+из горячих таблиц.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import (ActivityStats, ArchivedComment, ArchivedPost, Comment,
+                     Follow, Post, StatsWatermark)
+
+User = get_user_model()
+
+BATCH_SIZE: int = 5000
+# Сколько ждать фиксации транзакций, прежде чем учесть их строки.
+LAG: timedelta = timedelta(minutes=5)
+PERIODS: tuple = (ActivityStats.HOUR, ActivityStats.DAY)
+# Глубина выдачи по умолчанию.
+DEFAULT_SPAN: dict = {ActivityStats.HOUR: 48, ActivityStats.DAY: 30}
+COUNTERS: tuple = ('posts', 'comments', 'follows', 'users')
+STEP: dict = {
+    ActivityStats.HOUR: timedelta(hours=1),
+    ActivityStats.DAY: timedelta(days=1),
+}
+
+
+def sources():
+    """Источник: (счётчик, выборка, поле даты, поле группы или None)."""
+    return {
+        'posts': ('posts', Post.all_objects.all(), 'pub_date', 'group_id'),
+        'comments': (
+            'comments', Comment.objects.all(), 'created', 'post__group_id'
+        ),
+        'follows': ('follows', Follow.objects.all(), 'created', None),
+        'users': ('users', User.objects.all(), 'date_joined', None),
+    }
+
+
+def archive_sources():
+    return (
+        ('posts', ArchivedPost.all_objects.all(), 'pub_date', 'group_id'),
+        ('comments', ArchivedComment.objects.all(), 'created',
+         'post__group_id'),
+    )
+
+
+def period_start(moment, period):
+    local = timezone.localtime(moment).replace(
+        minute=0, second=0, microsecond=0
+    )
+    if period == ActivityStats.DAY:
+        local = local.replace(hour=0)
+    return local
+
+
+def window_start(period, span, now=None):
+    """Начало последних span периодов, включая текущий."""
+    return period_start(now or timezone.now(), period) - STEP[period] * (
+        span - 1
+    )
+
+
+def count_rows(rows):
+    """Раскладывает строки (id, дата, группа) по периодам и группам."""
+    buckets = Counter()
+    for _, moment, group_id in rows:
+        if moment is None:
+            continue
+        for period in PERIODS:
+            start = period_start(moment, period)
+            buckets[period, start, None] += 1
+            if group_id is not None:
+                buckets[period, start, group_id] += 1
+    return buckets
+
+
+def apply(counter, buckets):
+    """Прибавляет посчитанное к строкам сводки."""
+    for (period, start, group_id), count in buckets.items():
+        updated = ActivityStats.objects.filter(
+            period=period, start=start, group_id=group_id
+        ).update(**{counter: F(counter) + count})
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                ActivityStats.objects.create(
+                    period=period, start=start, group_id=group_id,
+                    **{counter: count}
+                )
+        except IntegrityError:
+            # Строку периода успел создать параллельный запуск.
+            ActivityStats.objects.filter(
+                period=period, start=start, group_id=group_id
+            ).update(**{counter: F(counter) + count})
+
+
+def read_rows(queryset, date_field, group_field, after=0):
+    fields = ['pk', date_field]
+    if group_field is not None:
+        fields.append(group_field)
+    rows = (
+        queryset.filter(pk__gt=after).order_by('pk')
+        .values_list(*fields)[:BATCH_SIZE]
+    )
+    if group_field is None:
+        return [(pk, moment, None) for pk, moment in rows]
+    return list(rows)
+
+
+def settled(rows, cutoff):
+    """Начало порции до первой строки новее cutoff."""
+    for number, (_, moment, _) in enumerate(rows):
+        if moment is not None and moment > cutoff:
+            return rows[:number]
+    return rows
+
+
+def backfill_archive():
+    """Учитывает архивные таблицы; вызывается до первых отметок."""
+    for counter, queryset, date_field, group_field in archive_sources():
+        last = 0
+        while True:
+            rows = read_rows(queryset, date_field, group_field, last)
+            if not rows:
+                break
+            apply(counter, count_rows(rows))
+            last = rows[-1][0]
+
+
+def rollup(now=None):
+    """Учитывает новые строки всех источников старше LAG; возвращает
+    их число."""
+    cutoff = (now or timezone.now()) - LAG
+    with transaction.atomic():
+        if not StatsWatermark.objects.exists():
+            backfill_archive()
+            StatsWatermark.objects.bulk_create(
+                StatsWatermark(source=source) for source in sources()
+            )
+    processed = Counter()
+    for source, (counter, queryset, date_field, group_field) in (
+            sources().items()):
+        while True:
+            with transaction.atomic():
+                watermark = (
+                    StatsWatermark.objects.select_for_update()
+                    .get_or_create(source=source)[0]
+                )
+                batch = read_rows(
+                    queryset, date_field, group_field, watermark.last_id
+                )
+                rows = settled(batch, cutoff)
+                if not rows:
+                    break
+                apply(counter, count_rows(rows))
+                watermark.last_id = rows[-1][0]
+                watermark.save()
+            processed[source] += len(rows)
+            if len(rows) < len(batch):
+                break
+    return processed
+
+
+def series(period, span=None, group=None, now=None):
+    """Ряд сводки за последние span периодов, от старых к новым."""
+    span = span or DEFAULT_SPAN[period]
+    since = window_start(period, span, now)
+    rows = {
+        row['start']: row
+        for row in ActivityStats.objects.filter(
+            period=period, group=group, start__gte=since
+        ).values('start', *COUNTERS)
+    }
+    points = []
+    for number in range(span):
+        start = since + STEP[period] * number
+        row = rows.get(start, {})
+        points.append({
+            'start': start,
+            **{counter: row.get(counter, 0) for counter in COUNTERS},
+        })
+    return points
+
+
+def groups_summary(period, span=None, now=None):
+    """Посты и комментарии по группам за последние span периодов."""
+    span = span or DEFAULT_SPAN[period]
+    since = window_start(period, span, now)
+    return list(
+        ActivityStats.objects.filter(
+            period=period, start__gte=since, group__isnull=False
+        )
+        .values('group__slug', 'group__title')
+        .annotate(posts=Sum('posts'), comments=Sum('comments'))
+        .order_by('-posts', 'group__title')
+    )
@@ -0,0 +1,294 @@
+"""Синтетические данные реалистичной формы для замеров на своей машине.
+
+Равномерно случайные данные скрывают то, что тормозит на сайте: у
+немногих авторов огромное число подписчиков, несколько групп собирают
+большую часть постов, посты выходят пачками, а комментарии сходятся
+под немногими постами. Dataset воспроизводит это степенными
+распределениями:
+
+* активность и популярность пользователя — распределение Парето, по
+  нему выбираются авторы постов, комментариев и цели подписок, так что
+  число подписчиков растёт степенным хвостом;
+* размер группы — закон Ципфа;
+* посты идут всплесками: автор публикует пачку постов с интервалами в
+  минуты, длина пачки — тоже Парето;
+* комментарии распределяются по «горячести» поста (Парето);
+* у доли постов есть картинка из небольшого общего набора файлов.
+
+Строки пишутся bulk_create порциями по batch_size, каждая в своей
+транзакции, с явными id, чтобы связывать их без повторного чтения.
+Faker вызывается только для небольших пулов текстов и имён, поэтому
+миллионы строк создаются за минуты. Одинаковый seed на пустой базе
+даёт одинаковые данные.
+"""
+import io
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+from PIL import Image
+
+from . import aggregates, monthly
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+BATCH_SIZE: int = 5000
+# Объём при scale=1; команда seed_data умножает его на --scale.
+BASE_COUNTS: dict = {
+    'users': 1000,
+    'groups': 20,
+    'posts': 20000,
+    'comments': 60000,
+}
+FOLLOWS_PER_USER: int = 20
+GROUP_SHARE: float = 0.6
+IMAGE_SHARE: float = 0.1
+IMAGE_POOL: int = 8
+TEXT_POOL: int = 2000
+NAME_POOL: int = 5000
+# Показатели распределений: чем меньше, тем тяжелее хвост.
+ACTIVITY_ALPHA: float = 1.2
+GROUP_EXPONENT: float = 1.5
+BURST_ALPHA: float = 1.5
+HEAT_ALPHA: float = 1.5
+# Средние паузы в секундах: между постами пачки и до комментария.
+BURST_GAP: int = 600
+COMMENT_DELAY: int = 6 * 3600
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """Позволяет bulk_create записать даты полей с auto_now_add."""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
+
+
+def next_id(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def insert(model, objects, batch_size):
+    """Пишет объекты порциями; возвращает их число."""
+    objects = iter(objects)
+    total = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return total
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        total += len(batch)
+
+
+class Dataset:
+    """Генератор набора данных; generate() наполняет базу по шагам."""
+
+    def __init__(self, users, groups, posts, comments, seed=0, days=365,
+                 image_share=IMAGE_SHARE, password=None,
+                 batch_size=BATCH_SIZE, now=None):
+        self.counts = {
+            'users': users, 'groups': groups,
+            'posts': posts, 'comments': comments,
+        }
+        self.rnd = random.Random(seed)
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(seed)
+        self.now = now or timezone.now()
+        self.span = timedelta(days=days).total_seconds()
+        self.start = self.now - timedelta(days=days)
+        self.image_share = image_share
+        self.password = make_password(password)
+        self.batch_size = batch_size
+
+    def moment(self, seconds):
+        """Момент через seconds после начала окна, не позже now."""
+        return min(self.start + timedelta(seconds=seconds), self.now)
+
+    def pareto(self, alpha, count):
+        return [self.rnd.paretovariate(alpha) for _ in range(count)]
+
+    def images(self):
+        """Имена файлов общего набора картинок; создаёт недостающие.
+
+        Цвет картинки зависит только от её номера: уже созданные файлы не
+        сдвигают последовательность self.rnd, и данные не зависят от того,
+        какие картинки остались от прошлых запусков.
+        """
+        names = []
+        for number in range(IMAGE_POOL):
+            name = f'posts/seed_{number}.jpg'
+            if not default_storage.exists(name):
+                buffer = io.BytesIO()
+                rnd = random.Random(number)
+                color = tuple(rnd.randrange(256) for _ in range(3))
+                Image.new('RGB', (640, 480), color).save(buffer, 'JPEG')
+                name = default_storage.save(
+                    name, ContentFile(buffer.getvalue())
+                )
+            names.append(name)
+        return names
+
+    def create_users(self):
+        count = self.counts['users']
+        first = next_id(User)
+        self.user_ids = range(first, first + count)
+        self.activity = list(accumulate(self.pareto(ACTIVITY_ALPHA, count)))
+        names = [self.fake.user_name() for _ in range(min(count, NAME_POOL))]
+        first_names = [self.fake.first_name() for _ in range(100)]
+        last_names = [self.fake.last_name() for _ in range(100)]
+        return insert(User, (
+            User(
+                id=user_id,
+                username=f'{self.rnd.choice(names)}_{user_id}',
+                first_name=self.rnd.choice(first_names),
+                last_name=self.rnd.choice(last_names),
+                password=self.password,
+                # Все зарегистрированы до начала окна публикаций.
+                date_joined=self.start - timedelta(
+                    seconds=self.rnd.random() * self.span
+                ),
+            )
+            for user_id in self.user_ids
+        ), self.batch_size)
+
+    def create_groups(self):
+        count = self.counts['groups']
+        first = next_id(Group)
+        self.group_ids = range(first, first + count)
+        self.group_weights = list(accumulate(
+            1 / rank ** GROUP_EXPONENT for rank in range(1, count + 1)
+        ))
+        return insert(Group, (
+            Group(
+                id=group_id,
+                title=f'{self.fake.word().capitalize()} {group_id}',
+                slug=f'group-{group_id}',
+                description=self.fake.sentence(),
+            )
+            for group_id in self.group_ids
+        ), self.batch_size)
+
+    def author(self):
+        return self.rnd.choices(self.user_ids, cum_weights=self.activity)[0]
+
+    def bursts(self):
+        """Посты пачками: (автор, группа, время) до нужного числа."""
+        remaining = self.counts['posts']
+        while remaining:
+            author = self.author()
+            group = None
+            if self.group_ids and self.rnd.random() < GROUP_SHARE:
+                group = self.rnd.choices(
+                    self.group_ids, cum_weights=self.group_weights
+                )[0]
+            size = min(remaining, int(self.rnd.paretovariate(BURST_ALPHA)))
+            seconds = self.rnd.random() * self.span
+            for _ in range(size):
+                seconds += self.rnd.expovariate(1 / BURST_GAP)
+                yield author, group, seconds
+            remaining -= size
+
+    def create_posts(self):
+        first = next_id(Post)
+        texts = [
+            self.fake.paragraph(nb_sentences=self.rnd.randint(1, 6))
+            for _ in range(TEXT_POOL)
+        ]
+        images = self.images() if self.image_share else []
+        self.post_ids = range(first, first + self.counts['posts'])
+        self.post_seconds = []
+
+        def posts():
+            for post_id, (author, group, seconds) in zip(
+                    self.post_ids, self.bursts()):
+                self.post_seconds.append(seconds)
+                image = ''
+                if images and self.rnd.random() < self.image_share:
+                    image = self.rnd.choice(images)
+                yield Post(
+                    id=post_id, author_id=author, group_id=group,
+                    text=self.rnd.choice(texts),
+                    pub_date=self.moment(seconds), image=image,
+                )
+
+        return insert(Post, posts(), self.batch_size)
+
+    def create_comments(self):
+        if not self.post_ids:
+            return 0
+        texts = [self.fake.sentence() for _ in range(TEXT_POOL)]
+        heat = list(accumulate(self.pareto(HEAT_ALPHA, len(self.post_ids))))
+        offsets = range(len(self.post_ids))
+
+        def comments():
+            for _ in range(self.counts['comments']):
+                offset = self.rnd.choices(offsets, cum_weights=heat)[0]
+                yield Comment(
+                    post_id=self.post_ids[offset], author_id=self.author(),
+                    text=self.rnd.choice(texts),
+                    created=self.moment(
+                        self.post_seconds[offset]
+                        + self.rnd.expovariate(1 / COMMENT_DELAY)
+                    ),
+                )
+
+        return insert(Comment, comments(), self.batch_size)
+
+    def create_follows(self):
+        """Подписки: у каждого в среднем FOLLOWS_PER_USER, цели — по
+        популярности, поэтому число подписчиков — степенной хвост."""
+        def follows():
+            for user_id in self.user_ids:
+                count = int(self.rnd.expovariate(1 / FOLLOWS_PER_USER))
+                authors = set(self.rnd.choices(
+                    self.user_ids, cum_weights=self.activity, k=count
+                )) - {user_id}
+                for author in sorted(authors):
+                    yield Follow(
+                        user_id=user_id, author_id=author,
+                        created=self.moment(self.rnd.random() * self.span),
+                    )
+
+        return insert(Follow, follows(), self.batch_size)
+
+    def finish(self):
+        """Сдвигает счётчики id и пересчитывает сводки без сигналов."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), [User, Group, Post]):
+                cursor.execute(sql)
+        for group_id in self.group_ids:
+            aggregates.refresh_group_stats(group_id)
+        monthly.rebuild()
+
+    def generate(self):
+        """Наполняет базу; после каждого шага отдаёт (шаг, строк)."""
+        dates = (
+            Post._meta.get_field('pub_date'),
+            Comment._meta.get_field('created'),
+            Follow._meta.get_field('created'),
+        )
+        with explicit_dates(*dates):
+            yield 'users', self.create_users()
+            yield 'groups', self.create_groups()
+            yield 'posts', self.create_posts()
+            yield 'comments', self.create_comments()
+            yield 'follows', self.create_follows()
+        self.finish()
@@ -0,0 +1,52 @@
+from sorl.thumbnail import get_thumbnail
+
+from core import proxy
+from core.tasks import task
+from . import deletion, notifications
+from .models import Post
+
+THUMBNAIL_GEOMETRY: str = '960x339'
+
+
+@task(batch_size=50)
+def make_thumbnails(items):
+    """Заранее готовит миниатюры картинок постов для ленты."""
+    post_ids = {item['post_id'] for item in items}
+    for post in Post.objects.filter(pk__in=post_ids).exclude(image=''):
+        get_thumbnail(
+            post.image, THUMBNAIL_GEOMETRY, crop='center', upscale=True
+        )
+
+
+@task
+def notify_followers(post_id):
+    """Ставит подписчикам уведомления о новом посте."""
+    if notifications.fan_out(post_id):
+        send_digests.apply_async(countdown=notifications.DIGEST_WINDOW)
+
+
+@task(batch_size=100)
+def send_digests(items):
+    """Отправляет накопившиеся дайджесты; повторные запуски склеиваются."""
+    notifications.deliver_digests()
+
+
+@task(batch_size=100)
+def purge_proxy(items):
+    """Сбрасывает на прокси страницы с изменёнными постами."""
+    proxy.purge(set().union(*(item['keys'] for item in items)))
+
+
+@task
+def purge_post(post_id):
+    """Стирает удалённый пост; не успела — ставит продолжение."""
+    posts = Post.all_objects.filter(pk=post_id, is_deleted=True)
+    if not deletion.purge_posts(posts):
+        purge_post.delay(post_id=post_id)
+
+
+@task
+def purge_user(user_id):
+    """Стирает удалённого пользователя; не успела — ставит продолжение."""
+    if not deletion.purge_user(user_id):
+        purge_user.delay(user_id=user_id)
@@ -0,0 +1,127 @@
+import re
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import worker
+from posts import archive, deletion
+from posts.models import (ArchivedComment, ArchivedPost, Comment, Group,
+                          Post)
+
+User = get_user_model()
+
+POST_TEXT = re.compile(r'<p>(Пост \d+)</p>')
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        now = timezone.now()
+        for number in range(13):
+            post = Post.objects.create(
+                author=self.author, group=self.group, text=f'Пост {number}'
+            )
+            # Посты 0-4 старые, с шагом в день.
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=now - timedelta(days=400 - number)
+                if number < 5 else now - timedelta(minutes=13 - number)
+            )
+        self.old = Post.objects.get(text='Пост 4')
+        Comment.objects.create(post=self.old, author=self.author, text='!')
+        self.cutoff = now - timedelta(days=365)
+
+    def texts(self, url, **params):
+        response = self.client.get(url, params)
+        return [post.text for post in response.context['page_obj']]
+
+    def test_old_posts_moved_in_batches(self):
+        """Старые посты и их комментарии переносятся в архив порциями."""
+        self.assertEqual(archive.archive_batch(self.cutoff, size=2), 2)
+        self.assertEqual(archive.archive_posts(self.cutoff, size=2), 3)
+        self.assertEqual(Post.objects.count(), 8)
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+        comment = ArchivedComment.objects.get()
+        self.assertEqual(comment.post_id, self.old.pk)
+        self.assertFalse(Comment.objects.exists())
+        self.group.stats.refresh_from_db()
+        self.assertEqual(self.group.stats.post_count, 13)
+
+    def test_feeds_fall_back_to_archive(self):
+        """Профиль и группа на глубоких страницах продолжаются архивом."""
+        archive.archive_posts(self.cutoff)
+        expected = [f'Пост {number}' for number in range(12, -1, -1)]
+        for url in (reverse('posts:profile', args=('author',)),
+                    reverse('posts:group_list', args=('group',))):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.texts(url) + self.texts(url, page=2), expected
+                )
+
+    def test_profile_total_includes_archive(self):
+        """Число постов в профиле учитывает архивные."""
+        archive.archive_posts(self.cutoff)
+        response = self.client.get(reverse('posts:profile', args=('author',)))
+        self.assertContains(response, 'Всего постов: 13')
+
+    def test_post_total_includes_archive(self):
+        """Число постов автора на странице поста учитывает архивные в
+        обоих движках шаблонов."""
+        archive.archive_posts(self.cutoff)
+        url = reverse('posts:post_detail', args=(self.old.pk,))
+        for engines in ([], ['posts:post_detail']):
+            with self.subTest(engines=engines):
+                with override_settings(JINJA2_VIEWS=engines):
+                    response = self.client.get(url)
+                self.assertContains(response, '<span > 13</span>')
+
+    def test_fragments_continue_into_archive(self):
+        """Подгрузка ленты профиля доходит до архивных постов."""
+        archive.archive_posts(self.cutoff)
+        url = reverse('posts:profile_fragment', args=('author',))
+        texts = []
+        while url:
+            response = self.client.get(url)
+            texts.extend(POST_TEXT.findall(response.content.decode()))
+            url = response.context['next_url']
+        self.assertEqual(
+            texts, [f'Пост {number}' for number in range(12, -1, -1)]
+        )
+
+    def test_archived_post_detail(self):
+        """Архивный пост открывается по прежнему адресу, но только для
+        чтения."""
+        archive.archive_posts(self.cutoff)
+        self.client.force_login(self.author)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.old.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['archived'])
+        self.assertEqual(len(response.context['comments']), 1)
+        self.assertNotContains(
+            response, reverse('posts:add_comment', args=(self.old.pk,))
+        )
+
+    def test_command(self):
+        """Команда archive_posts переносит посты старше --days дней."""
+        out = StringIO()
+        call_command('archive_posts', days=365, pause=0, stdout=out)
+        self.assertIn('5', out.getvalue())
+        self.assertEqual(ArchivedPost.objects.count(), 5)
+
+    def test_deleted_author_archive_purged(self):
+        """Удаление автора скрывает и стирает его архивные посты."""
+        archive.archive_posts(self.cutoff)
+        deletion.delete_user(self.author)
+        self.assertFalse(ArchivedPost.objects.exists())
+        worker.run_pending()
+        self.assertFalse(ArchivedPost.all_objects.exists())
+        self.assertFalse(User.objects.filter(username='author').exists())
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from core import worker
+from core.models import Task
+from core.testing import EmptyMediaMixin
+from posts import deletion
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+class PostDeleteTests(EmptyMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='author')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.post = Post.objects.create(
+            author=self.user, group=self.group, text='Пост',
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+        Comment.objects.create(post=self.post, author=self.user, text='!')
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_delete', args=(self.post.pk,))
+
+    def test_author_deletes_post(self):
+        """Пост сразу пропадает со страниц, а задача стирает его целиком."""
+        name = self.post.image.name
+        self.assertTrue(default_storage.exists(name))
+        response = self.client.post(self.url)
+        self.assertRedirects(
+            response, reverse('posts:profile', args=(self.user.username,))
+        )
+        self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(self.group.stats.post_count, 0)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,))
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        worker.run_pending()
+        self.assertFalse(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_shared_image_kept_while_used(self):
+        """Общий с другим постом файл стирается вместе с последним из
+        них."""
+        name = self.post.image.name
+        other = Post.objects.create(
+            author=self.user, text='Та же картинка', image=name
+        )
+        self.client.post(self.url)
+        worker.run_pending()
+        self.assertTrue(default_storage.exists(name))
+        self.client.post(reverse('posts:post_delete', args=(other.pk,)))
+        worker.run_pending()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_only_author_deletes_by_post(self):
+        """Чужой пост не удаляется, GET не удаляет ничего."""
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.client.force_login(User.objects.create_user(username='other'))
+        self.client.post(self.url)
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(Task.objects.exists())
+
+
+class UserDeleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='prolific')
+        self.reader = User.objects.create_user(username='reader')
+        for number in range(7):
+            post = Post.objects.create(author=self.user, text=f'Пост {number}')
+            Comment.objects.create(post=post, author=self.reader, text='!')
+        Comment.objects.create(
+            post=Post.objects.create(author=self.reader, text='Чужой'),
+            author=self.user, text='?',
+        )
+        Follow.objects.create(user=self.reader, author=self.user)
+
+    @mock.patch('posts.deletion.CHUNKS_PER_RUN', 2)
+    @mock.patch('posts.deletion.CHUNK_SIZE', 3)
+    def test_user_purged_in_chunks(self):
+        """Пользователь отключается сразу, а стирается несколькими
+        запусками задачи небольшими порциями."""
+        deletion.delete_user(self.user)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(Post.objects.filter(author=self.user).exists())
+        self.assertEqual(Post.objects.count(), 1)
+        runs = 0
+        while Task.objects.exists():
+            worker.run_pending(limit=1)
+            runs += 1
+        self.assertGreater(runs, 1)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(Post.all_objects.count(), 1)
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+
+    def test_admin_delete_is_deferred(self):
+        """Удаление из админки только отключает пользователя."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        self.client.force_login(admin)
+        url = reverse('admin:auth_user_delete', args=(self.user.pk,))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.post(url, {'post': 'yes'})
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertTrue(
+            Task.objects.filter(name='posts.tasks.purge_user').exists()
+        )
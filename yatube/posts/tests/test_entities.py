@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase
+from django.urls import reverse
+
+from posts import entities
+from posts.models import Group
+
+User = get_user_model()
+
+
+class EntityCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cached')
+        cls.group = Group.objects.create(
+            title='Группа', slug='cached-group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        for entity_cache in (entities.users, entities.groups):
+            entity_cache.local.clear()
+            entity_cache.counters.clear()
+
+    def test_repeated_lookup_skips_database(self):
+        """Повторный поиск пользователя не обращается к базе."""
+        with self.assertNumQueries(1):
+            entities.users.get('cached')
+        with self.assertNumQueries(0):
+            self.assertEqual(entities.users.get('cached'), self.user)
+
+    def test_password_hash_is_not_cached(self):
+        """В общий кэш попадают только публичные поля пользователя."""
+        entities.users.get('cached')
+        cached = cache.get(entities.users.key('cached'))
+        self.assertEqual(cached, self.user)
+        self.assertNotIn('password', cached.__dict__)
+        self.assertNotIn('email', cached.__dict__)
+
+    def test_shared_cache_fills_local(self):
+        """Промах кэша процесса берёт объект из общего кэша."""
+        entities.groups.get('cached-group')
+        entities.groups.local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(entities.groups.get('cached-group'), self.group)
+        self.assertEqual(entities.groups.counters['shared'], 1)
+
+    def test_missing_entities_are_cached(self):
+        """Несуществующий профиль не запрашивается из базы повторно."""
+        with self.assertRaises(Http404):
+            entities.users.get_or_404('nobody')
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('posts:profile', args=['nobody'])
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(entities.users.counters['negative'], 2)
+
+    def test_save_invalidates_entry(self):
+        """Переименование сбрасывает старое и новое имя."""
+        entities.users.get('cached')
+        entities.users.get('renamed')
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'renamed'
+        user.save()
+        self.assertIsNone(entities.users.get('cached'))
+        self.assertEqual(entities.users.get('renamed'), self.user)
+
+    def test_created_entity_replaces_negative_entry(self):
+        """Созданная группа сразу находится, несмотря на кэш промаха."""
+        self.assertIsNone(entities.groups.get('new-group'))
+        group = Group.objects.create(
+            title='Новая', slug='new-group', description='Описание'
+        )
+        self.assertEqual(entities.groups.get('new-group'), group)
+
+    def test_hit_ratio(self):
+        """Доля попаданий считается по всем обращениям."""
+        for _ in range(4):
+            entities.users.get('cached')
+        self.assertEqual(entities.users.stats()['hit_ratio'], 0.75)
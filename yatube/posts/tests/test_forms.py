@@ -1,24 +1,19 @@
 from django.contrib.auth import get_user_model
-from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 
-import shutil
-import tempfile
-
+from core.models import Task
+from core.testing import EmptyMediaMixin
 from posts.models import Group, Post
 from posts.forms import PostForm
 
 User = get_user_model()
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
-class PostFormTests(TestCase):
+class PostFormTests(EmptyMediaMixin, TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.group = Group.objects.create(
             title='Тестовая группа',
@@ -31,11 +26,6 @@ class PostFormTests(TestCase):
         )
         cls.form = PostForm()
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def setUp(self):
         self.user = User.objects.create_user(username='HasNoName')
         self.client = Client()
@@ -81,3 +71,6 @@ class PostFormTests(TestCase):
                 image='posts/small.gif'
             ).exists()
         )
+        self.assertTrue(
+            Task.objects.filter(name='posts.tasks.make_thumbnails').exists()
+        )
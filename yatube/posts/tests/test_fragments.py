@@ -0,0 +1,92 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Follow, Group, Post
+
+User = get_user_model()
+
+POST_TEXT = re.compile(r'<p>(Пост \d+)</p>')
+
+
+class FeedFragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        for number in range(25):
+            Post.objects.create(
+                author=cls.author, text=f'Пост {number}',
+                group=cls.group if number % 2 else None,
+            )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url):
+        """Проходит ленту по курсорам; возвращает тексты постов."""
+        texts = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, '<html')
+            texts.extend(POST_TEXT.findall(response.content.decode()))
+            cursor = response['X-Next-Cursor']
+            url = response.context['next_url']
+            self.assertEqual(bool(cursor), bool(url))
+        return texts
+
+    def test_fragments_continue_the_first_page(self):
+        """Порции продолжают первую страницу без пропусков и повторов."""
+        response = self.client.get(reverse('posts:index'))
+        first_page = [post.text for post in response.context['page_obj']]
+        texts = self.walk(response.context['fragment_url'])
+        expected = [f'Пост {number}' for number in range(24, -1, -1)]
+        self.assertEqual(first_page + texts, expected)
+
+    def test_equal_dates_are_ordered_by_id(self):
+        """Посты с одинаковой датой не теряются между порциями."""
+        Post.objects.update(pub_date=timezone.now())
+        texts = self.walk(reverse('posts:index_fragment'))
+        self.assertEqual(len(texts), 25)
+        self.assertEqual(len(set(texts)), 25)
+
+    def test_feed_specific_fragments(self):
+        """Порции группы, профиля и подписок содержат только свои посты."""
+        feeds = {
+            reverse('posts:group_fragment', args=(self.group.slug,)): 12,
+            reverse('posts:profile_fragment',
+                    args=(self.author.username,)): 25,
+            reverse('posts:follow_fragment'): 25,
+        }
+        self.client.force_login(self.reader)
+        for url, count in feeds.items():
+            with self.subTest(url=url):
+                self.assertEqual(len(self.walk(url)), count)
+
+    def test_follow_fragment_requires_login(self):
+        """Порции ленты подписок доступны только вошедшим."""
+        response = self.client.get(reverse('posts:follow_fragment'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_bad_cursor(self):
+        """Испорченный курсор даёт 400, а не ошибку сервера."""
+        url = reverse('posts:index_fragment')
+        for cursor in ('abc', '1-2-3', '99999999999999999999-1',
+                       '1-99999999999999999999999'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'after': cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_last_page_has_no_fragment_url(self):
+        """На последней странице нечего подгружать."""
+        response = self.client.get(reverse('posts:index'), {'page': 3})
+        self.assertIsNone(response.context['fragment_url'])
+        self.assertNotContains(response, 'data-feed-more')
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Первая группа', slug='first', description='Описание'
+        )
+        cls.other = Group.objects.create(
+            title='Вторая группа', slug='second', description='Описание'
+        )
+
+    def stats(self, group):
+        return GroupStats.objects.get(group=group)
+
+    def test_new_group_gets_empty_stats(self):
+        """У новой группы сразу есть пустая статистика."""
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_post)
+
+    def test_new_post_updates_stats(self):
+        """Новый пост увеличивает счётчик и становится последним."""
+        Post.objects.create(author=self.user, group=self.group, text='1')
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='2'
+        )
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.last_post, post)
+        self.assertEqual(stats.last_post_date, post.pub_date)
+
+    def test_moving_post_updates_both_groups(self):
+        """Перенос поста в другую группу пересчитывает обе группы."""
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='Пост'
+        )
+        post.group = self.other
+        post.save()
+        self.assertEqual(self.stats(self.group).post_count, 0)
+        self.assertEqual(self.stats(self.other).post_count, 1)
+
+    def test_deleted_post_updates_stats(self):
+        """Удаление поста пересчитывает статистику группы."""
+        first = Post.objects.create(
+            author=self.user, group=self.group, text='1'
+        )
+        second = Post.objects.create(
+            author=self.user, group=self.group, text='2'
+        )
+        second.delete()
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 1)
+        self.assertEqual(stats.last_post, first)
+
+
+class GroupIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.quiet = Group.objects.create(
+            title='А тихая', slug='quiet', description='Описание'
+        )
+        cls.busy = Group.objects.create(
+            title='Б активная', slug='busy', description='Описание'
+        )
+        Post.objects.create(author=cls.user, group=cls.quiet, text='Старый')
+        for i in range(3):
+            Post.objects.create(
+                author=cls.user, group=cls.busy, text=f'Новый {i}'
+            )
+
+    def test_group_index_reads_aggregates(self):
+        """Каталог групп строится без подсчёта постов на лету."""
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('posts:group_index'))
+        self.assertTemplateUsed(response, 'posts/groups.html')
+        groups = list(response.context['page_obj'])
+        self.assertEqual(groups, [self.busy, self.quiet])
+        self.assertContains(response, 'Новый 2')
+
+    def test_group_index_sorting(self):
+        """Каталог групп сортируется по названию и числу постов."""
+        response = self.client.get(
+            reverse('posts:group_index'), {'sort': 'title'}
+        )
+        self.assertEqual(
+            list(response.context['page_obj']), [self.quiet, self.busy]
+        )
+        response = self.client.get(
+            reverse('posts:group_index'), {'sort': 'posts'}
+        )
+        self.assertEqual(
+            list(response.context['page_obj']), [self.busy, self.quiet]
+        )
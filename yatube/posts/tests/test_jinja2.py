@@ -0,0 +1,92 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+LINK = re.compile(r'href=["\']([^"\']*)["\']')
+FEED_VIEWS = [
+    'posts:index',
+    'posts:follow_index',
+    'posts:trending',
+    'posts:group_index',
+    'posts:group_list',
+    'posts:group_month',
+    'posts:profile',
+    'posts:profile_month',
+    'posts:post_detail',
+    'posts:post_create',
+    'posts:post_edit',
+]
+
+
+class Jinja2TemplatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        for number in range(12):
+            cls.post = Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост\n{number}'
+            )
+        Comment.objects.create(post=cls.post, author=cls.user, text='Ответ')
+        cls.urls = [
+            reverse('posts:index'),
+            reverse('posts:follow_index'),
+            reverse('posts:trending'),
+            reverse('posts:group_index'),
+            reverse('posts:group_list', args=(cls.group.slug,)),
+            reverse('posts:group_month', args=(
+                cls.group.slug, cls.post.pub_date.year,
+                cls.post.pub_date.month,
+            )),
+            reverse('posts:profile', args=(cls.user.username,)),
+            reverse('posts:profile_month', args=(
+                cls.user.username, cls.post.pub_date.year,
+                cls.post.pub_date.month,
+            )),
+            reverse('posts:post_detail', args=(cls.post.pk,)),
+            reverse('posts:post_create'),
+            reverse('posts:post_edit', args=(cls.post.pk,)),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def links(self, url):
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sorted(LINK.findall(response.content.decode()))
+
+    def test_pages_have_same_links(self):
+        """Страницы Jinja2 содержат те же ссылки, что и шаблоны Django."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                expected = self.links(url)
+                with override_settings(JINJA2_VIEWS=FEED_VIEWS):
+                    self.assertEqual(self.links(url), expected)
+
+    @override_settings(JINJA2_VIEWS=FEED_VIEWS)
+    def test_feed_rendered_by_jinja2(self):
+        """Лента из Jinja2 экранирует текст и переносит строки."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.templates, [])
+        self.assertContains(response, 'Пост<br>11')
+
+    @override_settings(JINJA2_VIEWS=FEED_VIEWS)
+    def test_form_fields_get_css_class(self):
+        """Фильтр addclass работает в шаблонах Jinja2."""
+        response = self.client.get(reverse('posts:post_create'))
+        self.assertContains(response, 'class="form-control"', count=3)
+        self.assertContains(response, 'csrfmiddlewaretoken')
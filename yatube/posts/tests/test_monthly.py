@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import archive, deletion, monthly
+from posts.models import Group, MonthlyCount, Post
+
+User = get_user_model()
+
+
+class MonthlyCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.other = Group.objects.create(title='Другая', slug='other')
+        self.dates = {
+            'Январь': datetime(2021, 1, 15),
+            'Март 1': datetime(2021, 3, 1),
+            'Март 2': datetime(2021, 3, 31, 23),
+        }
+        for text, pub_date in self.dates.items():
+            self.make_post(text, pub_date)
+
+    def make_post(self, text, pub_date, **kwargs):
+        kwargs.setdefault('group', self.group)
+        post = Post.objects.create(author=self.author, text=text, **kwargs)
+        post.pub_date = timezone.make_aware(pub_date)
+        post.save()
+        return post
+
+    def counts(self, **owner):
+        return list(
+            MonthlyCount.objects.filter(**owner)
+            .order_by('year', 'month')
+            .values_list('year', 'month', 'count')
+        )
+
+    def test_counts_follow_posts(self):
+        """Сводка меняется при создании, переносе в другую группу
+        и удалении поста."""
+        expected = [(2021, 1, 1), (2021, 3, 2)]
+        self.assertEqual(self.counts(author=self.author), expected)
+        self.assertEqual(self.counts(group=self.group), expected)
+        post = Post.objects.get(text='Январь')
+        post.group = self.other
+        post.save()
+        self.assertEqual(self.counts(group=self.group), [(2021, 3, 2)])
+        self.assertEqual(self.counts(group=self.other), [(2021, 1, 1)])
+        deletion.delete_post(post)
+        self.assertEqual(self.counts(author=self.author), [(2021, 3, 2)])
+        self.assertEqual(self.counts(group=self.other), [])
+
+    def test_rebuild_matches_incremental(self):
+        """Полный пересчёт даёт ту же сводку, архив в ней учитывается."""
+        expected = self.counts()
+        archive.archive_posts(timezone.make_aware(datetime(2021, 2, 1)))
+        MonthlyCount.objects.all().delete()
+        monthly.rebuild()
+        self.assertEqual(sorted(self.counts()), sorted(expected))
+
+    def test_sidebar_is_one_query(self):
+        """Панель месяцев строится одним запросом."""
+        with self.assertNumQueries(1):
+            months = monthly.navigation(
+                'posts:profile_month', 'author', author=self.author
+            )
+        self.assertEqual(
+            [item['url'] for item in months],
+            [reverse('posts:profile_month', args=('author', 2021, 3)),
+             reverse('posts:profile_month', args=('author', 2021, 1))],
+        )
+
+    def test_month_pages(self):
+        """Страницы месяца показывают только посты этого месяца."""
+        pages = (
+            reverse('posts:profile_month', args=('author', 2021, 3)),
+            reverse('posts:group_month', args=('group', 2021, 3)),
+        )
+        for url in pages:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(
+                    [post.text for post in response.context['page_obj']],
+                    ['Март 2', 'Март 1'],
+                )
+                self.assertEqual(len(response.context['months']), 2)
+        response = self.client.get(reverse('posts:profile', args=('author',)))
+        self.assertContains(
+            response, reverse('posts:profile_month', args=('author', 2021, 1))
+        )
+        for year, month in ((2021, 13), (99999999999, 1), (1, 1), (9999, 12)):
+            with self.subTest(year=year, month=month):
+                response = self.client.get(reverse(
+                    'posts:profile_month', args=('author', year, month)
+                ))
+                self.assertEqual(response.status_code, 404)
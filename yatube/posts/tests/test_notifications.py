@@ -0,0 +1,104 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import worker
+from core.models import Task
+from posts import notifications
+from posts.models import Follow, Notification, Post
+
+User = get_user_model()
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.followers = [
+            User.objects.create_user(
+                username=f'follower{i}', email=f'follower{i}@yatube.ru'
+            )
+            for i in range(5)
+        ]
+        cls.silent = User.objects.create_user(username='silent')
+        for user in cls.followers + [cls.silent]:
+            Follow.objects.create(user=user, author=cls.author)
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def later(self):
+        return timezone.now() + timedelta(
+            seconds=notifications.DIGEST_WINDOW + 1
+        )
+
+    def test_post_create_only_enqueues(self):
+        """Создание поста не отправляет писем, а ставит задачу."""
+        self.author_client.post(
+            reverse('posts:post_create'), data={'text': 'Новый пост'}
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertTrue(
+            Task.objects.filter(name='posts.tasks.notify_followers').exists()
+        )
+
+    def test_fan_out_in_chunks(self):
+        """Подписки читаются кусками, подписчики без почты пропускаются."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        with mock.patch.object(notifications, 'FOLLOW_CHUNK', 2):
+            created = notifications.fan_out(post.pk)
+        self.assertEqual(created, len(self.followers))
+        self.assertFalse(
+            Notification.objects.filter(user=self.silent).exists()
+        )
+
+    def test_fan_out_retry_does_not_duplicate(self):
+        """Повтор задачи после сбоя не дублирует уведомления."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        notifications.fan_out(post.pk)
+        notifications.fan_out(post.pk)
+        self.assertEqual(
+            Notification.objects.filter(post=post).count(),
+            len(self.followers),
+        )
+
+    def test_digest_groups_posts_per_user(self):
+        """Каждый подписчик получает одно письмо со всеми постами."""
+        for text in ('Первый пост', 'Второй пост'):
+            post = Post.objects.create(author=self.author, text=text)
+            notifications.fan_out(post.pk)
+        stats = notifications.deliver_digests(now=self.later())
+        self.assertEqual(stats['emails'], len(self.followers))
+        self.assertEqual(stats['notifications'], 2 * len(self.followers))
+        self.assertEqual(len(mail.outbox), len(self.followers))
+        self.assertIn('Первый пост', mail.outbox[0].body)
+        self.assertIn('Второй пост', mail.outbox[0].body)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_digest_waits_for_window(self):
+        """Свежие уведомления копятся до конца окна."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        notifications.fan_out(post.pk)
+        stats = notifications.deliver_digests()
+        self.assertEqual(stats['emails'], 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_worker_sends_scheduled_digests(self):
+        """Воркер раскладывает уведомления и позже отправляет дайджест."""
+        self.author_client.post(
+            reverse('posts:post_create'), data={'text': 'Новый пост'}
+        )
+        worker.run_pending()
+        self.assertEqual(len(mail.outbox), 0)
+        Task.objects.update(run_at=timezone.now())
+        moment = self.later()
+        with mock.patch('django.utils.timezone.now', return_value=moment):
+            worker.run_pending()
+        self.assertEqual(len(mail.outbox), len(self.followers))
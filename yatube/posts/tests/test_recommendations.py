@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import recommendations
+from posts.models import Follow, Suggestion
+
+User = get_user_model()
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = {
+            name: User.objects.create_user(username=name)
+            for name in ('anna', 'boris', 'clara', 'denis', 'elena')
+        }
+        for user, author in (
+            ('anna', 'boris'), ('anna', 'denis'),
+            ('boris', 'clara'), ('denis', 'clara'), ('denis', 'elena'),
+            ('denis', 'anna'), ('clara', 'boris'),
+        ):
+            Follow.objects.create(
+                user=cls.users[user], author=cls.users[author]
+            )
+
+    def suggested(self, name):
+        return [
+            (suggestion.author.username, suggestion.score)
+            for suggestion in Suggestion.objects.filter(
+                user=self.users[name]
+            )
+        ]
+
+    def test_friends_of_friends(self):
+        """Кандидаты ранжируются по числу общих подписок."""
+        recommendations.rebuild()
+        self.assertEqual(
+            self.suggested('anna'), [('clara', 2.0), ('elena', 1.0)]
+        )
+
+    def test_followed_and_self_are_excluded(self):
+        """Не предлагаются уже отслеживаемые авторы и сам пользователь."""
+        recommendations.rebuild()
+        self.assertEqual(self.suggested('denis'), [('boris', 2.0)])
+        self.assertEqual(self.suggested('clara'), [])
+
+    def test_load_graph_reads_edges_once(self):
+        """Граф строится одним чтением подписок, без отдельного COUNT."""
+        with self.assertNumQueries(1):
+            matrix, ids = recommendations.load_graph()
+        self.assertEqual(matrix.nnz, Follow.objects.count())
+        self.assertEqual(len(ids), len(self.users))
+
+    def test_self_follow_is_ignored(self):
+        """Подписка на себя не попадает в граф и не даёт рекомендаций."""
+        Follow.objects.create(
+            user=self.users['elena'], author=self.users['elena']
+        )
+        matrix, ids = recommendations.load_graph()
+        self.assertEqual(matrix.nnz, Follow.objects.count() - 1)
+        self.assertEqual(matrix.diagonal().sum(), 0)
+        recommendations.rebuild()
+        self.assertEqual(
+            self.suggested('anna'), [('clara', 2.0), ('elena', 1.0)]
+        )
+
+    def test_rebuild_in_small_batches(self):
+        """Расчёт пачками даёт тот же результат."""
+        recommendations.rebuild(k=1, batch=2)
+        self.assertEqual(self.suggested('anna'), [('clara', 2.0)])
+        self.assertEqual(Suggestion.objects.count(), 2)
+
+    def test_profile_sidebar(self):
+        """Профиль показывает рекомендации одним запросом."""
+        recommendations.rebuild()
+        client = Client()
+        client.force_login(self.users['anna'])
+        response = client.get(
+            reverse('posts:profile', args=['boris'])
+        )
+        self.assertEqual(
+            [item.author for item in response.context['suggestions']],
+            [self.users['clara'], self.users['elena']],
+        )
+        self.assertContains(response, 'На кого подписаться')
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import archive, stats
+from posts.models import (ActivityStats, Comment, Follow, Group, Post,
+                          StatsWatermark)
+
+User = get_user_model()
+
+
+def rollup():
+    """Сводка на момент, когда все текущие строки старше LAG."""
+    return stats.rollup(now=timezone.now() + stats.LAG)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        self.post = Post.objects.create(
+            author=self.author, group=self.group, text='Пост'
+        )
+        Post.objects.create(author=self.author, text='Без группы')
+        Comment.objects.create(post=self.post, author=self.author, text='!')
+
+    def today(self, group=None):
+        return stats.series(ActivityStats.DAY, 1, group)[0]
+
+    def test_counts_by_group(self):
+        """Сводка считает весь сайт и каждую группу отдельно."""
+        rollup()
+        self.assertEqual(
+            {key: value for key, value in self.today().items()
+             if key != 'start'},
+            {'posts': 2, 'comments': 1, 'follows': 0, 'users': 1},
+        )
+        self.assertEqual(self.today(self.group)['posts'], 1)
+        self.assertEqual(self.today(self.group)['comments'], 1)
+        self.assertEqual(
+            stats.series(ActivityStats.HOUR, 1)[0]['posts'], 2
+        )
+
+    def test_incremental(self):
+        """Повторный запуск читает только строки после отметки."""
+        self.assertEqual(rollup()['posts'], 2)
+        self.assertEqual(sum(rollup().values()), 0)
+        reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=reader, author=self.author)
+        Post.objects.create(author=reader, group=self.group, text='Ещё')
+        processed = rollup()
+        self.assertEqual(processed['posts'], 1)
+        self.assertEqual(processed['users'], 1)
+        self.assertEqual(self.today()['posts'], 3)
+        self.assertEqual(self.today()['follows'], 1)
+        self.assertEqual(self.today(self.group)['posts'], 2)
+        self.assertEqual(
+            StatsWatermark.objects.get(source='posts').last_id,
+            Post.objects.latest('pk').pk,
+        )
+
+    def test_archive_counted_once(self):
+        """Архивные посты учитываются при первом запуске и только раз."""
+        old = timezone.now() - timedelta(days=400)
+        Post.objects.filter(pk=self.post.pk).update(pub_date=old)
+        archive.archive_posts()
+        rollup()
+        rollup()
+        day = stats.series(ActivityStats.DAY, 1, now=old)[0]
+        self.assertEqual(day['posts'], 1)
+        self.assertEqual(self.today()['posts'], 1)
+
+    def test_fresh_rows_wait_for_lag(self):
+        """Отметка не проходит строки моложе LAG, даже если за ними
+        есть старые: строка с меньшим id может быть ещё не видна."""
+        first, second = Post.objects.order_by('pk')
+        Post.objects.filter(pk=second.pk).update(
+            pub_date=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(stats.rollup()['posts'], 0)
+        self.assertEqual(StatsWatermark.objects.get(source='posts').last_id, 0)
+        self.assertEqual(rollup()['posts'], 2)
+
+    def test_site_buckets_unique(self):
+        """Строка периода всего сайта одна, хотя group пусто."""
+        start = stats.period_start(timezone.now(), ActivityStats.DAY)
+        ActivityStats.objects.create(period=ActivityStats.DAY, start=start)
+        with self.assertRaises(IntegrityError):
+            ActivityStats.objects.create(
+                period=ActivityStats.DAY, start=start
+            )
+
+    @mock.patch('posts.stats.LAG', timedelta(0))
+    def test_command(self):
+        """Команда rollup_stats сообщает, сколько строк учтено."""
+        out = StringIO()
+        call_command('rollup_stats', stdout=out)
+        self.assertIn('posts 2', out.getvalue())
+
+
+class StatsViewsTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', is_staff=True)
+        self.group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.create(author=self.staff, group=self.group, text='Пост')
+        rollup()
+
+    def test_staff_only(self):
+        """Статистику видят только сотрудники."""
+        self.client.force_login(User.objects.create_user(username='user'))
+        for name in ('posts:stats', 'posts:stats_data'):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 302)
+
+    def test_reads_rollups_only(self):
+        """Панель и JSON не обращаются к таблицам постов."""
+        self.client.force_login(self.staff)
+        for name in ('posts:stats', 'posts:stats_data'):
+            with self.subTest(name=name):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse([
+                    query['sql'] for query in queries
+                    if 'posts_post' in query['sql']
+                    or 'posts_comment' in query['sql']
+                ])
+
+    def test_json(self):
+        """JSON отдаёт ряд за выбранный период и группу."""
+        self.client.force_login(self.staff)
+        url = reverse('posts:stats_data')
+        data = self.client.get(
+            url, {'period': 'hour', 'span': 3, 'group': 'group'}
+        ).json()
+        self.assertEqual(data['group'], 'group')
+        self.assertEqual(len(data['series']), 3)
+        self.assertEqual(data['series'][-1]['posts'], 1)
+        for params in ({'period': 'week'}, {'span': 'x'}, {'span': 10 ** 6}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
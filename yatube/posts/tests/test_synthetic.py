@@ -0,0 +1,77 @@
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.testing import EmptyMediaMixin
+from posts import synthetic
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class DatasetTests(EmptyMediaMixin, TestCase):
+    def generate(self, **options):
+        options = {
+            'users': 100, 'groups': 5, 'posts': 500, 'comments': 500,
+            'seed': 7, 'now': timezone.now().replace(microsecond=0),
+            'batch_size': 300, **options,
+        }
+        return dict(synthetic.Dataset(**options).generate())
+
+    def test_counts_and_shape(self):
+        """Данные заданного объёма со степенными хвостами."""
+        rows = self.generate()
+        self.assertEqual(rows['users'], User.objects.count())
+        self.assertEqual(Post.objects.count(), 500)
+        self.assertEqual(Comment.objects.count(), 500)
+        self.assertEqual(rows['follows'], Follow.objects.count())
+        followers = sorted(Counter(
+            Follow.objects.values_list('author_id', flat=True)
+        ).values())
+        self.assertGreater(followers[-1], 5 * followers[len(followers) // 2])
+        groups = Group.objects.order_by('pk')
+        sizes = [group.posts.count() for group in groups]
+        self.assertGreater(sizes[0], 3 * sizes[-1])
+        self.assertEqual(groups[0].stats.post_count, sizes[0])
+        images = set(
+            Post.objects.exclude(image='').values_list('image', flat=True)
+        )
+        self.assertLessEqual(len(images), synthetic.IMAGE_POOL)
+        self.assertTrue(all(default_storage.exists(name) for name in images))
+        self.assertFalse(Post.objects.filter(pub_date__gt=timezone.now()))
+
+    def test_deterministic(self):
+        """Одинаковый seed на пустой базе даёт одинаковые данные, даже
+        если картинки остались от первого запуска."""
+        now = timezone.now().replace(microsecond=0)
+
+        def snapshot():
+            return list(Post.objects.order_by('pk').values_list(
+                'author__username', 'group__slug', 'text', 'pub_date',
+                'image'
+            ))
+
+        self.generate(now=now)
+        first = snapshot()
+        for model in (Comment, Follow, Post, Group, User):
+            model.objects.all().delete()
+        self.generate(now=now)
+        self.assertEqual(snapshot(), first)
+
+    def test_dates_stay_automatic(self):
+        """После генерации auto_now_add снова проставляет дату сам."""
+        self.generate(users=3, posts=5, comments=5)
+        post = Post.objects.create(author=User.objects.first(), text='Новый')
+        self.assertGreater(post.pub_date, timezone.now().replace(year=2000))
+
+    def test_command(self):
+        """Команда seed_data пишет объём по шагам."""
+        out = StringIO()
+        call_command('seed_data', scale=0.01, seed=1, stdout=out)
+        self.assertIn('posts: 200', out.getvalue())
+        self.assertEqual(User.objects.count(), 10)
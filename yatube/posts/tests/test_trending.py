@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Comment, Post, TrendingScore
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.old_hit = Post.objects.create(author=cls.user, text='Старый')
+        cls.new_hit = Post.objects.create(author=cls.user, text='Новый')
+
+    def test_comment_increments_score(self):
+        """Новый комментарий увеличивает рейтинг поста."""
+        Comment.objects.create(post=self.new_hit, author=self.user, text='1')
+        Comment.objects.create(post=self.new_hit, author=self.user, text='2')
+        score = TrendingScore.objects.get(post=self.new_hit)
+        self.assertAlmostEqual(
+            trending.decay(score.score, timezone.now()), 2.0, places=2
+        )
+
+    def test_score_decays(self):
+        """Старые комментарии весят меньше свежих."""
+        now = timezone.now()
+        past = now - timedelta(seconds=trending.HALF_LIFE * 3)
+        for _ in range(4):
+            trending.register_comment(self.old_hit.pk, past)
+        for _ in range(2):
+            trending.register_comment(self.new_hit.pk, now)
+        self.assertEqual(
+            trending.top_posts(), [self.new_hit, self.old_hit]
+        )
+
+    def test_order_is_exact_without_compaction(self):
+        """Порядок по хранимому рейтингу совпадает с затухшими счётчиками,
+        даже если у поста давно не было комментариев."""
+        now = timezone.now()
+        past = now - timedelta(seconds=trending.HALF_LIFE * 2)
+        for _ in range(3):
+            trending.register_comment(self.old_hit.pk, past)
+        trending.register_comment(self.new_hit.pk, now)
+        self.assertEqual(
+            trending.top_posts(limit=1), [self.new_hit]
+        )
+
+    def test_compact_drops_cold_scores(self):
+        """Компактизация удаляет остывшие счётчики."""
+        now = timezone.now()
+        trending.register_comment(
+            self.old_hit.pk, now - timedelta(seconds=trending.HALF_LIFE * 10)
+        )
+        trending.register_comment(self.new_hit.pk, now)
+        self.assertEqual(trending.compact(now=now), 1)
+        score = TrendingScore.objects.get()
+        self.assertEqual(score.post, self.new_hit)
+
+    def test_trending_page(self):
+        """Страница популярного показывает обсуждаемые посты."""
+        Comment.objects.create(post=self.old_hit, author=self.user, text='1')
+        response = self.client.get(reverse('posts:trending'))
+        self.assertTemplateUsed(response, 'posts/trending.html')
+        self.assertEqual(list(response.context['page_obj']), [self.old_hit])
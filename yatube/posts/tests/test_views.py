@@ -1,25 +1,19 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 from django.core.cache import cache
 
-import shutil
-import tempfile
-
+from core.testing import EmptyMediaMixin
 from posts.models import Group, Post, Follow
 
 User = get_user_model()
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
-class PostTests(TestCase):
+class PostTests(EmptyMediaMixin, TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_name1')
         cls.group = Group.objects.create(
             title='Заголовок',
@@ -42,11 +36,6 @@ class PostTests(TestCase):
             reverse('posts:post_create'): 'posts/create_post.html',
         }
 
-    @classmethod
-    def tearDownClass(cls):
-        super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-
     def setUp(self):
         self.guest_client = Client()
         self.user = User.objects.create_user(username='Solid')
@@ -140,8 +129,7 @@ class PostTests(TestCase):
 
 class PaginatorViewsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.author = User.objects.create_user(username='test_name')
         cls.group = Group.objects.create(
             title=('Заголовок для тестовой группы'),
@@ -229,8 +217,7 @@ class PaginatorViewsTest(TestCase):
 
 class FollowTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.author = User.objects.create_user(username='test_name1')
         cls.group = Group.objects.create(
             title='Заголовок',
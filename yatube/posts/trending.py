@@ -0,0 +1,64 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TrendingScore
+
+HALF_LIFE: int = 6 * 60 * 60
+TRENDING_SIZE: int = 30
+MIN_SCORE: float = 0.05
+EPOCH: datetime = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def anchor(moment):
+    """Вес комментария в момент moment: log2 от 2 ** (t / HALF_LIFE).
+
+    Рейтинг хранится как log2 суммы весов всех комментариев поста.
+    Вес растёт со временем ровно так, как затухают старые комментарии,
+    поэтому порядок хранимых рейтингов совпадает с порядком затухших
+    счётчиков в любой момент и ORDER BY score точен без пересчёта.
+    """
+    return (moment - EPOCH).total_seconds() / HALF_LIFE
+
+
+def decay(score, now):
+    """Затухший счётчик поста: вес комментария падает вдвое за HALF_LIFE."""
+    return 2 ** (score - anchor(now))
+
+
+def register_comment(post_id, now=None):
+    """Добавляет комментарий к затухающему счётчику поста."""
+    now = now or timezone.now()
+    weight = anchor(now)
+    with transaction.atomic():
+        row, created = (
+            TrendingScore.objects.select_for_update()
+            .get_or_create(post_id=post_id,
+                           defaults={'score': weight, 'updated': now})
+        )
+        if not created:
+            # log2(2 ** score + 2 ** weight) без переполнения.
+            high, low = max(row.score, weight), min(row.score, weight)
+            row.score = high + math.log2(1 + 2 ** (low - high))
+            row.updated = now
+            row.save(update_fields=('score', 'updated'))
+
+
+def compact(now=None):
+    """Удаляет остывшие счётчики; возвращает число удалённых."""
+    now = now or timezone.now()
+    threshold = math.log2(MIN_SCORE) + anchor(now)
+    removed, _ = TrendingScore.objects.filter(score__lt=threshold).delete()
+    return removed
+
+
+def top_posts(limit=TRENDING_SIZE):
+    """Самые обсуждаемые посты по индексу рейтинга."""
+    rows = (
+        TrendingScore.objects.select_related('post__author', 'post__group')
+        .filter(post__is_deleted=False)
+        .order_by('-score')[:limit]
+    )
+    return [row.post for row in rows]
@@ -7,14 +7,32 @@ app_name = 'posts'
 urlpatterns = [
     path('', views.index, name='index'),
     path("follow/", views.follow_index, name="follow_index"),
+    path("trending/", views.trending_index, name="trending"),
     path("profile/<str:username>/follow/", views.profile_follow,
          name="profile_follow"),
     path("profile/<str:username>/unfollow/", views.profile_unfollow,
          name="profile_unfollow"),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('posts/<int:post_id>/delete/', views.post_delete,
+         name='post_delete'),
+    path('groups/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path('group/<slug:slug>/<int:year>/<int:month>/', views.group_month,
+         name='group_month'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('profile/<str:username>/<int:year>/<int:month>/',
+         views.profile_month, name='profile_month'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
-    path('posts/<int:post_id>/comment/', views.add_comment, name='add_comment')
+    path('fragments/index/', views.index_fragment, name='index_fragment'),
+    path('fragments/follow/', views.follow_fragment,
+         name='follow_fragment'),
+    path('fragments/group/<slug:slug>/', views.group_fragment,
+         name='group_fragment'),
+    path('fragments/profile/<str:username>/', views.profile_fragment,
+         name='profile_fragment'),
+    path('posts/<int:post_id>/comment/', views.add_comment,
+         name='add_comment'),
+    path('stats/', views.stats_dashboard, name='stats'),
+    path('stats/data/', views.stats_data, name='stats_data'),
 ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.paginator import Paginator
 
 NUM_REC: int = 10
@@ -8,3 +9,11 @@ def paginator_project(request, name):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+def template_engine(request):
+    """Движок шаблонов страницы: jinja2 для маршрутов из JINJA2_VIEWS."""
+    match = request.resolver_match
+    if match is not None and match.view_name in settings.JINJA2_VIEWS:
+        return 'jinja2'
+    return None
@@ -1,60 +1,180 @@
+from django.db.models import F
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_POST
 from django.shortcuts import redirect
 from django.urls import reverse
 
-
-from .models import Group, Post, User, Follow
+from core.proxy import add_surrogate_keys, cache_anonymous, cache_policy
+from core.ratelimit import ratelimit
+from . import archive, deletion, entities, feeds, monthly, stats, trending
+from .models import (ActivityStats, ArchivedPost, Group, Post, Follow,
+                     StatsWatermark, Suggestion)
 from .forms import PostForm, CommentForm
-from .utils import paginator_project
+from .tasks import make_thumbnails, notify_followers
+from .utils import paginator_project, template_engine
+
+GROUP_SORTS: dict = {
+    'activity': (F('stats__last_post_date').desc(nulls_last=True), 'title'),
+    'posts': (F('stats__post_count').desc(nulls_last=True), 'title'),
+    'title': ('title',),
+}
+SUGGESTIONS_SHOWN: int = 5
+# Сколько секунд обратный прокси хранит анонимные страницы; их всё
+# равно сбрасывает purge_proxy при изменении постов и комментариев.
+FEED_MAX_AGE: int = 60
+PAGE_MAX_AGE: int = 300
+# Частота запросов на запись для одного пользователя (core.ratelimit).
+POST_RATE: str = '10/m'
+COMMENT_RATE: str = '20/m'
+FOLLOW_RATE: str = '30/m'
+# Сколько часов или суток отдаёт JSON статистики за один запрос.
+STATS_MAX_SPAN: int = 24 * 31
 
 
-@cache_page(20, key_prefix='index_page')
+@cache_policy(FEED_MAX_AGE, keys=('feed',))
+@cache_anonymous(20, key_prefix='index_page')
 def index(request):
     post_list = Post.objects.select_related('author').all()
     page_obj = paginator_project(request, post_list)
-    context = {'page_obj': page_obj}
-    return render(request, 'posts/index.html', context)
+    context = {
+        'page_obj': page_obj,
+        'fragment_url': feeds.fragment_url(
+            page_obj, reverse('posts:index_fragment')
+        ),
+    }
+    return render(request, 'posts/index.html', context,
+                  using=template_engine(request))
 
 
+@cache_policy(FEED_MAX_AGE)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    group = entities.groups.get_or_404(slug)
+    add_surrogate_keys(request, f'group-{group.pk}')
+    posts = archive.group_feed(group)
     page_obj = paginator_project(request, posts)
-    context = {'group': group, 'posts': posts, 'page_obj': page_obj}
-    return render(request, 'posts/group_list.html', context)
+    context = {
+        'group': group,
+        'posts': posts,
+        'page_obj': page_obj,
+        'months': monthly.navigation('posts:group_month', slug, group=group),
+        'fragment_url': feeds.fragment_url(
+            page_obj, reverse('posts:group_fragment', args=(slug,))
+        ),
+    }
+    return render(request, 'posts/group_list.html', context,
+                  using=template_engine(request))
+
+
+@cache_policy(PAGE_MAX_AGE, keys=('groups',))
+def group_index(request):
+    sort = request.GET.get('sort')
+    if sort not in GROUP_SORTS:
+        sort = 'activity'
+    groups = Group.objects.select_related(
+        'stats__last_post'
+    ).order_by(*GROUP_SORTS[sort])
+    page_obj = paginator_project(request, groups)
+    context = {
+        'page_obj': page_obj,
+        'sort': sort,
+        'page_query': f'&sort={sort}',
+    }
+    return render(request, 'posts/groups.html', context,
+                  using=template_engine(request))
 
 
+@cache_policy(FEED_MAX_AGE)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author_id=author)
-    page_obj = paginator_project(request, posts)
+    author = entities.users.get_or_404(username)
+    add_surrogate_keys(request, f'author-{author.pk}')
+    page_obj = paginator_project(request, archive.author_feed(author.pk))
     following = request.user.is_authenticated and Follow.objects.filter(
         user=request.user, author=author
     ).exists()
     profile = author
+    suggestions = []
+    if request.user.is_authenticated:
+        suggestions = Suggestion.objects.filter(
+            user=request.user
+        ).select_related('author')[:SUGGESTIONS_SHOWN]
     context = {
         'page_obj': page_obj,
         'author': author,
         'following': following,
-        'profile': profile
+        'profile': profile,
+        'suggestions': suggestions,
+        'months': monthly.navigation(
+            'posts:profile_month', username, author=author
+        ),
+        'fragment_url': feeds.fragment_url(
+            page_obj, reverse('posts:profile_fragment', args=(username,))
+        ),
     }
-    return render(request, 'posts/profile.html', context)
+    return render(request, 'posts/profile.html', context,
+                  using=template_engine(request))
+
+
+def month_page(request, posts, year, month, context):
+    """Посты ленты за месяц с боковой панелью месяцев."""
+    try:
+        start, end = monthly.month_range(year, month)
+    except ValueError:
+        raise Http404('Нет такого месяца')
+    context.update({
+        'month': start,
+        'page_obj': paginator_project(
+            request, posts.filter(pub_date__gte=start, pub_date__lt=end)
+        ),
+    })
+    return render(request, 'posts/month.html', context,
+                  using=template_engine(request))
+
+
+@cache_policy(FEED_MAX_AGE)
+def group_month(request, slug, year, month):
+    group = entities.groups.get_or_404(slug)
+    add_surrogate_keys(request, f'group-{group.pk}')
+    return month_page(request, archive.group_feed(group), year, month, {
+        'group': group,
+        'months': monthly.navigation('posts:group_month', slug, group=group),
+    })
+
+
+@cache_policy(FEED_MAX_AGE)
+def profile_month(request, username, year, month):
+    author = entities.users.get_or_404(username)
+    add_surrogate_keys(request, f'author-{author.pk}')
+    return month_page(
+        request, archive.author_feed(author.pk), year, month, {
+            'author': author,
+            'months': monthly.navigation(
+                'posts:profile_month', username, author=author
+            ),
+        }
+    )
 
 
+@cache_policy(PAGE_MAX_AGE)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    comments = post.comments.all()
+    post = archive.get_post_or_404(post_id)
+    add_surrogate_keys(request, f'post-{post.pk}')
+    comments = post.comments.select_related('author')
     context = {
         'post': post,
         'comments': comments,
         'form': CommentForm(),
+        'archived': isinstance(post, ArchivedPost),
+        'author_total': archive.author_feed(post.author_id).count(),
     }
-    return render(request, 'posts/post_detail.html', context)
+    return render(request, 'posts/post_detail.html', context,
+                  using=template_engine(request))
 
 
 @login_required
+@ratelimit(POST_RATE, scope='posts.write')
 def post_create(request):
     if request.method == 'POST':
         form = PostForm(
@@ -65,17 +185,23 @@ def post_create(request):
             post = form.save(commit=False)
             post.author = request.user
             post.save()
+            if post.image:
+                make_thumbnails.delay(post_id=post.pk)
+            notify_followers.delay(post_id=post.pk)
             return redirect('posts:profile', request.user.username)
         else:
             return render(request, 'posts/create_post.html',
-                          {'form': form, })
+                          {'form': form, },
+                          using=template_engine(request))
     else:
         form = PostForm()
         return render(request, 'posts/create_post.html',
-                      {'form': form, })
+                      {'form': form, },
+                      using=template_engine(request))
 
 
 @login_required
+@ratelimit(POST_RATE, scope='posts.write')
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = PostForm(instance=post)
@@ -86,17 +212,31 @@ def post_edit(request, post_id):
         files=request.FILES or None,
         instance=post)
     if form.is_valid():
-        form.save()
+        post = form.save()
+        if post.image and 'image' in form.changed_data:
+            make_thumbnails.delay(post_id=post.pk)
         return redirect("posts:post_detail", post_id)
     else:
         return render(request, 'posts/create_post.html',
                                {'form': form,
                                 'is_edit': True,
-                                'post': post, }
-                      )
+                                'post': post, },
+                      using=template_engine(request))
 
 
 @login_required
+@require_POST
+@ratelimit(POST_RATE, scope='posts.write')
+def post_delete(request, post_id):
+    post = get_object_or_404(Post, id=post_id)
+    if request.user != post.author:
+        return redirect('posts:post_detail', post_id)
+    deletion.delete_post(post)
+    return redirect('posts:profile', request.user.username)
+
+
+@login_required
+@ratelimit(COMMENT_RATE)
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -108,18 +248,92 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@cache_policy(FEED_MAX_AGE, keys=('trending',))
+def trending_index(request):
+    page_obj = paginator_project(request, trending.top_posts())
+    context = {'page_obj': page_obj}
+    return render(request, 'posts/trending.html', context,
+                  using=template_engine(request))
+
+
 @login_required
 def follow_index(request):
     follow_list = Post.objects.filter(author__following__user=request.user)
     page_obj = paginator_project(request, follow_list)
-    context = {'page_obj': page_obj}
-    return render(request, 'posts/follow.html', context)
+    context = {
+        'page_obj': page_obj,
+        'fragment_url': feeds.fragment_url(
+            page_obj, reverse('posts:follow_fragment')
+        ),
+    }
+    return render(request, 'posts/follow.html', context,
+                  using=template_engine(request))
+
+
+def feed_fragment(request, posts, url_name, *args, archived=None):
+    """Порция постов ленты после курсора ?after= без обвязки страницы.
+
+    archived — продолжение ленты в архиве, когда горячие посты кончились.
+    """
+    if archived is not None:
+        archived = archived.select_related('author', 'group')
+    try:
+        posts, cursor = feeds.next_page(
+            posts.select_related('author', 'group'), request.GET.get('after'),
+            archived=archived,
+        )
+    except ValueError:
+        return HttpResponseBadRequest('Некорректный курсор')
+    next_url = None
+    if cursor is not None:
+        next_url = f'{reverse(url_name, args=args)}?after={cursor}'
+    response = render(request, 'posts/fragment.html', {
+        'posts': posts,
+        'next_url': next_url,
+    })
+    response['X-Next-Cursor'] = cursor or ''
+    return response
+
+
+@cache_policy(FEED_MAX_AGE, keys=('feed',))
+def index_fragment(request):
+    return feed_fragment(request, Post.objects.all(), 'posts:index_fragment')
+
+
+@cache_policy(FEED_MAX_AGE)
+def group_fragment(request, slug):
+    group = entities.groups.get_or_404(slug)
+    add_surrogate_keys(request, f'group-{group.pk}')
+    return feed_fragment(
+        request, group.posts.all(), 'posts:group_fragment', slug,
+        archived=group.archived_posts.all(),
+    )
+
+
+@cache_policy(FEED_MAX_AGE)
+def profile_fragment(request, username):
+    author = entities.users.get_or_404(username)
+    add_surrogate_keys(request, f'author-{author.pk}')
+    return feed_fragment(
+        request, Post.objects.filter(author_id=author.pk),
+        'posts:profile_fragment', username,
+        archived=ArchivedPost.objects.filter(author_id=author.pk),
+    )
 
 
 @login_required
+def follow_fragment(request):
+    return feed_fragment(
+        request, Post.objects.filter(author__following__user=request.user),
+        'posts:follow_fragment'
+    )
+
+
+@login_required
+@ratelimit(FOLLOW_RATE, methods=None, scope='posts.follow')
 def profile_follow(request, username):
     user = request.user
-    author = User.objects.get(username=username)
+    author = entities.users.get_or_404(username)
     is_follower = Follow.objects.filter(user=user, author=author)
     if user != author and not is_follower.exists():
         Follow.objects.create(user=user, author=author)
@@ -127,9 +341,62 @@ def profile_follow(request, username):
 
 
 @login_required
+@ratelimit(FOLLOW_RATE, methods=None, scope='posts.follow')
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = entities.users.get_or_404(username)
     is_follower = Follow.objects.filter(user=request.user, author=author)
     if is_follower.exists():
         is_follower.delete()
     return redirect('posts:profile', username=author)
+
+
+def stats_params(request):
+    """Период, глубина и группа из запроса к статистике."""
+    period = request.GET.get('period', ActivityStats.DAY)
+    if period not in stats.PERIODS:
+        raise ValueError('period')
+    span = int(request.GET.get('span') or stats.DEFAULT_SPAN[period])
+    if not 0 < span <= STATS_MAX_SPAN:
+        raise ValueError('span')
+    group = None
+    if request.GET.get('group'):
+        group = get_object_or_404(Group, slug=request.GET['group'])
+    return period, span, group
+
+
+@staff_member_required
+def stats_dashboard(request):
+    try:
+        period, span, group = stats_params(request)
+    except ValueError:
+        return HttpResponseBadRequest('Неверные параметры')
+    series = stats.series(period, span, group)
+    context = {
+        'period': period,
+        'span': span,
+        'group': group,
+        'series': series[::-1],
+        'totals': {
+            counter: sum(point[counter] for point in series)
+            for counter in stats.COUNTERS
+        },
+        'groups': stats.groups_summary(period, span),
+        'watermarks': StatsWatermark.objects.order_by('source'),
+    }
+    return render(request, 'posts/stats.html', context)
+
+
+@staff_member_required
+def stats_data(request):
+    try:
+        period, span, group = stats_params(request)
+    except ValueError:
+        return HttpResponseBadRequest('Неверные параметры')
+    return JsonResponse({
+        'period': period,
+        'group': group and group.slug,
+        'series': [
+            dict(point, start=point['start'].isoformat())
+            for point in stats.series(period, span, group)
+        ],
+    })
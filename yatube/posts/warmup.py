@@ -0,0 +1,114 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, F, Max
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from core.cachewarm import hot_urls
+from core.warmup import warmup
+
+from . import trending
+from .forms import CommentForm, PostForm
+from .models import Follow, Group, Post, User
+from .utils import NUM_REC
+
+# Среди скольких последних подписок искать популярных авторов.
+FOLLOW_WINDOW: int = 10000
+
+
+class WarmupPage(Page):
+    """Страница с собственным ключом для {% cache ... with page_obj %}.
+
+    Фрагменты из прогрева не должны подменять настоящие страницы.
+    """
+
+    def __repr__(self):
+        return '<Warmup page>'
+
+
+class WarmupPaginator(Paginator):
+    def _get_page(self, *args, **kwargs):
+        return WarmupPage(*args, **kwargs)
+
+
+def synthetic_posts(count=NUM_REC):
+    author = User(id=0, username='warmup', first_name='Прогрев')
+    group = Group(id=0, title='Прогрев', slug='warmup')
+    now = timezone.now()
+    return [
+        Post(id=number, text=f'Текст\nпоста {number}', pub_date=now,
+             author=author, group=group)
+        for number in range(1, count + 1)
+    ]
+
+
+@warmup
+def render_posts_templates():
+    """Один раз рендерит страницы posts на синтетических данных."""
+    # Не RequestFactory: django.test тянет за собой jinja2 и замедляет
+    # старт процесса.
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = '/'
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    request.user = AnonymousUser()
+    posts = synthetic_posts()
+    post = posts[0]
+    page_obj = WarmupPaginator(posts, NUM_REC).get_page(1)
+    groups = WarmupPaginator([post.group], NUM_REC).get_page(1)
+    contexts = {
+        'posts/index.html': {'page_obj': page_obj},
+        'posts/follow.html': {'page_obj': page_obj},
+        'posts/trending.html': {'page_obj': page_obj},
+        'posts/group_list.html': {'page_obj': page_obj, 'group': post.group},
+        'posts/profile.html': {
+            'page_obj': page_obj, 'author': post.author,
+            'profile': post.author, 'following': False, 'suggestions': [],
+        },
+        'posts/post_detail.html': {
+            'post': post, 'comments': [], 'form': CommentForm(),
+        },
+        'posts/create_post.html': {'form': PostForm(), 'is_edit': False},
+        'posts/groups.html': {'page_obj': groups, 'sort': 'activity'},
+        'posts/fragment.html': {'posts': posts, 'next_url': None},
+        'posts/month.html': {
+            'page_obj': page_obj, 'author': post.author, 'months': [],
+            'month': post.pub_date,
+        },
+    }
+    for name, context in contexts.items():
+        render_to_string(name, context, request)
+
+
+@hot_urls
+def posts_hot_urls(pages, limit):
+    """Первые страницы ленты, крупные группы, авторы, на которых чаще
+    всего подписывались недавно, и посты с наибольшим рейтингом
+    обсуждения."""
+    index = reverse('posts:index')
+    yield index
+    for number in range(2, pages + 1):
+        yield f'{index}?page={number}'
+    yield reverse('posts:group_index')
+    yield reverse('posts:trending')
+    groups = Group.objects.order_by(
+        F('stats__post_count').desc(nulls_last=True)
+    ).values_list('slug', flat=True)
+    for slug in groups[:limit]:
+        yield reverse('posts:group_list', args=(slug,))
+    # Подписки считаются только в последних FOLLOW_WINDOW строках по
+    # диапазону ключа: каждый процесс при старте не обходит всю таблицу.
+    last = Follow.objects.aggregate(last=Max('pk'))['last'] or 0
+    authors = (
+        Follow.objects.filter(pk__gt=last - FOLLOW_WINDOW)
+        .values('author__username').annotate(followers=Count('pk'))
+        .order_by('-followers', 'author__username')
+        .values_list('author__username', flat=True)
+    )
+    for username in authors[:limit]:
+        yield reverse('posts:profile', args=(username,))
+    # Обсуждаемые посты — из индекса рейтинга, без подсчёта комментариев.
+    for post in trending.top_posts(limit):
+        yield reverse('posts:post_detail', args=(post.pk,))
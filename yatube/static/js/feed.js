@@ -0,0 +1,70 @@
+// Подгрузка следующих постов ленты без перезагрузки страницы.
+// Без JavaScript лента листается обычным пагинатором.
+(function () {
+  'use strict';
+
+  var observer = null;
+
+  function load(more) {
+    if (more.dataset.loading) {
+      return;
+    }
+    more.dataset.loading = '1';
+    fetch(more.dataset.feedMore, {credentials: 'same-origin'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.status);
+        }
+        return response.text();
+      })
+      .then(function (html) {
+        var box = document.createElement('div');
+        box.innerHTML = html;
+        var next = box.querySelector('[data-feed-more]');
+        while (box.firstChild) {
+          more.parentNode.insertBefore(box.firstChild, more);
+        }
+        more.parentNode.removeChild(more);
+        if (next) {
+          enhance(next);
+        }
+      })
+      .catch(function () {
+        delete more.dataset.loading;
+      });
+  }
+
+  function enhance(more) {
+    var button = more.querySelector('button');
+    button.hidden = false;
+    button.addEventListener('click', function () {
+      load(more);
+    });
+    if (observer) {
+      observer.observe(more);
+    }
+  }
+
+  if ('IntersectionObserver' in window) {
+    observer = new IntersectionObserver(function (entries) {
+      entries.forEach(function (entry) {
+        if (entry.isIntersecting) {
+          observer.unobserve(entry.target);
+          load(entry.target);
+        }
+      });
+    }, {rootMargin: '400px'});
+  }
+
+  var found = document.querySelectorAll('[data-feed-more]');
+  if (!found.length) {
+    return;
+  }
+  Array.prototype.forEach.call(found, enhance);
+  Array.prototype.forEach.call(
+    document.querySelectorAll('.pagination'),
+    function (pagination) {
+      pagination.parentNode.hidden = true;
+    }
+  );
+})();
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+
+from posts import deletion
+from posts.admin import DeferredDeleteMixin
+
+User = get_user_model()
+
+
+class UserAdmin(DeferredDeleteMixin, BaseUserAdmin):
+    deleter = staticmethod(deletion.delete_user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, UserAdmin)
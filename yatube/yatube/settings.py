@@ -11,7 +11,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = 't(v9l(t1undxm$svl5#qjh2o9fefdh9yqsa7ovovqrvxzvn43s'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Боевые процессы запускаются с yatube.settings_prod, где DEBUG выключен.
+DEBUG = os.environ.get('DJANGO_DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS: list = [
     'localhost',
@@ -32,28 +33,37 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'posts',
+    'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
     'sorl.thumbnail',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.AdmissionControlMiddleware',
+    'core.middleware.AnonymousFastLaneMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
+if DEBUG:
+    # Панель отладки нужна только при разработке.
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+SITE_URL = 'https://os140564.pythonanywhere.com'
 ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+# Собрать шаблоны и отрендерить страницы при старте процесса (wsgi.py).
+TEMPLATE_WARMUP = not DEBUG
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -69,7 +79,26 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        'NAME': 'jinja2',
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+        },
+    },
 ]
+if not DEBUG:
+    # Шаблоны разбираются один раз на процесс.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+# Страницы, которые рендерятся шаблонами Jinja2 из каталога jinja2/.
+JINJA2_VIEWS = []
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
@@ -114,6 +143,9 @@ USE_L10N = True
 
 USE_TZ = True
 
+SESSION_ENGINE = 'core.sessions'
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
@@ -121,15 +153,53 @@ LOGIN_REDIRECT_URL = 'posts:index'
 # https://docs.djangoproject.com/en/2.2/howto/static-files/
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_URL = '/static/'
+# Сборка: manage.py collectstatic; в STATIC_ROOT файлы с хэшем в имени,
+# манифест и сжатые копии .gz/.br, их раздаёт StaticFilesMiddleware.
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Загрузки и миниатюры тестов держит в памяти core.testing.
+TEST_RUNNER = 'core.testing.TestRunner'
 
+# Кэш процесса — только для разработки и тестов, боевой общий кэш задан
+# в yatube.settings_prod (почему — core.E001).
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+# Анонимные GET без cookies к этим страницам идут в обход сессий, CSRF
+# и сообщений. Хранение готовых страниц требует общего кэша (core.E001),
+# поэтому здесь оно выключено, а включает его yatube.settings_prod.
+FAST_LANE_ROUTES = [
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:index_fragment',
+    'posts:group_fragment',
+    'posts:profile_fragment',
+]
+FAST_LANE_TIMEOUT = 0
+# Фоновый прогрев кэша процесса самыми посещаемыми страницами при старте
+# (core.cachewarm) и сколько секунд на него отводится.
+CACHE_WARMUP = not DEBUG
+CACHE_WARMUP_BUDGET = 30
+# Адрес обратного прокси для запросов PURGE (например, manage.py runproxy
+# на http://127.0.0.1:6081/); пустая строка — прокси нет.
+PROXY_PURGE_URL = ''
+# Одновременно обрабатываемые запросы, длина очереди ожидающих и сколько
+# секунд ждать места, прежде чем ответить 503 или устаревшей копией.
+ADMISSION_CONCURRENCY = 16
+ADMISSION_QUEUE = 64
+ADMISSION_TIMEOUT = 2
+# Ограничение частоты запросов на запись (core.ratelimit); RATELIMIT_SHARED
+# хранит счётчики в общем кэше, чтобы лимит был общим для всех процессов.
+RATELIMIT_ENABLED = not DEBUG
+RATELIMIT_SHARED = False
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -0,0 +1,57 @@
+"""Настройки боевых процессов: DJANGO_SETTINGS_MODULE=yatube.settings_prod.
+
+Берут за основу yatube.settings с выключенным DEBUG: без панели отладки,
+с кэширующим загрузчиком шаблонов, сжатой статикой и прогревом при
+старте (wsgi.py). Секретный ключ (обязательно) и адреса сайта задаются
+окружением.
+Кэш общий для процессов (core.E001): по умолчанию файловый, на одной
+машине; бэкенд и адрес задают DJANGO_CACHE_BACKEND и
+DJANGO_CACHE_LOCATION (например, Memcached для нескольких машин).
+Время старта процесса показывает manage.py startup_report.
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import ALLOWED_HOSTS, INSTALLED_APPS, MIDDLEWARE
+
+# Отладка выключена независимо от DJANGO_DEBUG. Базовые настройки могли
+# собраться с отладкой: убираем панель отладки и включаем то, что там
+# зависит от «not DEBUG». Загрузчик шаблонов с кэшем Django включает сам,
+# когда DEBUG выключен, а loaders не заданы.
+DEBUG = False
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+MIDDLEWARE = [name for name in MIDDLEWARE
+              if not name.startswith('debug_toolbar.')]
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+TEMPLATE_WARMUP = True
+CACHE_WARMUP = True
+RATELIMIT_ENABLED = True
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured(
+        'Задайте секретный ключ в переменной окружения DJANGO_SECRET_KEY.'
+    )
+if os.environ.get('DJANGO_ALLOWED_HOSTS'):
+    ALLOWED_HOSTS = os.environ['DJANGO_ALLOWED_HOSTS'].split(',')
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'DJANGO_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'yatube-cache'),
+        ),
+    }
+}
+# Страницы, которые CACHE_WARMUP кладёт в кэш быстрого пути при старте,
+# тоже живут минуту; дольше от прогрева остаются миниатюры, разобранные
+# шаблоны и кэши сущностей. Больший срок — дольше устаревшие страницы
+# после правок, которые не сбрасывают поколение ключей.
+FAST_LANE_TIMEOUT = 60
@@ -1,7 +1,16 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+if settings.TEMPLATE_WARMUP:
+    from core import warmup
+    warmup.run()
+
+if settings.CACHE_WARMUP:
+    from core import cachewarm
+    cachewarm.start()